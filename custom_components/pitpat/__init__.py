@@ -6,14 +6,18 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceEntry
 
 from .coordinator import PitPatDataUpdateCoordinator
 from .const import (
     DATA_KEY_COORDINATOR,
+    DATA_KEY_PUSH_RECEIVER,
     DOMAIN,
-    OPTIONS_KEY_UPDATE_INTERVAL,
-    UPDATE_INTERVAL_DEFAULT,
 )
+from .handoff import async_pop_handoff
+from .options import PitPatOptions
+from .push import PitPatPushReceiver
+from .services import async_setup_services
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -25,17 +29,35 @@ PLATFORMS = [
 
 _LOGGER = logging.getLogger(__name__)
 
-def _get_update_interval(config_entry: ConfigEntry):
-    return config_entry.options.get(OPTIONS_KEY_UPDATE_INTERVAL, UPDATE_INTERVAL_DEFAULT)
+def _get_options(config_entry: ConfigEntry) -> PitPatOptions:
+    return PitPatOptions.from_options(config_entry.options)
+
+async def _async_restart_push_receiver(hass: HomeAssistant, entry: ConfigEntry):
+    """Stop any existing push receiver, and start a new one if a push URL is configured."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    receiver: PitPatPushReceiver | None = entry_data.pop(DATA_KEY_PUSH_RECEIVER, None)
+    if receiver:
+        await receiver.async_stop()
+
+    push_url = _get_options(entry).push_url
+    if push_url:
+        receiver = PitPatPushReceiver(hass, entry_data[DATA_KEY_COORDINATOR], push_url)
+        receiver.async_start(entry)
+        entry_data[DATA_KEY_PUSH_RECEIVER] = receiver
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the component."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up from a config entry."""
-    coordinator = PitPatDataUpdateCoordinator(hass, _get_update_interval(entry), entry)
+    options = _get_options(entry)
+    coordinator = PitPatDataUpdateCoordinator(hass, entry, options, async_pop_handoff(hass, entry.data.get('refresh_token')))
+    coordinator.geofence.async_start()
+    entry.async_on_unload(coordinator.geofence.async_stop)
+    await coordinator.async_set_record_traffic(options.record_traffic)
 
     hass.data[DOMAIN][entry.entry_id] = {
         DATA_KEY_COORDINATOR: coordinator,
@@ -50,8 +72,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     if not coordinator.last_update_success:
         raise ConfigEntryNotReady
 
+    await coordinator.async_setup_dog_coordinators()
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    await _async_restart_push_receiver(hass, entry)
+
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -65,6 +91,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         )
     )
 
+    receiver: PitPatPushReceiver | None = hass.data[DOMAIN][entry.entry_id].get(DATA_KEY_PUSH_RECEIVER)
+    if receiver:
+        await receiver.async_stop()
+
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_KEY_COORDINATOR]
     await coordinator.async_shutdown()
 
@@ -73,8 +103,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     return unload_ok
 
+async def async_remove_config_entry_device(hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry) -> bool:
+    """Allow a device to be deleted once its dog is no longer on the account."""
+    coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
+    return not any(
+        identifier[0] == DOMAIN and (identifier[1] in (coordinator.data or {}) or identifier[1] == config_entry.entry_id)
+        for identifier in device_entry.identifiers
+    )
+
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
-    """Handle options update."""
+    """Handle options update, applying them to the running coordinators rather than reloading the entry."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    coordinator.update_interval = _get_update_interval(config_entry)
+    options = _get_options(config_entry)
+    await coordinator.async_apply_options(options)
+
+    receiver: PitPatPushReceiver | None = hass.data[DOMAIN][config_entry.entry_id].get(DATA_KEY_PUSH_RECEIVER)
+    if (receiver.url if receiver else '') != options.push_url:
+        await _async_restart_push_receiver(hass, config_entry)
+
     _LOGGER.info("Coordinator settings updated")
@@ -0,0 +1,105 @@
+"""Detection of unusual activity days against a baseline for each day of the week."""
+
+from datetime import date
+import logging
+from math import sqrt
+from typing import Any, Dict, List
+
+_LOGGER = logging.getLogger(__name__)
+
+# Activity day fields the baselines are kept for, by the name used in the results
+ANOMALY_METRICS: Dict[str, str] = {
+    'rest_minutes': 'TotalRestMinutes',
+    'walk_minutes': 'TotalWalkMinutes',
+    'run_minutes': 'TotalRunMinutes',
+    'play_minutes': 'TotalPlayMinutes',
+    'steps': 'TotalSteps',
+}
+
+# Weight of each new day in the baseline for its weekday, so the baseline follows roughly the last 8 weeks
+ANOMALY_BASELINE_ALPHA = 1 / 8
+
+# Number of days needed for a weekday before its baseline is used
+ANOMALY_MIN_SAMPLES = 4
+
+# Standard deviations from the baseline for a day to be unusual
+ANOMALY_THRESHOLD = 3.0
+
+# Lower limits on the spread of a baseline, so a very regular dog isn't flagged for small changes
+ANOMALY_MIN_SPREAD_FRACTION = 0.1
+ANOMALY_MIN_SPREAD = 1.0
+
+class Baseline():
+    """Exponentially weighted mean and variance of a value, updated one sample at a time."""
+
+    __slots__ = ('count', 'mean', 'variance')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        alpha = max(1 / self.count, ANOMALY_BASELINE_ALPHA)
+        difference = value - self.mean
+        increment = alpha * difference
+        self.mean += increment
+        self.variance = (1 - alpha) * (self.variance + difference * increment)
+
+    def score(self, value: float) -> float | None:
+        """How many standard deviations the value is from the mean, or None until there are enough samples."""
+        if self.count < ANOMALY_MIN_SAMPLES:
+            return None
+        spread = max(sqrt(self.variance), abs(self.mean) * ANOMALY_MIN_SPREAD_FRACTION, ANOMALY_MIN_SPREAD)
+        return (value - self.mean) / spread
+
+class ActivityAnomalyDetector():
+    """
+    Compares each complete activity day for a dog with the baseline for the same day of the week, then adds the day to
+    the baseline.
+
+    The score of a day is the largest deviation of any metric, so a sharp drop (or rise) in a single type of activity
+    is enough to flag it. Only a fixed number of values is kept for each weekday, however long the history.
+    """
+
+    __slots__ = ('_baselines', '_date', '_scores')
+
+    def __init__(self):
+        self._baselines: List[List[Baseline]] = [[Baseline() for _ in ANOMALY_METRICS] for _ in range(7)]
+        self._date: str | None = None
+        self._scores: Dict[str, float] = {}
+
+    def push(self, day: str, values: tuple) -> None:
+        """
+        Score a complete day and add it to the baseline. Days must be pushed in date order.
+
+        :param day: ISO 8601 date of the day (e.g. 2026-01-31).
+        :param values: The value of each of ANOMALY_METRICS for the day.
+        """
+        baselines = self._baselines[date.fromisoformat(day).weekday()]
+        scores = {}
+        for metric, baseline, value in zip(ANOMALY_METRICS.keys(), baselines, values):
+            score = baseline.score(value)
+            if score is not None:
+                scores[metric] = round(score, 2)
+            baseline.push(value)
+
+        self._date = day
+        self._scores = scores
+
+    @property
+    def score(self) -> float | None:
+        """The score of the most recent complete day, or None if there wasn't a baseline for it yet."""
+        if not self._scores:
+            return None
+        return max(abs(score) for score in self._scores.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        score = self.score
+        return {
+            'anomaly': score is not None and score >= ANOMALY_THRESHOLD,
+            'anomaly_score': score,
+            'anomaly_date': self._date,
+            'anomaly_metrics': dict(self._scores),
+        }
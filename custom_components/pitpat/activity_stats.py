@@ -0,0 +1,155 @@
+"""Rolling activity statistics calculated incrementally from activity days."""
+
+from collections import deque
+from datetime import date
+from typing import Any, Deque, Dict, Iterable, NamedTuple, Tuple
+
+from .activity_anomaly import ANOMALY_METRICS, ActivityAnomalyDetector
+
+ROLLING_WINDOW_DAYS = (7, 30)
+
+ACTIVITY_STATS_METRICS: Dict[str, str] = {
+    'steps': 'TotalSteps',
+    'distance': 'TotalDistance',
+    'calories': 'TotalCalories',
+    'active_minutes': 'Activeness',
+}
+
+class ActivityDaySummary(NamedTuple):
+    """The parts of an activity day used for statistics."""
+    date: str
+    values: Tuple[float, ...]
+    goal_achieved: bool
+    anomaly_values: Tuple[float, ...] = ()
+
+    @staticmethod
+    def from_api(day: Dict[str, Any]) -> 'ActivityDaySummary':
+        return ActivityDaySummary(
+            date=day.get('Date', '')[:10],
+            values=tuple(float(day.get(field) or 0) for field in ACTIVITY_STATS_METRICS.values()),
+            goal_achieved=bool(day.get('UserGoalAchieved', False)),
+            anomaly_values=tuple(float(day.get(field) or 0) for field in ANOMALY_METRICS.values()),
+        )
+
+    @property
+    def ordinal(self) -> int:
+        return date.fromisoformat(self.date).toordinal()
+
+class RollingWindow():
+    """
+    Running total of a daily value over a fixed number of days.
+
+    Days without a value count as zero, so a gap in the history lowers the average rather than being skipped. Only
+    the days since the first value are counted, so a short history isn't averaged over the full window.
+    """
+
+    __slots__ = ('_days', '_values', '_total', '_first_ordinal')
+
+    def __init__(self, days: int):
+        self._days = days
+        self._values: Deque[Tuple[int, float]] = deque()
+        self._total = 0.0
+        self._first_ordinal: int | None = None
+
+    def push(self, ordinal: int, value: float) -> None:
+        """
+        Add the value for a day, removing any days which have fallen out of the window.
+
+        Days must be pushed in date order.
+        """
+        if self._first_ordinal is None:
+            self._first_ordinal = ordinal
+        self._values.append((ordinal, value))
+        self._total += value
+
+        while self._values[0][0] <= ordinal - self._days:
+            self._total -= self._values.popleft()[1]
+
+    @property
+    def average(self) -> float | None:
+        """The average per day over the window, or None if there are no days within it."""
+        if not self._values:
+            return None
+        return self._total / min(self._days, self._values[-1][0] - self._first_ordinal + 1)
+
+class ActivityStatsTracker():
+    """
+    Rolling averages, goal streaks and activity anomalies for a single dog.
+
+    The most recent day is still in progress so is held separately until a newer day arrives. Only complete days
+    are included in the averages, and the streak includes the current day only once the goal has been achieved.
+    """
+
+    def __init__(self):
+        self._windows = [
+            (metric, days, index, RollingWindow(days))
+            for index, metric in enumerate(ACTIVITY_STATS_METRICS.keys())
+            for days in ROLLING_WINDOW_DAYS
+        ]
+        self._current: ActivityDaySummary | None = None
+        self._last_complete_ordinal: int | None = None
+        self._streak = 0
+        self._best_streak = 0
+        self._anomalies = ActivityAnomalyDetector()
+
+    @property
+    def last_date(self) -> str:
+        """
+        The date of the most recent day seen.
+
+        Days before this have already been included so do not need to be pushed again.
+        """
+        return self._current.date if self._current else ''
+
+    def push_all(self, days: Iterable[ActivityDaySummary]) -> None:
+        """Add activity days, in any order. Days already included are ignored, except for the current day."""
+        for day in sorted(days, key=lambda item: item.date):
+            self.push(day)
+
+    def push(self, day: ActivityDaySummary) -> None:
+        """Add an activity day. Days must be pushed in date order."""
+        if day.date < self.last_date:
+            return
+
+        if self._current and day.date > self._current.date:
+            self.__complete_day(self._current)
+
+        self._current = day
+
+    def __complete_day(self, day: ActivityDaySummary) -> None:
+        ordinal = day.ordinal
+        for _, _, index, window in self._windows:
+            window.push(ordinal, day.values[index])
+
+        if not day.goal_achieved:
+            self._streak = 0
+        elif self._last_complete_ordinal is not None and ordinal - self._last_complete_ordinal == 1:
+            self._streak += 1
+        else:
+            self._streak = 1
+
+        self._best_streak = max(self._best_streak, self._streak)
+        self._last_complete_ordinal = ordinal
+
+        if day.anomaly_values:
+            self._anomalies.push(day.date, day.anomaly_values)
+
+    @property
+    def goal_streak(self) -> int:
+        """Number of consecutive days the goal has been achieved, up to and including the current day."""
+        if not self._current or self._last_complete_ordinal is None:
+            return 1 if self._current and self._current.goal_achieved else 0
+
+        streak = self._streak if self._current.ordinal - self._last_complete_ordinal == 1 else 0
+        return streak + 1 if self._current.goal_achieved else streak
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The current statistics, keyed as used by the sensor entities."""
+        stats: Dict[str, Any] = {
+            f'{metric}_avg_{days}d': window.average
+            for metric, days, _, window in self._windows
+        }
+        stats['goal_streak'] = self.goal_streak
+        stats['goal_streak_best'] = max(self._best_streak, self.goal_streak)
+        stats.update(self._anomalies.as_dict())
+        return stats
@@ -0,0 +1,123 @@
+"""Totals and counts across all of the dogs on an account."""
+
+from dataclasses import dataclass, field
+import logging
+from typing import Callable, Dict, Iterable, List
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .models import Dog, DogData
+
+_LOGGER = logging.getLogger(__name__)
+
+@dataclass(slots=True, frozen=True)
+class AccountAggregates:
+    dogs: int = 0
+    steps_today: int = 0
+    distance_today: float = 0.0
+    lowest_battery_level: float | None = None
+    lowest_battery_dog: str | None = None
+    live_tracking: List[str] = field(default_factory=list)
+    charging: List[str] = field(default_factory=list)
+    overdue: List[str] = field(default_factory=list)
+
+def compute_aggregates(dogs: Iterable[tuple[Dog, DogData | None]], today: str) -> AccountAggregates:
+    """
+    Combine the data for each dog in a single pass.
+
+    :param dogs: The details and data for each dog. Dogs without data are counted but otherwise ignored.
+    :param today: The current date (e.g. 2026-01-31). Only activity for this date is included in the totals.
+    """
+    count = 0
+    steps = 0
+    distance = 0.0
+    lowest_level = None
+    lowest_dog = None
+    live_tracking = []
+    charging = []
+    overdue = []
+
+    for dog, data in dogs:
+        count += 1
+        if data is None:
+            continue
+        name = dog.name or dog.id
+
+        activity = data.activity_today
+        if activity is not None and activity.date == today:
+            steps += activity.total_steps
+            distance += activity.total_distance
+
+        monitor = data.monitor
+        if monitor is None:
+            continue
+
+        level = monitor.battery.level_fraction
+        if level is not None and (lowest_level is None or level < lowest_level):
+            lowest_level = level
+            lowest_dog = name
+        if monitor.live_tracking_reason != 0:
+            live_tracking.append(name)
+        if monitor.battery.is_charging:
+            charging.append(name)
+        if data.connectivity is not None and data.connectivity.overdue:
+            overdue.append(name)
+
+    return AccountAggregates(
+        dogs=count,
+        steps_today=steps,
+        distance_today=distance,
+        lowest_battery_level=lowest_level,
+        lowest_battery_dog=lowest_dog,
+        live_tracking=live_tracking,
+        charging=charging,
+        overdue=overdue,
+    )
+
+class AccountAggregator():
+    """
+    Keeps the aggregates for an account up to date as dogs are refreshed.
+
+    Dogs refreshed together only cause a single recalculation, which is done once the current refreshes have notified
+    their own entities.
+    """
+
+    def __init__(self, hass: HomeAssistant, get_dogs: Callable[[], Iterable[tuple[Dog, DogData | None]]]):
+        self._hass = hass
+        self._get_dogs = get_dogs
+        self._listeners: Dict[object, CALLBACK_TYPE] = {}
+        self._scheduled = False
+        self.data = AccountAggregates()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for updates to the aggregates. Returns a function to stop listening."""
+        key = object()
+        self._listeners[key] = update_callback
+        self.async_schedule_update()
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(key, None)
+
+        return remove_listener
+
+    @callback
+    def async_schedule_update(self) -> None:
+        """Recalculate the aggregates once the current refreshes have finished with the event loop."""
+        if self._scheduled or not self._listeners:
+            return
+        self._scheduled = True
+        self._hass.loop.call_soon(self.__async_update)
+
+    @callback
+    def __async_update(self) -> None:
+        self._scheduled = False
+        aggregates = compute_aggregates(self._get_dogs(), dt_util.now().date().isoformat())
+        if aggregates == self.data:
+            return
+        self.data = aggregates
+        _LOGGER.debug('Account aggregates updated: %s', aggregates)
+        for update_callback in list(self._listeners.values()):
+            update_callback()
@@ -1,28 +1,126 @@
+import codecs
+import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, TypeVar
 import aiohttp
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Connect and read timeouts for each PitPat host. The activity history can be large, so is allowed longer in total
+# as long as data keeps arriving.
+TIMEOUT_AUTH = aiohttp.ClientTimeout(total=30, sock_connect=10, sock_read=20)
+TIMEOUT_API = aiohttp.ClientTimeout(total=20, sock_connect=10, sock_read=15)
+TIMEOUT_ACTIVITY = aiohttp.ClientTimeout(total=60, sock_connect=10, sock_read=20)
+TIMEOUT_LOCATION = aiohttp.ClientTimeout(total=20, sock_connect=10, sock_read=15)
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = ' \t\n\r'
+_JSON_ARRAY_DELIMITERS = _JSON_WHITESPACE + ',]'
+
+class PitPatHosts(NamedTuple):
+    """Base URLs for each of the PitPat services."""
+    auth: str
+    api: str
+    activity: str
+    location: str
+
+    @staticmethod
+    def from_base_url(base_url: str) -> 'PitPatHosts':
+        """
+        Use a single base URL for all services, such as the local simulator.
+
+        :param base_url: URL serving all of the services (e.g. http://localhost:5100)
+        :type base_url: str
+        """
+        base_url = base_url.rstrip('/')
+        return PitPatHosts(base_url, base_url, base_url, base_url)
+
+PRODUCTION_HOSTS = PitPatHosts(
+    auth='https://auth.pitpat.com',
+    api='https://api.pitpat.com',
+    activity='https://activity.pitpat.com',
+    location='https://location.pitpat.com',
+)
+
 class InvalidCredentialsError(Exception):
     """The operation failed due to invalid or expired credentials."""
     pass
 
-class PitPatApiClient():
-    """API Client for PitPat pet trackers."""
+class InvalidResponseError(Exception):
+    """The response could not be decoded as expected."""
+    pass
 
-    # __HOST_AUTH = 'http://localhost:5100'
-    # __HOST_API = 'http://localhost:5101'
-    # __HOST_ACTIVITY = 'http://localhost:5102'
-    # __HOST_LOCATION = 'http://localhost:5103'
+async def async_iter_json_array(response: aiohttp.ClientResponse, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[Any]:
+    """
+    Decode a JSON array response one item at a time as it is read from the stream.
+
+    Only the item currently being decoded is held in memory, rather than the full response body.
+
+    :param response: The response to read the array from
+    :type response: aiohttp.ClientResponse
+    :param chunk_size: Number of bytes to read from the stream at a time
+    :type chunk_size: int
+    :return: Each item of the array, in the order they appear in the response
+    :rtype: AsyncIterator[Any]
+    """
+    decoder = codecs.getincrementaldecoder(response.get_encoding() or 'utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    finished = False
+    eof = False
+
+    while not finished:
+        if not eof:
+            chunk = await response.content.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + decoder.decode(chunk, final=eof)
+            position = 0
+
+        while True:
+            while position < len(buffer) and (buffer[position] in _JSON_WHITESPACE or (started and buffer[position] == ',')):
+                position += 1
+            if position >= len(buffer):
+                break
+
+            if not started:
+                if buffer[position] != '[':
+                    raise InvalidResponseError(f'Expected a JSON array but found "{buffer[position]}"')
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == ']':
+                finished = True
+                break
+
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError as err:
+                if eof:
+                    raise InvalidResponseError('Response ended part way through a JSON array') from err
+                break
+
+            # A value is only complete once followed by a delimiter, as a number split across chunks (e.g. "1." and "5")
+            # also decodes as a shorter number
+            if not eof and (end >= len(buffer) or buffer[end] not in _JSON_ARRAY_DELIMITERS):
+                break
+
+            position = end
+            yield item
+
+        if eof and not finished:
+            raise InvalidResponseError('Response ended part way through a JSON array')
 
-    __HOST_AUTH = 'https://auth.pitpat.com'
-    __HOST_API = 'https://api.pitpat.com'
-    __HOST_ACTIVITY = 'https://activity.pitpat.com'
-    __HOST_LOCATION = 'https://location.pitpat.com'
+class PitPatApiClient():
+    """API Client for PitPat pet trackers."""
 
     @staticmethod
-    async def async_authenticate_from_credentials(session: aiohttp.ClientSession, username: str, password: str) -> Dict[str, Any]:
+    async def async_authenticate_from_credentials(session: aiohttp.ClientSession, username: str, password: str, hosts: PitPatHosts = PRODUCTION_HOSTS) -> Dict[str, Any]:
         """
         Authenticate with PitPat using username and password.
 
@@ -32,6 +130,8 @@ class PitPatApiClient():
         :type username: str
         :param password: Password for the account
         :type password: str
+        :param hosts: The PitPat services to use
+        :type hosts: PitPatHosts
         :return: The response of the auth request
         :rtype: Dict[str, Any]
         """
@@ -41,11 +141,12 @@ class PitPatApiClient():
                 'grant_type': 'password',
                 'username': username,
                 'password': password,
-            }
+            },
+            hosts,
         )
 
     @staticmethod
-    async def async_authenticate_from_refresh_token(session: aiohttp.ClientSession, refresh_token: str) -> Dict[str, Any]:
+    async def async_authenticate_from_refresh_token(session: aiohttp.ClientSession, refresh_token: str, hosts: PitPatHosts = PRODUCTION_HOSTS) -> Dict[str, Any]:
         """
         Refresh the auth token.
 
@@ -53,6 +154,8 @@ class PitPatApiClient():
         :type session: aiohttp.ClientSession
         :param refresh_token: The refresh token for the session
         :type refresh_token: str
+        :param hosts: The PitPat services to use
+        :type hosts: PitPatHosts
         :return: The response of the auth request
         :rtype: Dict[str, Any]
         """
@@ -61,11 +164,12 @@ class PitPatApiClient():
             {
                 'grant_type': 'refresh_token',
                 'refresh_token': refresh_token,
-            }
+            },
+            hosts,
         )
 
     @staticmethod
-    async def __async_authenticate(session: aiohttp.ClientSession, data: Dict[str, str]) -> Dict[str, Any]:
+    async def __async_authenticate(session: aiohttp.ClientSession, data: Dict[str, str], hosts: PitPatHosts) -> Dict[str, Any]:
         """
         Send an authentication request.
 
@@ -73,6 +177,8 @@ class PitPatApiClient():
         :type session: aiohttp.ClientSession
         :param data: Data to use for the authentication request.
         :type data: str
+        :param hosts: The PitPat services to use
+        :type hosts: PitPatHosts
         :return: The response of the auth request
         :rtype: Dict[str, Any]
         """
@@ -85,8 +191,9 @@ class PitPatApiClient():
             form_data.add_field(key, val)
 
         result = await session.post(
-            f'{PitPatApiClient.__HOST_AUTH}/connect/token',
-            data=form_data)
+            f'{hosts.auth}/connect/token',
+            data=form_data,
+            timeout=TIMEOUT_AUTH)
         _LOGGER.info('Received %i status code from auth request', result.status)
 
         response: Dict[str, Any] = await result.json()
@@ -99,11 +206,35 @@ class PitPatApiClient():
         result.raise_for_status()
         return response
 
-    def __init__(self, session: aiohttp.ClientSession, tokens: Dict[str, Any]):
+    def __init__(self, session: aiohttp.ClientSession, tokens: Dict[str, Any], hosts: PitPatHosts = PRODUCTION_HOSTS, user_id: str | None = None):
         self._session = session
         self._tokens = tokens
+        self._hosts = hosts
+        self._timeout_api = TIMEOUT_API
+        self._timeout_location = TIMEOUT_LOCATION
 
-        self.__user_id: str | None = None
+        # A user Id already known for the account saves fetching the settings before the first request
+        self.__user_id: str | None = user_id
+
+    @property
+    def user_id(self) -> str | None:
+        return self.__user_id
+
+    def set_request_timeout(self, seconds: float) -> None:
+        """
+        Change the total time allowed for each API and location request. The activity history keeps its own longer
+        timeout, as it can be large.
+
+        :param seconds: The total time allowed for each request, including connecting.
+        """
+        self._timeout_api = aiohttp.ClientTimeout(
+            total=seconds,
+            sock_connect=min(TIMEOUT_API.sock_connect, seconds),
+            sock_read=min(TIMEOUT_API.sock_read, seconds))
+        self._timeout_location = aiohttp.ClientTimeout(
+            total=seconds,
+            sock_connect=min(TIMEOUT_LOCATION.sock_connect, seconds),
+            sock_read=min(TIMEOUT_LOCATION.sock_read, seconds))
 
     @property
     def default_headers(self):
@@ -124,8 +255,9 @@ class PitPatApiClient():
         _LOGGER.debug('Retrieving account settings')
 
         result = await self._session.get(
-            f'{PitPatApiClient.__HOST_API}/api/Settings',
-            headers=self.default_headers)
+            f'{self._hosts.api}/api/Settings',
+            headers=self.default_headers,
+            timeout=self._timeout_api)
 
         result.raise_for_status()
         return await result.json()
@@ -141,8 +273,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.get(
-            f'{PitPatApiClient.__HOST_API}/api/Users/{self.__user_id}/Dogs',
-            headers=self.default_headers)
+            f'{self._hosts.api}/api/Users/{self.__user_id}/Dogs',
+            headers=self.default_headers,
+            timeout=self._timeout_api)
 
         result.raise_for_status()
         return await result.json()
@@ -159,8 +292,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.get(
-            f'{PitPatApiClient.__HOST_API}/api/Users/{self.__user_id}/Dogs/{dog_id}/Monitors',
-            headers=self.default_headers)
+            f'{self._hosts.api}/api/Users/{self.__user_id}/Dogs/{dog_id}/Monitors',
+            headers=self.default_headers,
+            timeout=self._timeout_api)
 
         result.raise_for_status()
         return await result.json()
@@ -177,12 +311,74 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.get(
-            f'{PitPatApiClient.__HOST_ACTIVITY}/api/Users/{self.__user_id}/Dogs/{dog_id}/AllActivityDays',
-            headers=self.default_headers)
+            f'{self._hosts.activity}/api/Users/{self.__user_id}/Dogs/{dog_id}/AllActivityDays',
+            headers=self.default_headers,
+            timeout=TIMEOUT_ACTIVITY)
 
         result.raise_for_status()
         return await result.json()
 
+    async def async_iter_all_activity_days(self, dog_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Retrieve information for activity by day, decoding each day as it is received.
+
+        The days are yielded in the order returned by the API, which is not guaranteed to be sorted.
+
+        :param dog_id: The Id for the dog the monitor is registered to.
+        :return: Each activity day in the response.
+        :rtype: AsyncIterator[Dict[str, Any]]
+        """
+        _LOGGER.debug('Streaming activity days')
+
+        await self.async_ensure_user_id_present()
+        async with self._session.get(
+                f'{self._hosts.activity}/api/Users/{self.__user_id}/Dogs/{dog_id}/AllActivityDays',
+                headers=self.default_headers,
+                timeout=TIMEOUT_ACTIVITY) as result:
+            result.raise_for_status()
+            async for day in async_iter_json_array(result):
+                yield day
+
+    async def async_reduce_all_activity_days(self, dog_id: str, reducer: Callable[[T, Dict[str, Any]], T], initial: T) -> T:
+        """
+        Reduce the activity days to a single value as each day is received.
+
+        :param dog_id: The Id for the dog the monitor is registered to.
+        :param reducer: Function combining the value so far with the next activity day
+        :param initial: The starting value for the reduction
+        :return: The reduced value.
+        """
+        value = initial
+        async for day in self.async_iter_all_activity_days(dog_id):
+            value = reducer(value, day)
+        return value
+
+    async def async_get_latest_activity_day(self, dog_id: str) -> Dict[str, Any] | None:
+        """
+        Retrieve the most recent activity day without keeping the rest of the history.
+
+        :param dog_id: The Id for the dog the monitor is registered to.
+        :return: The activity day with the latest date, or None if there is no activity.
+        :rtype: Dict[str, Any] | None
+        """
+        return await self.async_reduce_all_activity_days(
+            dog_id,
+            lambda latest, day: day if latest is None or day.get('Date', '') > latest.get('Date', '') else latest,
+            None)
+
+    async def async_get_activity_days_since(self, dog_id: str, since: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve the activity days after a given date, sorted oldest first.
+
+        :param dog_id: The Id for the dog the monitor is registered to.
+        :param since: ISO 8601 date (e.g. 2026-01-31). Only days dated after this are returned.
+        :type since: str
+        :return: A list of activity by day.
+        :rtype: List[Dict[str, Any]]
+        """
+        days = [day async for day in self.async_iter_all_activity_days(dog_id) if day.get('Date', '') > since]
+        return sorted(days, key=lambda item: item.get('Date'))
+
     async def async_tracking_stop(self, dog_id: str) -> None:
         """
         Stops active tracking.
@@ -193,8 +389,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.put(
-            f'{PitPatApiClient.__HOST_LOCATION}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/stop',
-            headers=self.default_headers)
+            f'{self._hosts.location}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/stop',
+            headers=self.default_headers,
+            timeout=self._timeout_location)
 
         result.raise_for_status()
         _LOGGER.info('Tracking stopped')
@@ -209,8 +406,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.put(
-            f'{PitPatApiClient.__HOST_LOCATION}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/start/find',
-            headers=self.default_headers)
+            f'{self._hosts.location}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/start/find',
+            headers=self.default_headers,
+            timeout=self._timeout_location)
 
         result.raise_for_status()
         _LOGGER.info('Tracking started in "Find my dog" mode')
@@ -225,8 +423,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.put(
-            f'{PitPatApiClient.__HOST_LOCATION}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/start/walk',
-            headers=self.default_headers)
+            f'{self._hosts.location}/api/user/{self.__user_id}/dog/{dog_id}/livetracking/start/walk',
+            headers=self.default_headers,
+            timeout=self._timeout_location)
 
         result.raise_for_status()
         _LOGGER.info('Tracking started in "walk" mode')
@@ -241,8 +440,9 @@ class PitPatApiClient():
 
         await self.async_ensure_user_id_present()
         result = await self._session.put(
-            f'{PitPatApiClient.__HOST_LOCATION}/api/user/{self.__user_id}/dog/{dog_id}/monitor/updatePermanentCadence?cadence={value}',
-            headers=self.default_headers)
+            f'{self._hosts.location}/api/user/{self.__user_id}/dog/{dog_id}/monitor/updatePermanentCadence?cadence={value}',
+            headers=self.default_headers,
+            timeout=self._timeout_location)
 
         result.raise_for_status()
         _LOGGER.info('Phone home cadence updated to "%s"', value)
@@ -256,7 +456,7 @@ class PitPatApiClient():
         """
         if self.__user_id:
             _LOGGER.debug('User Id is already known as %s', self.__user_id)
-            return
+            return True
 
         settings = await self.async_get_settings()
         self.__user_id = settings.get('UserId')
@@ -0,0 +1,195 @@
+"""Battery drain rates and time to empty predictions learned from battery readings."""
+
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Deque, Dict, NamedTuple, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PHONE_HOME_CADENCE_MAP
+from .models import Monitor
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Number of discharge intervals kept for each mode
+BATTERY_MODEL_WINDOW = 48
+
+# Intervals longer than this are too coarse to attribute to a single mode
+BATTERY_MODEL_MAX_INTERVAL = timedelta(hours=12)
+
+# Battery level the collar should be charged by
+BATTERY_CHARGE_BY_LEVEL = 0.2
+
+BATTERY_MODE_LIVE_TRACKING = 'live_tracking'
+
+def get_battery_mode(monitor: Monitor) -> str | None:
+    """The mode the battery drains at for the current monitor settings, or None if it is not known."""
+    if monitor.live_tracking_reason != 0:
+        return BATTERY_MODE_LIVE_TRACKING
+    cadence = PHONE_HOME_CADENCE_MAP.get(monitor.phone_home_cadence)
+    return cadence.lower() if cadence else None
+
+class BatteryPrediction(NamedTuple):
+    time_to_empty: timedelta | None
+    charge_by: datetime | None
+    drain_rates: Dict[str, float]
+    """The drain rate for each mode with enough readings, as a fraction of the battery per hour."""
+
+class DrainRate():
+    """
+    Drain rate for a single mode, fitted by least squares through the origin over a window of discharge intervals.
+
+    For intervals of duration t and drop d, the fitted rate is sum(d) / sum(t), so only the running totals need to be
+    kept up to date as intervals enter and leave the window.
+    """
+
+    __slots__ = ('_intervals', '_hours', '_drop')
+
+    def __init__(self):
+        self._intervals: Deque[Tuple[float, float]] = deque(maxlen=BATTERY_MODEL_WINDOW)
+        self._hours = 0.0
+        self._drop = 0.0
+
+    def push(self, hours: float, drop: float) -> None:
+        if len(self._intervals) == self._intervals.maxlen:
+            old_hours, old_drop = self._intervals[0]
+            self._hours -= old_hours
+            self._drop -= old_drop
+        self._intervals.append((hours, drop))
+        self._hours += hours
+        self._drop += drop
+
+    @property
+    def rate(self) -> float | None:
+        """The fraction of the battery used per hour, or None if there are no readings."""
+        if self._hours <= 0:
+            return None
+        return max(self._drop, 0.0) / self._hours
+
+    def as_list(self) -> list:
+        return [list(interval) for interval in self._intervals]
+
+    @staticmethod
+    def from_list(intervals: list) -> 'DrainRate':
+        drain_rate = DrainRate()
+        for hours, drop in intervals:
+            drain_rate.push(hours, drop)
+        return drain_rate
+
+class BatteryDrainModel():
+    """
+    Drain rates for a single dog, learned separately for each phone home cadence and for live tracking.
+
+    Each pair of consecutive readings while not charging gives a discharge interval, which is attributed to the mode
+    the monitor was in at the start of the interval.
+    """
+
+    __slots__ = ('_rates', '_last')
+
+    def __init__(self):
+        self._rates: Dict[str, DrainRate] = {}
+        self._last: Tuple[datetime, float, bool, str | None] | None = None
+
+    def add_reading(self, monitor: Monitor) -> bool:
+        """
+        Add the battery reading from the monitor details.
+
+        :return: True if the reading was new.
+        """
+        time = monitor.contact_timings.last_message_received_at
+        level = monitor.battery.level_fraction
+        if time is None or level is None:
+            return False
+
+        last = self._last
+        if last is not None and time <= last[0]:
+            return False
+
+        charging = monitor.battery.is_charging
+        self._last = (time, level, charging, get_battery_mode(monitor))
+        if last is None:
+            return True
+
+        last_time, last_level, last_charging, last_mode = last
+        elapsed = time - last_time
+        if last_charging or charging or last_mode is None or elapsed > BATTERY_MODEL_MAX_INTERVAL or level > last_level:
+            return True
+
+        self._rates.setdefault(last_mode, DrainRate()).push(elapsed.total_seconds() / 3600, last_level - level)
+        return True
+
+    def predict(self, monitor: Monitor) -> BatteryPrediction:
+        """Predict when the battery will run out if the monitor stays in its current mode."""
+        drain_rates = {
+            mode: rate
+            for mode, drain_rate in self._rates.items()
+            if (rate := drain_rate.rate) is not None
+        }
+
+        rate = drain_rates.get(get_battery_mode(monitor))
+        level = monitor.battery.level_fraction
+        time = monitor.contact_timings.last_message_received_at
+        if not rate or level is None or time is None or monitor.battery.is_charging:
+            return BatteryPrediction(None, None, drain_rates)
+
+        return BatteryPrediction(
+            time_to_empty=timedelta(hours=level / rate),
+            charge_by=time + timedelta(hours=max(level - BATTERY_CHARGE_BY_LEVEL, 0) / rate),
+            drain_rates=drain_rates,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        last = self._last
+        return {
+            'last': [last[0].isoformat(), *last[1:]] if last else None,
+            'rates': {mode: drain_rate.as_list() for mode, drain_rate in self._rates.items()},
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'BatteryDrainModel':
+        model = BatteryDrainModel()
+        if last := data.get('last'):
+            model._last = (datetime.fromisoformat(last[0]), *last[1:])
+        model._rates = {mode: DrainRate.from_list(intervals) for mode, intervals in data.get('rates', {}).items()}
+        return model
+
+class BatteryModelStore():
+    """Persists the battery drain model for each dog, so the rates survive restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.battery_model')
+        self._models: Dict[str, BatteryDrainModel] | None = None
+
+    async def async_load(self) -> None:
+        """Load the models from storage, if not already loaded."""
+        if self._models is not None:
+            return
+
+        data = await self._store.async_load() or {}
+        models = {}
+        for dog_id, model_data in data.items():
+            try:
+                models[dog_id] = BatteryDrainModel.from_dict(model_data)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning('Discarding invalid battery model for dog %s: %s', dog_id, err)
+        self._models = models
+
+    def get(self, dog_id: str) -> BatteryDrainModel:
+        """The model for a dog. Must only be called once loaded."""
+        return self._models.setdefault(dog_id, BatteryDrainModel())
+
+    def async_remove_dog(self, dog_id: str) -> None:
+        """Forget the model of a dog removed from the account."""
+        if self._models is not None and self._models.pop(dog_id, None) is not None:
+            self.async_schedule_save()
+
+    def async_schedule_save(self) -> None:
+        self._store.async_delay_save(self.__data_to_save, STORAGE_SAVE_DELAY)
+
+    def __data_to_save(self) -> Dict[str, Any]:
+        return {dog_id: model.as_dict() for dog_id, model in (self._models or {}).items()}
@@ -14,7 +14,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import PitPatDataUpdateCoordinator
-from .entity import PitPatDogEntity
+from .entity import PitPatDogEntity, async_setup_dog_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -26,32 +26,50 @@ DOG_ENTITY_DESCRIPTIONS = [
     PitPatBinarySensorEntityDescription(
         key="live_tracking_active",
         translation_key="live_tracking_active",
-        value_fn=lambda entity: entity.data_monitor.get('LiveTrackingReason', 0) != 0,
+        value_fn=lambda entity: entity.data_monitor.live_tracking_reason != 0,
     ),
     PitPatBinarySensorEntityDescription(
         key="charging_status",
         translation_key="charging_status",
         device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
-        value_fn=lambda entity: bool(entity.data_monitor.get('BatteryInfo', {}).get('Value', {}).get('IsCharging', False)),
+        value_fn=lambda entity: entity.data_monitor.battery.is_charging,
+    ),
+    PitPatBinarySensorEntityDescription(
+        key="collar_overdue",
+        translation_key="collar_overdue",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        value_fn=lambda entity: bool(entity.data_dog_details.connectivity and entity.data_dog_details.connectivity.overdue),
+        attributes_fn=lambda entity: {
+            'overdue_since': entity.data_dog_details.connectivity.overdue_since if entity.data_dog_details.connectivity else None,
+            'offline': bool(entity.data_dog_details.connectivity and entity.data_dog_details.connectivity.offline),
+        },
+    ),
+    PitPatBinarySensorEntityDescription(
+        key="activity_anomaly",
+        translation_key="activity_anomaly",
+        icon="mdi:heart-pulse",
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('anomaly', False),
+        attributes_fn=lambda entity: {
+            'score': entity.data_dog_details.activity_stats.get('anomaly_score'),
+            'date': entity.data_dog_details.activity_stats.get('anomaly_date'),
+            'metrics': entity.data_dog_details.activity_stats.get('anomaly_metrics', {}),
+        },
     ),
     PitPatBinarySensorEntityDescription(
         key='user_goal_achieved',
         translation_key='user_goal_achieved',
         icon="mdi:flag-checkered",
-        value_fn=lambda entity: bool(entity.data_dog.get('activity_today', {}).get('UserGoalAchieved', False))
+        value_fn=lambda entity: bool(entity.data_activity_today and entity.data_activity_today.user_goal_achieved)
     )
 ]
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities):
     """Add the Entities from the config."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    sensors = []
-
-    for dog_id in coordinator.data.keys():
-        for description in DOG_ENTITY_DESCRIPTIONS:
-            sensors.append(PitPatDogBinarySensorEntity(coordinator, dog_id, description))
-
-    async_add_entities(sensors, True)
+    async_setup_dog_entities(hass, coordinator, async_add_entities, lambda dog_id, dog_coordinator: [
+        PitPatDogBinarySensorEntity(dog_coordinator, dog_id, description)
+        for description in DOG_ENTITY_DESCRIPTIONS
+    ])
 
 class PitPatDogBinarySensorEntity(PitPatDogEntity[PitPatBinarySensorEntityDescription], BinarySensorEntity):
 
@@ -13,45 +13,48 @@ from .const import (
     DATA_KEY_COORDINATOR,
     DOMAIN,
 )
-from .coordinator import PitPatDataUpdateCoordinator
-from .entity import PitPatDogEntity
+from .coordinator import PitPatDataUpdateCoordinator, PitPatDogDataUpdateCoordinator
+from .entity import PitPatDogEntity, async_setup_dog_entities
+from .live_tracking import STOP_REASON_STOPPED
 
 
 @dataclass(frozen=True, kw_only=True)
 class PitPatButtonEntityDescription(ButtonEntityDescription):
     press_fn: Callable[[PitPatApiClient, PitPatDogEntity], None]
+    pressed_fn: Callable[[PitPatDogDataUpdateCoordinator], None] = lambda coordinator: None
 
 DOG_ENTITY_DESCRIPTIONS = [
     PitPatButtonEntityDescription(
         key="tracking_stop",
         translation_key="tracking_stop",
-        press_fn=lambda api, entity: api.async_tracking_stop(entity.dog_id)
+        press_fn=lambda api, entity: api.async_tracking_stop(entity.dog_id),
+        pressed_fn=lambda coordinator: coordinator.async_end_live_tracking(STOP_REASON_STOPPED),
     ),
     PitPatButtonEntityDescription(
         key="tracking_start_find",
         translation_key="tracking_start_find",
-        press_fn=lambda api, entity: api.async_tracking_start_find(entity.dog_id)
+        press_fn=lambda api, entity: api.async_tracking_start_find(entity.dog_id),
+        pressed_fn=lambda coordinator: coordinator.async_start_live_tracking(),
     ),
     PitPatButtonEntityDescription(
         key="tracking_start_walk",
         translation_key="tracking_start_walk",
-        press_fn=lambda api, entity: api.async_tracking_start_walk(entity.dog_id)
+        press_fn=lambda api, entity: api.async_tracking_start_walk(entity.dog_id),
+        pressed_fn=lambda coordinator: coordinator.async_start_live_tracking(),
     ),
 ]
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities):
     """Add the Entities from the config."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    sensors = []
-
-    for dog_id in coordinator.data.keys():
-        for description in DOG_ENTITY_DESCRIPTIONS:
-            sensors.append(PitPatDogButtonEntity(coordinator, dog_id, description))
-
-    async_add_entities(sensors, True)
+    async_setup_dog_entities(hass, coordinator, async_add_entities, lambda dog_id, dog_coordinator: [
+        PitPatDogButtonEntity(dog_coordinator, dog_id, description)
+        for description in DOG_ENTITY_DESCRIPTIONS
+    ])
 
 class PitPatDogButtonEntity(PitPatDogEntity[PitPatButtonEntityDescription], ButtonEntity):
 
     async def async_press(self):
         await self.entity_description.press_fn(self.coordinator.api_client, self)
+        self.entity_description.pressed_fn(self.coordinator)
         await self.coordinator.async_refresh()
@@ -0,0 +1,152 @@
+"""Choice of phone home cadence for each dog from its battery, movement and connectivity."""
+
+from datetime import datetime, timedelta
+import logging
+from typing import Dict, List, NamedTuple
+
+from .const import CADENCE_STALE_MESSAGE_DEFAULT, PHONE_HOME_CADENCE_MAP
+from .models import DogData
+
+_LOGGER = logging.getLogger(__name__)
+
+CADENCE_ECONOMY = 'Economy'
+CADENCE_STANDARD = 'Standard'
+CADENCE_URGENT = 'Urgent'
+
+# Score boundaries between Economy/Standard and Standard/Urgent
+CADENCE_THRESHOLDS = (0.35, 0.75)
+
+# How far past a boundary the score must be before leaving the current cadence
+CADENCE_HYSTERESIS = 0.1
+
+# Minimum time between changes for a dog, unless the battery is critical
+CADENCE_MIN_DWELL = timedelta(minutes=30)
+
+# Speed of the filtered position between its last two fixes above which the dog is considered moving, in metres per
+# second
+CADENCE_MOVING_SPEED = 0.3
+
+# Without a message for this long, at least Standard is used to get fresh data, unless changed in the options
+CADENCE_STALE_MESSAGE = timedelta(minutes=CADENCE_STALE_MESSAGE_DEFAULT)
+
+# Battery levels and times to empty below which the cadence is capped
+CADENCE_BATTERY_CRITICAL_LEVEL = 0.15
+CADENCE_BATTERY_CRITICAL_HOURS = 12
+CADENCE_BATTERY_LOW_HOURS = 24
+
+HOME_ZONE = 'zone.home'
+
+class CadenceDecision(NamedTuple):
+    current: str | None
+    recommended: str
+    score: float
+    reasons: List[str]
+    changed: bool
+
+class CadenceOptimizer():
+    """
+    Scores how fresh each dog's position needs to be, and maps the score onto a phone home cadence.
+
+    The score starts at Standard, and is raised while the dog is moving or away from home and lowered while the dog is
+    settled at home or the battery is running low. To avoid flapping, the score must clear a boundary by a margin before
+    the cadence changes, and a dog keeps a cadence for a minimum time unless the battery is critical.
+    """
+
+    def __init__(self, stale_message: timedelta = CADENCE_STALE_MESSAGE):
+        self.stale_message = stale_message
+        self._last_changes: Dict[str, datetime] = {}
+
+    def evaluate(self, dog_id: str, data: DogData, now: datetime) -> CadenceDecision | None:
+        """
+        Choose the cadence for a dog.
+
+        :param dog_id: The Id for the dog.
+        :param data: The current data for the dog.
+        :param now: The current time.
+        :return: The decision, or None if there is no monitor data for the dog.
+        """
+        monitor = data.monitor
+        if monitor is None:
+            return None
+
+        current = PHONE_HOME_CADENCE_MAP.get(monitor.phone_home_cadence)
+        reasons: List[str] = []
+
+        if monitor.live_tracking_reason != 0:
+            # Positions are already being streamed, so leave the cadence for when live tracking ends
+            return CadenceDecision(current, current or CADENCE_STANDARD, 0.5, ['live_tracking'], False)
+
+        score = 0.5
+
+        moving = self.__is_moving(data)
+        if moving:
+            score += 0.4
+            reasons.append('moving')
+
+        at_home = HOME_ZONE in data.zones
+        if not at_home and monitor.position is not None:
+            score += 0.2
+            reasons.append('away')
+        elif at_home and not moving:
+            score -= 0.3
+            reasons.append('settled_at_home')
+
+        last_message = monitor.contact_timings.last_message_received_at
+        if last_message is None or now - last_message > self.stale_message:
+            score = max(score, CADENCE_THRESHOLDS[0] + CADENCE_HYSTERESIS)
+            reasons.append('stale')
+
+        critical = False
+        battery = monitor.battery
+        if not battery.is_charging and battery.level_fraction is not None:
+            time_to_empty = data.battery_prediction.time_to_empty if data.battery_prediction else None
+            hours_to_empty = time_to_empty.total_seconds() / 3600 if time_to_empty else None
+            if battery.level_fraction < CADENCE_BATTERY_CRITICAL_LEVEL or (hours_to_empty is not None and hours_to_empty < CADENCE_BATTERY_CRITICAL_HOURS):
+                critical = True
+                score = 0.0
+                reasons.append('battery_critical')
+            elif hours_to_empty is not None and hours_to_empty < CADENCE_BATTERY_LOW_HOURS:
+                score = min(score, CADENCE_THRESHOLDS[1] - CADENCE_HYSTERESIS)
+                reasons.append('battery_low')
+            elif battery.level_fraction < 0.5:
+                score -= 0.5 - battery.level_fraction
+                reasons.append('battery_below_half')
+
+        recommended = self.__cadence_for_score(score, current)
+        changed = recommended != current
+        last_change = self._last_changes.get(dog_id)
+        if changed and not critical and last_change is not None and now - last_change < CADENCE_MIN_DWELL:
+            reasons.append('min_dwell')
+            recommended = current
+            changed = False
+
+        _LOGGER.debug('Cadence for dog %s scored %.2f (%s): %s', dog_id, score, ', '.join(reasons), recommended)
+        return CadenceDecision(current, recommended, round(score, 2), reasons, changed)
+
+    def record_change(self, dog_id: str, now: datetime) -> None:
+        """Record that the cadence for a dog was changed, starting the minimum dwell time."""
+        self._last_changes[dog_id] = now
+
+    @staticmethod
+    def __is_moving(data: DogData) -> bool:
+        # Taken from the fixes rather than earlier evaluations, so how often the cadence is evaluated (including dry
+        # runs) doesn't change the result
+        position = data.filtered_position
+        return position is not None and position.speed > CADENCE_MOVING_SPEED
+
+    @staticmethod
+    def __cadence_for_score(score: float, current: str | None) -> str:
+        low, high = CADENCE_THRESHOLDS
+        if current == CADENCE_ECONOMY:
+            low += CADENCE_HYSTERESIS
+        elif current == CADENCE_URGENT:
+            high -= CADENCE_HYSTERESIS
+        elif current == CADENCE_STANDARD:
+            low -= CADENCE_HYSTERESIS
+            high += CADENCE_HYSTERESIS
+
+        if score < low:
+            return CADENCE_ECONOMY
+        if score > high:
+            return CADENCE_URGENT
+        return CADENCE_STANDARD
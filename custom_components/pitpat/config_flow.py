@@ -1,6 +1,7 @@
 """Config flow for PitPat integration."""
+import asyncio
 import logging
-from typing import Any, Dict, Mapping
+from typing import Any, Mapping
 
 from aiohttp import ClientResponseError
 import voluptuous as vol
@@ -11,17 +12,21 @@ from homeassistant.config_entries import (
     CONN_CLASS_CLOUD_POLL,
     SOURCE_REAUTH,
 )
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.core import (
     callback,
     HomeAssistant
 )
 from requests.exceptions import ConnectionError
 
-from .api import InvalidCredentialsError, PitPatApiClient
+from .api import InvalidCredentialsError, PitPatApiClient, PitPatHosts
 from .const import (
+    CONFIG_KEY_API_BASE_URL,
+    CONFIG_KEY_USER_ID,
     DOMAIN,
 )
+from .coordinator import get_api_hosts
+from .handoff import ValidatedAccount, async_store_handoff
 from .options_flow import OptionsFlowHandler
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,13 +41,39 @@ DATA_SCHEMA = vol.Schema(
     }
 )
 
-async def validate_input(hass: HomeAssistant, username: str, password: str) -> Dict[str, Any]:
-    """Validate the user input allows us to connect.
+# Only shown in advanced mode, for pointing the integration at the local simulator
+ADVANCED_DATA_SCHEMA = DATA_SCHEMA.extend(
+    {
+        vol.Optional(CONFIG_KEY_API_BASE_URL, default=''): str,
+    }
+)
+
+class WrongAccountError(Exception):
+    """The credentials are for a different account to the config entry."""
+    pass
 
-    Data has the keys from DATA_SCHEMA with values provided by the user.
+async def validate_input(hass: HomeAssistant, username: str, password: str, hosts: PitPatHosts, user_id: str | None = None) -> ValidatedAccount:
+    """Validate the user input allows us to connect, fetching the user Id and dogs so setup doesn't have to.
+
+    Data has the keys from DATA_SCHEMA with values provided by the user. When the user Id is already known (i.e.
+    re-authenticating), the settings and dogs are fetched at the same time, and the settings confirm the account.
     """
-    session = async_create_clientsession(hass)
-    return await PitPatApiClient.async_authenticate_from_credentials(session, username, password)
+    session = async_get_clientsession(hass)
+    tokens = await PitPatApiClient.async_authenticate_from_credentials(session, username, password, hosts)
+    api_client = PitPatApiClient(session, tokens, hosts, user_id)
+    if user_id:
+        settings, dogs = await asyncio.gather(api_client.async_get_settings(), api_client.async_get_dogs(), return_exceptions=True)
+        if isinstance(settings, BaseException):
+            raise settings
+        if settings.get('UserId') != user_id:
+            raise WrongAccountError()
+        if isinstance(dogs, BaseException):
+            raise dogs
+    else:
+        if not await api_client.async_ensure_user_id_present():
+            raise InvalidCredentialsError()
+        dogs = await api_client.async_get_dogs()
+    return ValidatedAccount(tokens, api_client.user_id, dogs)
 
 class PitPatConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the integration."""
@@ -56,17 +87,32 @@ class PitPatConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 username = user_input[DATA_KEY_EMAIL]
-                tokens = await validate_input(self.hass, username, user_input[DATA_KEY_PASSWORD])
+                user_id = None
+                if self.source == SOURCE_REAUTH:
+                    base_url = self._get_reauth_entry().data.get(CONFIG_KEY_API_BASE_URL, '')
+                    user_id = self._get_reauth_entry().data.get(CONFIG_KEY_USER_ID)
+                else:
+                    base_url = user_input.get(CONFIG_KEY_API_BASE_URL, '')
+                hosts = get_api_hosts({CONFIG_KEY_API_BASE_URL: base_url})
+                account = await validate_input(self.hass, username, user_input[DATA_KEY_PASSWORD], hosts, user_id)
+                data = {**account.tokens, CONFIG_KEY_USER_ID: account.user_id}
+                if base_url:
+                    data[CONFIG_KEY_API_BASE_URL] = base_url
+
+                # Lets setup start from the tokens and dogs just fetched, rather than authenticating again
+                async_store_handoff(self.hass, account)
                 if self.source == SOURCE_REAUTH:
                     return self.async_update_reload_and_abort(
                         self._get_reauth_entry(),
-                        data_updates=tokens,
+                        data_updates=data,
                         reload_even_if_entry_is_unchanged=True
                     )
                 else:
                     return self.async_create_entry(
                         title=username,
-                        data=tokens)
+                        data=data)
+            except WrongAccountError:
+                return self.async_abort(reason='wrong_account')
             except ConnectionError as err:
                 _LOGGER.exception(err)
                 errors["base"] = "cannot_connect"
@@ -80,8 +126,9 @@ class PitPatConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception(ex)
                 errors["base"] = "unknown"
 
+        data_schema = ADVANCED_DATA_SCHEMA if self.show_advanced_options and self.source != SOURCE_REAUTH else DATA_SCHEMA
         return self.async_show_form(
-            step_id="user", data_schema=DATA_SCHEMA, errors=errors
+            step_id="user", data_schema=data_schema, errors=errors
         )
 
     async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> ConfigFlowResult:
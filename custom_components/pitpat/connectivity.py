@@ -0,0 +1,104 @@
+"""Connectivity health of a collar from the timing of its messages and its signal quality."""
+
+from datetime import datetime, timedelta
+import logging
+from typing import NamedTuple
+
+from .const import MESSAGE_OVERDUE_GRACE_DEFAULT, OFFLINE_MISSED_CHECK_INS_DEFAULT
+from .models import Monitor
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long after the next message was expected before a collar counts as overdue, unless changed in the options
+MESSAGE_OVERDUE_GRACE = timedelta(minutes=MESSAGE_OVERDUE_GRACE_DEFAULT)
+
+# Weight of the newest reading in the signal quality trend
+SIGNAL_TREND_ALPHA = 0.2
+
+# Once this many check-ins in a row have been missed, the collar is treated as offline, unless changed in the options
+OFFLINE_MISSED_CHECK_INS = OFFLINE_MISSED_CHECK_INS_DEFAULT
+
+class ConnectivityStatus(NamedTuple):
+    lateness: timedelta | None
+    """How late the last message was compared with when it was expected. Negative if it was early."""
+    missed_check_ins: int
+    """Check-ins missed since the last message was received."""
+    missed_check_ins_total: int
+    """Check-ins missed since the integration started."""
+    signal_trend: float | None
+    """Exponentially weighted average of the network quality (0-5)."""
+    overdue: bool
+    overdue_since: datetime | None
+    offline: bool
+
+class ConnectivityTracker():
+    """
+    Tracks the connectivity of a single collar, keeping only the last message and running totals.
+
+    Each new message is compared with the time it was expected, and the check-in interval (the time between a message
+    and when the next one is expected) is used to count the check-ins which were missed before it arrived, and those
+    missed since the last message.
+    """
+
+    __slots__ = ('_received_at', '_expected_at', '_lateness', '_missed_total', '_signal_trend')
+
+    def __init__(self):
+        self._received_at: datetime | None = None
+        self._expected_at: datetime | None = None
+        self._lateness: timedelta | None = None
+        self._missed_total = 0
+        self._signal_trend: float | None = None
+
+    def update(
+            self,
+            monitor: Monitor,
+            now: datetime,
+            overdue_grace: timedelta = MESSAGE_OVERDUE_GRACE,
+            offline_missed_check_ins: int = OFFLINE_MISSED_CHECK_INS) -> ConnectivityStatus:
+        """
+        Update from the latest monitor details, and get the status at the current time.
+
+        :param monitor: The latest monitor details.
+        :param now: The current time.
+        :param overdue_grace: How long after the next message was expected before the collar is overdue.
+        :param offline_missed_check_ins: Check-ins missed in a row before the collar is offline.
+        """
+        timings = monitor.contact_timings
+        received_at = timings.last_message_received_at
+        if received_at is not None and (self._received_at is None or received_at > self._received_at):
+            if self._expected_at is not None:
+                self._lateness = received_at - self._expected_at
+                self._missed_total += self.__missed_since(self._received_at, self._expected_at, received_at, overdue_grace)
+            self._received_at = received_at
+            self._expected_at = timings.next_message_expected_at
+
+            quality = monitor.network.quality
+            if quality is not None:
+                if self._signal_trend is None:
+                    self._signal_trend = float(quality)
+                else:
+                    self._signal_trend += SIGNAL_TREND_ALPHA * (quality - self._signal_trend)
+        elif self._received_at == received_at and timings.next_message_expected_at is not None:
+            self._expected_at = timings.next_message_expected_at
+
+        missed = self.__missed_since(self._received_at, self._expected_at, now, overdue_grace)
+        overdue = self._expected_at is not None and now > self._expected_at + overdue_grace
+        return ConnectivityStatus(
+            lateness=self._lateness,
+            missed_check_ins=missed,
+            missed_check_ins_total=self._missed_total + missed,
+            signal_trend=self._signal_trend,
+            overdue=overdue,
+            overdue_since=self._expected_at if overdue else None,
+            offline=missed >= offline_missed_check_ins,
+        )
+
+    @staticmethod
+    def __missed_since(received_at: datetime | None, expected_at: datetime | None, until: datetime, grace: timedelta) -> int:
+        """The number of check-ins expected between a message and a later time, allowing for the grace period."""
+        if received_at is None or expected_at is None or until <= expected_at + grace:
+            return 0
+        interval = expected_at - received_at
+        if interval <= timedelta(0):
+            return 1
+        return 1 + int((until - expected_at - grace) / interval)
@@ -4,12 +4,80 @@ from typing import Dict
 DOMAIN = "pitpat"
 MANUFACTURER = "PitPat"
 
+CONFIG_KEY_API_BASE_URL = "api_base_url"
+CONFIG_KEY_USER_ID = "user_id"
+
 OPTIONS_KEY_UPDATE_INTERVAL = "update_interval"
+OPTIONS_KEY_DOGS_UPDATE_INTERVAL = "dogs_update_interval"
+OPTIONS_KEY_PUSH_CONNECTED_UPDATE_INTERVAL = "push_connected_update_interval"
+OPTIONS_KEY_OFFLINE_UPDATE_INTERVAL = "offline_update_interval"
+OPTIONS_KEY_LIVE_TRACKING_UPDATE_INTERVAL = "live_tracking_update_interval"
+OPTIONS_KEY_MAX_CONCURRENT_REFRESHES = "max_concurrent_refreshes"
+OPTIONS_KEY_REQUEST_TIMEOUT = "request_timeout"
+OPTIONS_KEY_REFRESH_TIMEOUT = "refresh_timeout"
+OPTIONS_KEY_MESSAGE_OVERDUE_GRACE = "message_overdue_grace"
+OPTIONS_KEY_OFFLINE_MISSED_CHECK_INS = "offline_missed_check_ins"
+OPTIONS_KEY_CADENCE_STALE_MESSAGE = "cadence_stale_message"
+OPTIONS_KEY_PUSH_URL = "push_url"
+OPTIONS_KEY_ACTIVITY_RETENTION_DAYS = "activity_retention_days"
+OPTIONS_KEY_RECORD_TRAFFIC = "record_traffic"
+OPTIONS_KEY_LIVE_TRACKING_TIMEOUT = "live_tracking_timeout"
 
 DATA_KEY_COORDINATOR = "coordinator"
+DATA_KEY_PUSH_RECEIVER = "push_receiver"
+
+# Sent with the Ids of dogs added to the account, formatted with the config entry Id
+SIGNAL_DOGS_ADDED = "pitpat_dogs_added_{}"
+
+SERVICE_OPTIMIZE_CADENCE = "optimize_cadence"
+SERVICE_EXPORT = "export"
+SERVICE_PROFILE = "profile"
 
 UPDATE_INTERVAL_DEFAULT = 5
 
+# Dog profiles rarely change, so are refreshed much less often than the monitor and activity of each dog (minutes)
+DOGS_UPDATE_INTERVAL_DEFAULT = 60
+
+# Polling only needs to pick up activity and anything missed while push updates are being received (minutes)
+PUSH_CONNECTED_UPDATE_INTERVAL_DEFAULT = 30
+
+# A collar which has missed several check-ins has nothing new to fetch, so is only polled often enough to notice it
+# coming back (minutes)
+OFFLINE_UPDATE_INTERVAL_DEFAULT = 30
+
+# Interval of the position refreshes while live tracking (seconds)
+LIVE_TRACKING_UPDATE_INTERVAL_DEFAULT = 15
+LIVE_TRACKING_UPDATE_INTERVAL_MIN = 5
+
+# Dogs refreshing at the same time beyond this wait for their turn, to spread the load of large accounts
+MAX_CONCURRENT_REFRESHES_DEFAULT = 4
+
+# Total time allowed for each API request (seconds). The activity history is allowed longer as long as data keeps
+# arriving.
+REQUEST_TIMEOUT_DEFAULT = 20
+REQUEST_TIMEOUT_MIN = 5
+
+# Maximum time for refreshing a single dog including any re-authentication, so a slow monitor doesn't hold up the
+# next refresh (seconds)
+REFRESH_TIMEOUT_DEFAULT = 60
+REFRESH_TIMEOUT_MIN = 10
+
+# How long after the next message was expected before a collar counts as overdue (minutes)
+MESSAGE_OVERDUE_GRACE_DEFAULT = 10
+
+# Once this many check-ins in a row have been missed, the collar is treated as offline
+OFFLINE_MISSED_CHECK_INS_DEFAULT = 3
+
+# Without a message for this long, the cadence optimizer uses at least Standard to get fresh data (minutes)
+CADENCE_STALE_MESSAGE_DEFAULT = 120
+
+# Must cover the longest rolling activity average
+ACTIVITY_RETENTION_DAYS_DEFAULT = 365
+ACTIVITY_RETENTION_DAYS_MIN = 31
+
+# Minutes before live tracking is stopped automatically
+LIVE_TRACKING_TIMEOUT_DEFAULT = 30
+
 DEVICE_MODEL_MAP: Dict[int, str] = {
     6: 'GPS Tracker'
 }
@@ -1,41 +1,289 @@
 
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import partial
 import logging
-from typing import Dict
+import os
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Set, Tuple, TypeVar
 
+from aiohttp import ClientError, ClientResponseError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator
+    DataUpdateCoordinator,
+    UpdateFailed,
 )
 
-from .api import InvalidCredentialsError, PitPatApiClient
-from .const import DOMAIN
+from .activity_stats import ActivityDaySummary, ActivityStatsTracker
+from .aggregates import AccountAggregator
+from .api import PRODUCTION_HOSTS, InvalidCredentialsError, InvalidResponseError, PitPatApiClient, PitPatHosts
+from .battery_model import BatteryModelStore
+from .cadence_optimizer import CadenceOptimizer
+from .connectivity import ConnectivityTracker
+from .const import CONFIG_KEY_API_BASE_URL, CONFIG_KEY_USER_ID, DEVICE_MODEL_MAP, DOMAIN, MANUFACTURER, SIGNAL_DOGS_ADDED
+from .geofence import GeofenceEngine
+from .handoff import ValidatedAccount
+from .live_tracking import EVENT_LIVE_TRACKING_ENDED, STOP_REASONS_STOP_TRACKING, LiveTrackingSession
+from .memory import deep_sizeof
+from .models import ActivityDay, Dog, DogData, Monitor, Position
+from .options import PitPatOptions
+from .position_filter import FilteredPosition, PositionFilter
+from .statistics_import import ActivityStatisticsImporter
+from .traffic import TRACE_DIRECTORY, TrafficRecorder
+from .walks import WalkEngine
 
 _LOGGER = logging.getLogger(__name__)
 
-TCoordinatorData = Dict[str, dict]
+TCoordinatorData = Dict[str, Dog]
+
+T = TypeVar('T')
+
+# Part of the refresh timeout allowed for the requests making up a single dog refresh, which run concurrently. Any
+# requests not completed by then are cancelled and the previous data is kept for them, leaving the rest of the timeout
+# for re-authenticating.
+DOG_REFRESH_DEADLINE_FRACTION = 0.75
+
+# Number of consecutive refreshes of the dogs a dog must be missing from before it is removed, so a single response
+# missing a dog doesn't remove its device and entities
+DOG_REMOVAL_MISSED_REFRESHES = 2
+
+def get_api_hosts(entry_data: Mapping[str, Any]) -> PitPatHosts:
+    """The PitPat services for a config entry, which may have been pointed at a simulator."""
+    base_url = entry_data.get(CONFIG_KEY_API_BASE_URL)
+    return PitPatHosts.from_base_url(base_url) if base_url else PRODUCTION_HOSTS
+
+@callback
+def _async_set_update_interval(coordinator: DataUpdateCoordinator, update_interval: timedelta, refresh: bool = True) -> None:
+    """
+    Change the interval of a coordinator.
+
+    :param refresh: Whether to refresh straight away when the interval changes, which schedules the following refresh
+        at the new interval rather than waiting for the refresh already scheduled. Not needed during a refresh, as
+        the next one is scheduled at the new interval once it completes.
+    """
+    if coordinator.update_interval == update_interval:
+        return
+    coordinator.update_interval = update_interval
+    if refresh:
+        coordinator.config_entry.async_create_background_task(
+            coordinator.hass, coordinator.async_request_refresh(), f'{DOMAIN} apply update interval')
 
 class PitPatDataUpdateCoordinator(DataUpdateCoordinator[TCoordinatorData]):
-    """DataUpdateCoordinator to handle fetching data from PitPat."""
+    """
+    DataUpdateCoordinator to handle fetching the dogs registered to a PitPat account.
+
+    The monitor and activity of each dog are fetched by a separate PitPatDogDataUpdateCoordinator, so that a slow or
+    failing monitor only affects that dog. This coordinator holds the API client and authentication shared by them.
+    """
 
-    def __init__(self, hass: HomeAssistant, update_interval: int, config_entry: ConfigEntry):
-        """Initialize the coordinator and set up the Controller object."""
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            config_entry: ConfigEntry,
+            options: PitPatOptions,
+            handoff: ValidatedAccount | None = None,
+            session_factory: Callable[[HomeAssistant], Any] = async_create_clientsession):
+        """
+        Initialize the coordinator and set up the Controller object.
+
+        :param handoff: The account validated by the config flow, if setup follows it. Its tokens are used for the
+            first authentication, and its dogs for the first refresh.
+        :param session_factory: Creates the session for each new API client, e.g. a ReplaySession to replay a trace
+            through the coordinators.
+        """
         self._hass = hass
         self._config_entry = config_entry
+        self._session_factory = session_factory
 
         self._available = True
+        self.options = options
+        self.refresh_semaphore = asyncio.Semaphore(options.max_concurrent_refreshes)
         self.api_client: PitPatApiClient | None = None
+        self._auth_lock = asyncio.Lock()
+        self._handoff_account = handoff
+        self._handoff_dogs = handoff.dogs if handoff is not None else None
+        self.statistics_importer = ActivityStatisticsImporter(hass, config_entry.entry_id)
+        self.geofence = GeofenceEngine(hass)
+        self.battery_models = BatteryModelStore(hass, config_entry.entry_id)
+        self.cadence_optimizer = CadenceOptimizer(timedelta(minutes=options.cadence_stale_message))
+        self.walks = WalkEngine(hass, config_entry.entry_id)
+        self.dog_coordinators: Dict[str, PitPatDogDataUpdateCoordinator] = {}
+        self.aggregator = AccountAggregator(hass, lambda: [
+            (dog_coordinator.dog or Dog(dog_coordinator.dog_id), dog_coordinator.data)
+            for dog_coordinator in self.dog_coordinators.values()
+        ])
+        self._reconcile_lock = asyncio.Lock()
+        self._missed_refreshes: Dict[str, int] = {}
+        self.traffic_recorder: TrafficRecorder | None = None
+        self._unsub_reconcile: CALLBACK_TYPE | None = None
+        self._push_connected = False
 
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(minutes=update_interval),
+            update_interval=timedelta(minutes=options.dogs_update_interval),
         )
 
+    @property
+    def dog_update_interval(self) -> timedelta:
+        """The polling interval for each dog, allowing for any push connection."""
+        update_interval = timedelta(minutes=self.options.update_interval)
+        if self._push_connected:
+            update_interval = max(update_interval, timedelta(minutes=self.options.push_connected_update_interval))
+        return update_interval
+
+    async def async_apply_options(self, options: PitPatOptions) -> None:
+        """
+        Apply changed options to the running coordinators and API client, keeping the data already fetched. Changed
+        intervals refresh straight away so the next refresh is scheduled at the new interval, and changed limits apply
+        from the next request or refresh.
+        """
+        previous, self.options = self.options, options
+        _async_set_update_interval(self, timedelta(minutes=options.dogs_update_interval))
+        if options.max_concurrent_refreshes != previous.max_concurrent_refreshes:
+            # Refreshes holding the previous semaphore release it as normal
+            self.refresh_semaphore = asyncio.Semaphore(options.max_concurrent_refreshes)
+        if self.api_client is not None:
+            self.api_client.set_request_timeout(options.request_timeout)
+        self.cadence_optimizer.stale_message = timedelta(minutes=options.cadence_stale_message)
+
+        for dog_coordinator in self.dog_coordinators.values():
+            dog_coordinator.async_apply_options()
+        _LOGGER.debug('Applied options: %s', options)
+
+        await self.async_set_record_traffic(options.record_traffic)
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:
+        """Poll less often while push updates are received, and go back to normal polling when they stop."""
+        self._push_connected = connected
+        self.__apply_update_interval()
+
+    def __apply_update_interval(self) -> None:
+        for dog_coordinator in self.dog_coordinators.values():
+            dog_coordinator.async_apply_update_interval()
+        _LOGGER.debug('Dog update interval set to %s', self.dog_update_interval)
+
+    async def async_set_record_traffic(self, enabled: bool) -> None:
+        """Start or stop recording the API traffic. The API client is replaced so the change applies to the next request."""
+        if enabled == (self.traffic_recorder is not None):
+            return
+
+        if self.traffic_recorder is not None:
+            await self.traffic_recorder.async_flush()
+            _LOGGER.info('Stopped recording API traffic to %s', self.traffic_recorder.path)
+            self.traffic_recorder = None
+        else:
+            path = self._hass.config.path(TRACE_DIRECTORY, f'{self._config_entry.entry_id}_{datetime.now():%Y%m%d%H%M%S}.jsonl.gz')
+            await self._hass.async_add_executor_job(partial(os.makedirs, os.path.dirname(path), exist_ok=True))
+            self.traffic_recorder = TrafficRecorder(path, self._hass.async_add_executor_job)
+            _LOGGER.info('Recording API traffic to %s', path)
+        self.api_client = None
+
+    @callback
+    def async_apply_monitor_update(self, dog_id: str, monitor_update: dict) -> None:
+        """Merge a partial monitor update for a dog into the current data."""
+        dog_coordinator = self.dog_coordinators.get(dog_id)
+        if dog_coordinator is None:
+            _LOGGER.debug('Ignoring monitor update for unknown dog %s', dog_id)
+            return
+
+        dog_coordinator.async_apply_monitor_update(monitor_update)
+
+    async def async_setup_dog_coordinators(self) -> None:
+        """Create a coordinator for each dog and fetch the initial data for them."""
+        await self.battery_models.async_load()
+        await self.walks.async_load()
+        await self.async_reconcile_dogs()
+
+        # Also keeps the dogs refreshing when there are no dog coordinators listening, so a dog added later is found
+        if self._unsub_reconcile is None:
+            self._unsub_reconcile = self.async_add_listener(self.__async_dogs_updated)
+
+    @callback
+    def __async_dogs_updated(self) -> None:
+        if set(self.data or {}) != set(self.dog_coordinators):
+            self.config_entry.async_create_background_task(self._hass, self.async_reconcile_dogs(), f'{DOMAIN} reconcile dogs')
+
+    async def async_reconcile_dogs(self) -> None:
+        """
+        Match the dog coordinators to the dogs on the account, so only the entities and devices of dogs which have
+        been added or removed are changed rather than reloading the config entry.
+
+        Platforms are told about new dogs with SIGNAL_DOGS_ADDED once their initial data has been fetched. Dogs missing
+        from DOG_REMOVAL_MISSED_REFRESHES consecutive refreshes have their device removed, which also removes their
+        entities. Nothing is removed while the account has no dogs, as that is more likely a glitch of the API.
+        """
+        async with self._reconcile_lock:
+            dog_ids = set(self.data or {})
+            removed = [
+                dog_id
+                for dog_id in self.dog_coordinators
+                if dog_ids and self._missed_refreshes.get(dog_id, 0) >= DOG_REMOVAL_MISSED_REFRESHES
+            ]
+            added = [dog_id for dog_id in dog_ids if dog_id not in self.dog_coordinators]
+
+            for dog_id in removed:
+                await self.__async_remove_dog(dog_id)
+            if removed:
+                self.aggregator.async_schedule_update()
+
+            for dog_id in added:
+                _LOGGER.info('Adding dog %s', dog_id)
+                self.dog_coordinators[dog_id] = PitPatDogDataUpdateCoordinator(self._hass, self, dog_id)
+
+            # A dog which fails here is unavailable until its next successful refresh, rather than failing setup
+            await asyncio.gather(*[
+                self.dog_coordinators[dog_id].async_refresh()
+                for dog_id in added
+            ])
+
+            if added:
+                async_dispatcher_send(self._hass, SIGNAL_DOGS_ADDED.format(self.config_entry.entry_id), added)
+
+    async def __async_remove_dog(self, dog_id: str) -> None:
+        _LOGGER.info('Removing dog %s', dog_id)
+        dog_coordinator = self.dog_coordinators.pop(dog_id)
+        self._missed_refreshes.pop(dog_id, None)
+        await dog_coordinator.async_shutdown()
+        self.walks.async_remove_dog(dog_id)
+        self.battery_models.async_remove_dog(dog_id)
+        self.geofence.async_remove_dog(dog_id)
+
+        device_registry = dr.async_get(self._hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, dog_id)})
+        if device is not None:
+            device_registry.async_update_device(device.id, remove_config_entry_id=self.config_entry.entry_id)
+
+    async def async_shutdown(self) -> None:
+        if self._unsub_reconcile:
+            self._unsub_reconcile()
+            self._unsub_reconcile = None
+        if self.traffic_recorder is not None:
+            await self.traffic_recorder.async_flush()
+        await super().async_shutdown()
+
+    async def async_get_api_client(self) -> PitPatApiClient:
+        """Get the authenticated API client, authenticating first if required."""
+        async with self._auth_lock:
+            await self._async_ensure_ready()
+            return self.api_client
+
+    @callback
+    def async_invalidate_api_client(self, api_client: PitPatApiClient) -> None:
+        """Discard the API client so that the next request re-authenticates, unless it has already been replaced."""
+        if self.api_client is api_client:
+            self.api_client = None
+
     async def _async_ensure_ready(self):
         if not self.api_client:
             await self._async_refresh_auth()
@@ -45,14 +293,32 @@ class PitPatDataUpdateCoordinator(DataUpdateCoordinator[TCoordinatorData]):
             raise ConfigEntryAuthFailed()
 
     async def _async_refresh_auth(self):
-        _LOGGER.info('Preparing new API client from refresh token.')
+        handoff, self._handoff_account = self._handoff_account, None
         try:
-            session = async_create_clientsession(self._hass)
-            tokens = await PitPatApiClient.async_authenticate_from_refresh_token(session, self._config_entry.data.get('refresh_token'))
-            self.api_client = PitPatApiClient(session, tokens)
+            session = self._session_factory(self._hass)
+            if self.traffic_recorder is not None:
+                session = self.traffic_recorder.wrap(session)
+            hosts = get_api_hosts(self._config_entry.data)
+            if handoff is not None:
+                _LOGGER.info('Preparing new API client from validated credentials.')
+                tokens, user_id = handoff.tokens, handoff.user_id
+            else:
+                _LOGGER.info('Preparing new API client from refresh token.')
+                tokens = await PitPatApiClient.async_authenticate_from_refresh_token(session, self._config_entry.data.get('refresh_token'), hosts)
+                user_id = self._config_entry.data.get(CONFIG_KEY_USER_ID)
+                self.__save_tokens(tokens)
+            self.api_client = PitPatApiClient(session, tokens, hosts, user_id)
+            self.api_client.set_request_timeout(self.options.request_timeout)
         except InvalidCredentialsError as err:
             raise ConfigEntryAuthFailed() from err
 
+    def __save_tokens(self, tokens: Dict[str, Any]) -> None:
+        """Keep the config entry up to date with the tokens, as a refresh token may only be usable once."""
+        refresh_token = tokens.get('refresh_token')
+        if refresh_token and refresh_token != self._config_entry.data.get('refresh_token'):
+            _LOGGER.debug('Saving new refresh token')
+            self._hass.config_entries.async_update_entry(self._config_entry, data={**self._config_entry.data, **tokens})
+
     async def _async_update_data(self) -> TCoordinatorData:
         """Fetch data"""
         try:
@@ -67,28 +333,396 @@ class PitPatDataUpdateCoordinator(DataUpdateCoordinator[TCoordinatorData]):
             return await self._async_refresh_data()
 
     async def _async_refresh_data(self) -> TCoordinatorData:
-        await self._async_ensure_ready()
+        api_client = await self.async_get_api_client()
+        dogs_data, self._handoff_dogs = self._handoff_dogs, None
+        if dogs_data is None:
+            dogs_data = await api_client.async_get_dogs()
+        dogs = [Dog.from_api(dog) for dog in dogs_data]
+        self.__count_missed_refreshes({ dog.id for dog in dogs })
+        return { dog.id: dog for dog in dogs }
 
-        dogs = await self.api_client.async_get_dogs()
-        data = { d['Id']: d for d in dogs}
+    def __count_missed_refreshes(self, dog_ids: Set[str]) -> None:
+        """Count the consecutive refreshes each dog has been missing from, ignoring any refresh without dogs."""
+        if not dog_ids:
+            _LOGGER.warning('No dogs were returned for the account. Keeping the existing dogs.')
+            return
+        self._missed_refreshes = {
+            dog_id: self._missed_refreshes.get(dog_id, 0) + 1
+            for dog_id in self.dog_coordinators
+            if dog_id not in dog_ids
+        }
 
-        for dog_id in data.keys():
-            data[dog_id] = {
-                **data[dog_id],
-                **await self._async_update_dog_data(dog_id)
-            }
+class PitPatDogDataUpdateCoordinator(DataUpdateCoordinator[DogData]):
+    """DataUpdateCoordinator to handle fetching the monitor and activity of a single dog."""
 
-        return data
+    def __init__(self, hass: HomeAssistant, account: PitPatDataUpdateCoordinator, dog_id: str):
+        self.account = account
+        self.dog_id = dog_id
 
-    async def _async_update_dog_data(self, dog_id) -> dict:
-        monitor_details = await self.api_client.async_get_monitor(dog_id)
-        all_activity_days = await self.api_client.async_get_all_activity_days(dog_id)
+        self._activity_stats = ActivityStatsTracker()
+        self._position_filter = PositionFilter()
+        self._connectivity = ConnectivityTracker()
+        self._offline = False
+        self._live_tracking: LiveTrackingSession | None = None
+        self._unsub_live_tracking: CALLBACK_TYPE | None = None
+        self._live_tracking_refreshing = False
+        self._device_info: Tuple[Tuple[Dog | None, str | None], DeviceInfo] | None = None
 
-        activity_today = None
-        if (len(all_activity_days) > 0):
-            activity_today = sorted(all_activity_days, key=lambda item: item.get('Date'), reverse=True)[0]
+        # Shared by every entity for the dog rather than built for each state write
+        self.static_attributes: Dict[str, Any] = {'dog_id': dog_id}
 
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=account.config_entry,
+            name=f'{DOMAIN} {dog_id}',
+            update_interval=account.dog_update_interval,
+        )
+
+        # Also keeps the account coordinator refreshing, as entities only listen to the dog coordinators
+        self._unsub_account = account.async_add_listener(self.__async_account_updated)
+
+    @property
+    def api_client(self) -> PitPatApiClient | None:
+        return self.account.api_client
+
+    @property
+    def dog(self) -> Dog | None:
+        """The details of the dog from the account."""
+        return (self.account.data or {}).get(self.dog_id)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Device information for the dog, only rebuilt when the dog details or monitor serial number change."""
+        dog = self.dog
+        serial_number = self.data.monitor.serial_number if self.data and self.data.monitor else None
+        key = (dog, serial_number)
+        if self._device_info is None or self._device_info[0] != key:
+            dog = dog or Dog(self.dog_id)
+            self._device_info = (key, DeviceInfo(
+                identifiers={(DOMAIN, self.dog_id)},
+                name=dog.name,
+                manufacturer=MANUFACTURER,
+                model_id=dog.monitor_model,
+                model=DEVICE_MODEL_MAP.get(dog.monitor_model, ''),
+                sw_version=dog.firmware_version,
+                hw_version=dog.hardware_version,
+                serial_number=serial_number,
+            ))
+        return self._device_info[1]
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """Estimate the memory in bytes held for the dog, by the data it is refreshed with."""
+        data = self.data or DogData()
         return {
-            'monitor_details': monitor_details,
-            'activity_today': activity_today,
+            'dog': deep_sizeof(self.dog),
+            'monitor': deep_sizeof(data.monitor, data.updated_at, data.connectivity, self._connectivity),
+            'activity': deep_sizeof(data.activity_today, data.activity_stats, self._activity_stats),
+            'position': deep_sizeof(data.zones, data.filtered_position, self._position_filter),
+            'battery': deep_sizeof(data.battery_prediction, self.account.battery_models.get(self.dog_id)),
         }
+
+    @callback
+    def async_apply_update_interval(self, refresh: bool = True) -> None:
+        """
+        Poll at the interval for the account, or less often while the collar is offline.
+
+        :param refresh: Whether to refresh straight away if the interval changed, rather than from within a refresh.
+        """
+        update_interval = self.account.dog_update_interval
+        if self._offline:
+            update_interval = max(update_interval, timedelta(minutes=self.account.options.offline_update_interval))
+        _async_set_update_interval(self, update_interval, refresh)
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed options for the account, including to any live tracking session in progress."""
+        self.async_apply_update_interval()
+        if self._unsub_live_tracking is not None:
+            self._unsub_live_tracking()
+            self._unsub_live_tracking = None
+            self.__async_track_live_tracking_interval()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        super().async_update_listeners()
+        self.account.aggregator.async_schedule_update()
+
+    @callback
+    def __async_account_updated(self) -> None:
+        # Let entities pick up any changes to the dog details
+        if self.data is not None:
+            self.async_update_listeners()
+
+    @property
+    def live_tracking_session(self) -> LiveTrackingSession | None:
+        return self._live_tracking
+
+    @callback
+    def async_start_live_tracking(self) -> None:
+        """
+        Refresh the position of the dog frequently until live tracking is stopped, times out or the dog arrives home.
+        Starting again during a session restarts the timeout.
+        """
+        timeout = timedelta(minutes=self.account.options.live_tracking_timeout)
+        self._live_tracking = LiveTrackingSession(datetime.now(timezone.utc), timeout)
+        if self._unsub_live_tracking is None:
+            self.__async_track_live_tracking_interval()
+        _LOGGER.info('Live tracking session started for dog %s until %s', self.dog_id, self._live_tracking.expires_at)
+
+    @callback
+    def __async_track_live_tracking_interval(self) -> None:
+        self._unsub_live_tracking = async_track_time_interval(
+            self.hass,
+            self.__async_live_tracking_interval,
+            timedelta(seconds=self.account.options.live_tracking_update_interval),
+            name=f'{DOMAIN} {self.dog_id} live tracking',
+            cancel_on_shutdown=True,
+        )
+
+    @callback
+    def async_end_live_tracking(self, reason: str) -> None:
+        """End any live tracking session, stopping tracking on the collar if it hasn't already stopped."""
+        session = self._live_tracking
+        if session is None:
+            return
+
+        self._live_tracking = None
+        if self._unsub_live_tracking is not None:
+            self._unsub_live_tracking()
+            self._unsub_live_tracking = None
+
+        now = datetime.now(timezone.utc)
+        _LOGGER.info('Live tracking session ended for dog %s: %s', self.dog_id, reason)
+        self.hass.bus.async_fire(EVENT_LIVE_TRACKING_ENDED, {
+            'dog_id': self.dog_id,
+            'reason': reason,
+            'duration': round((now - session.started_at).total_seconds()),
+        })
+
+        if reason in STOP_REASONS_STOP_TRACKING:
+            self.config_entry.async_create_background_task(
+                self.hass, self.__async_stop_tracking(), f'{DOMAIN} {self.dog_id} stop tracking')
+
+    async def __async_stop_tracking(self) -> None:
+        try:
+            api_client = await self.account.async_get_api_client()
+            await api_client.async_tracking_stop(self.dog_id)
+        except (ClientError, ConfigEntryAuthFailed, TimeoutError) as err:
+            _LOGGER.warning('Unable to stop live tracking for dog %s: %s', self.dog_id, err)
+        await self.async_request_refresh()
+
+    @callback
+    def __async_live_tracking_interval(self, now: datetime) -> None:
+        if not self._live_tracking_refreshing:
+            self._live_tracking_refreshing = True
+            self.config_entry.async_create_background_task(
+                self.hass, self.__async_refresh_position(), f'{DOMAIN} {self.dog_id} live tracking refresh')
+
+    async def __async_refresh_position(self) -> None:
+        """
+        Refresh only the monitor, which holds the position, between the full refreshes. The data is updated in the same
+        way as for push updates, so the normal refresh schedule is unaffected.
+        """
+        api_client = None
+        monitor = None
+        try:
+            api_client = await self.account.async_get_api_client()
+            async with asyncio.timeout(self.account.options.live_tracking_update_interval):
+                monitor = await self._async_get_monitor(api_client)
+        except ClientResponseError as err:
+            if err.status == 401 and api_client is not None:
+                self.account.async_invalidate_api_client(api_client)
+            _LOGGER.debug('Unable to refresh position for dog %s: %s', self.dog_id, err)
+        except (ClientError, ConfigEntryAuthFailed, InvalidResponseError, TimeoutError) as err:
+            _LOGGER.debug('Unable to refresh position for dog %s: %s', self.dog_id, err)
+        finally:
+            self._live_tracking_refreshing = False
+
+        if self.data is None or self._live_tracking is None:
+            return
+        if monitor is None:
+            # The session can still time out while the collar can't be reached
+            self.__check_live_tracking(None, self.data.zones)
+            return
+
+        data = self._with_monitor(self.data, monitor)
+        data.updated_at = {**data.updated_at, 'monitor': datetime.now(timezone.utc)}
+        self.data = data
+        self.async_update_listeners()
+
+    def __check_live_tracking(self, monitor: Monitor | None, zones: List[str]) -> None:
+        if self._live_tracking is None:
+            return
+        reason = self._live_tracking.check(monitor, zones, datetime.now(timezone.utc))
+        if reason is not None:
+            self.async_end_live_tracking(reason)
+
+    async def async_shutdown(self) -> None:
+        if self._unsub_account:
+            self._unsub_account()
+            self._unsub_account = None
+        if self._unsub_live_tracking is not None:
+            self._unsub_live_tracking()
+            self._unsub_live_tracking = None
+        await super().async_shutdown()
+
+    @callback
+    def async_apply_monitor_update(self, monitor_update: dict) -> None:
+        """Merge a partial monitor update into the current data."""
+        if self.data is None:
+            return
+
+        try:
+            monitor = (self.data.monitor or Monitor()).merge(monitor_update)
+        except InvalidResponseError as err:
+            _LOGGER.warning('Ignoring monitor update for dog %s: %s', self.dog_id, err)
+            return
+
+        self.data = self._with_monitor(self.data, monitor)
+        self.async_update_listeners()
+
+    async def _async_update_data(self) -> DogData:
+        """Fetch data, waiting for a turn if the maximum number of dogs are already refreshing"""
+        # Time spent waiting isn't counted towards the refresh timeout
+        async with self.account.refresh_semaphore:
+            return await self._async_fetch_data()
+
+    async def _async_fetch_data(self) -> DogData:
+        api_client = None
+        refresh_timeout = self.account.options.refresh_timeout
+        try:
+            api_client = await self.account.async_get_api_client()
+            async with asyncio.timeout(refresh_timeout):
+                return await self._async_refresh_data(api_client)
+        except ClientResponseError as err:
+            if err.status != 401 or api_client is None:
+                raise UpdateFailed(f'Request for dog {self.dog_id} failed: {err}') from err
+
+            _LOGGER.info('API client is not authenticated. Attempting to re-authenticate.', exc_info=err)
+            self.account.async_invalidate_api_client(api_client)
+            api_client = await self.account.async_get_api_client()
+            async with asyncio.timeout(refresh_timeout):
+                return await self._async_refresh_data(api_client)
+        except (ClientError, InvalidResponseError) as err:
+            raise UpdateFailed(f'Request for dog {self.dog_id} failed: {err}') from err
+        except TimeoutError as err:
+            raise UpdateFailed(f'Timed out updating dog {self.dog_id}') from err
+
+    async def _async_refresh_data(self, api_client: PitPatApiClient) -> DogData:
+        deadline = asyncio.get_running_loop().time() + self.account.options.refresh_timeout * DOG_REFRESH_DEADLINE_FRACTION
+        monitor_result, activity_result = await asyncio.gather(
+            self.__async_with_deadline(deadline, self._async_get_monitor(api_client)),
+            self.__async_with_deadline(deadline, self._async_update_activity(api_client)),
+            return_exceptions=True,
+        )
+
+        failures = [result for result in (monitor_result, activity_result) if isinstance(result, BaseException)]
+        for failure in failures:
+            if isinstance(failure, ClientResponseError) and failure.status == 401:
+                raise failure
+        if len(failures) == 2 or (failures and self.data is None):
+            raise failures[0]
+
+        now = datetime.now(timezone.utc)
+        data = replace(self.data) if self.data is not None else DogData()
+        data.updated_at = dict(data.updated_at)
+
+        if isinstance(monitor_result, BaseException):
+            _LOGGER.warning('Unable to update monitor for dog %s. Keeping previous data.', self.dog_id, exc_info=monitor_result)
+        else:
+            data = self._with_monitor(data, monitor_result)
+            data.updated_at['monitor'] = now
+
+        if isinstance(activity_result, BaseException):
+            _LOGGER.warning('Unable to update activity for dog %s. Keeping previous data.', self.dog_id, exc_info=activity_result)
+        else:
+            data.activity_today, data.activity_stats = activity_result
+            data.updated_at['activity'] = now
+
+        return data
+
+    async def _async_get_monitor(self, api_client: PitPatApiClient) -> Monitor:
+        return Monitor.from_api(await api_client.async_get_monitor(self.dog_id))
+
+    @staticmethod
+    async def __async_with_deadline(deadline: float, awaitable: Awaitable[T]) -> T:
+        async with asyncio.timeout_at(deadline):
+            return await awaitable
+
+    def _with_monitor(self, data: DogData, monitor: Monitor) -> DogData:
+        """
+        Copy the dog data with a new monitor, updating the battery prediction and any walk in progress, and the zones
+        and filtered position from its last known position. A live tracking session is started if the collar has
+        started live tracking, and checked against the new position.
+        """
+        previous = data.monitor
+        data = replace(data, monitor=monitor)
+
+        battery_model = self.account.battery_models.get(self.dog_id)
+        if battery_model.add_reading(monitor):
+            self.account.battery_models.async_schedule_save()
+        data.battery_prediction = battery_model.predict(monitor)
+
+        self.account.walks.async_update(self.dog_id, self.dog.name if self.dog else None, monitor)
+
+        options = self.account.options
+        data.connectivity = self._connectivity.update(
+            monitor,
+            datetime.now(timezone.utc),
+            timedelta(minutes=options.message_overdue_grace),
+            options.offline_missed_check_ins)
+        if data.connectivity.offline != self._offline:
+            _LOGGER.info('Collar for dog %s is %s', self.dog_id, 'offline' if data.connectivity.offline else 'back online')
+            self._offline = data.connectivity.offline
+            self.async_apply_update_interval(refresh=False)
+
+        if monitor.position is not None:
+            data.zones = sorted(self.account.geofence.async_evaluate(self.dog_id, monitor.position))
+            data.filtered_position = self._filter_position(monitor.position)
+
+        # Tracking started outside of Home Assistant (e.g. from the app) also gets a session, so it is stopped too
+        if self._live_tracking is None and monitor.live_tracking_reason != 0 and (previous is None or previous.live_tracking_reason == 0):
+            self.async_start_live_tracking()
+        self.__check_live_tracking(monitor, data.zones)
+        return data
+
+    def _filter_position(self, position: Position) -> FilteredPosition | None:
+        if position.time is None:
+            return self._position_filter.position
+        return self._position_filter.update(position.latitude, position.longitude, position.accuracy, position.time)
+
+    async def _async_update_activity(self, api_client: PitPatApiClient) -> Tuple[ActivityDay | None, Dict[str, Any]]:
+        """
+        Find the latest activity day, update the rolling statistics and import new days into the recorder in a
+        single pass over the history.
+        """
+        stats = self._activity_stats
+        importer = self.account.statistics_importer
+        await importer.async_load()
+        since_date = min(stats.last_date, importer.last_date(self.dog_id))
+
+        # Only the rolling statistics are limited to the retention window. The importer still backfills every day
+        # after the last one it imported, which only collects the full history the first time.
+        retention_date = (datetime.now(timezone.utc) - timedelta(days=self.account.options.activity_retention_days)).date().isoformat()
+
+        latest_day = None
+        new_days: List[ActivityDaySummary] = []
+        async for day in api_client.async_iter_all_activity_days(self.dog_id):
+            date = day.get('Date')
+            if not date:
+                continue
+            if latest_day is None or date > latest_day.get('Date'):
+                latest_day = day
+            if date[:10] >= since_date:
+                new_days.append(ActivityDaySummary.from_api(day))
+
+        stats.push_all(day for day in new_days if day.date >= retention_date)
+        if latest_day is None:
+            return None, stats.as_dict()
+
+        # Only the latest day is needed in full, so is the only one parsed into the model
+        activity_today = ActivityDay.from_api(latest_day)
+        dog_name = self.dog.name if self.dog and self.dog.name else self.dog_id
+        importer.async_import(self.dog_id, dog_name, new_days, activity_today.date)
+        return activity_today, stats.as_dict()
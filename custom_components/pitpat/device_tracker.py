@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from typing import Any, Callable, Dict
 
-import dateutil
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.device_tracker.config_entry import (
@@ -14,14 +13,19 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import PitPatDataUpdateCoordinator
-from .entity import PitPatDogEntity
+from .entity import PitPatDogEntity, async_setup_dog_entities
+from .models import Position
+from .position_filter import FilteredPosition
 
 
-def _get_monitor_position(entity: PitPatDogEntity) -> dict:
-    return entity.data_monitor.get('LastKnownPosition', {}).get('Value', {})
+def _get_monitor_position(entity: PitPatDogEntity) -> Position | None:
+    return entity.data_monitor.position
+
+def _get_filtered_position(entity: PitPatDogEntity) -> FilteredPosition | None:
+    return entity.data_dog_details.filtered_position
 
 def _is_tracking_live(entity: PitPatDogEntity) -> bool:
-    return entity.data_monitor.get('GpsSynchronisationState', 0) == 3
+    return entity.data_monitor.gps_synchronisation_state == 3
 
 @dataclass(frozen=True, kw_only=True)
 class PitPatTrackerEntityDescription(TrackerEntityDescription):
@@ -36,11 +40,12 @@ ENTITY_DESCRIPTIONS = [
         key='last_known_position',
         translation_key='last_known_position',
         icon="mdi:dog",
-        latitude_fn=lambda entity: float(_get_monitor_position(entity).get('Latitude')),
-        longitude_fn=lambda entity: float(_get_monitor_position(entity).get('Longitude')),
-        accuracy_fn=lambda entity: float(_get_monitor_position(entity).get('Accuracy', {}).get('Metres')),
+        latitude_fn=lambda entity: _get_monitor_position(entity).latitude,
+        longitude_fn=lambda entity: _get_monitor_position(entity).longitude,
+        accuracy_fn=lambda entity: _get_monitor_position(entity).accuracy,
         attributes_fn=lambda entity: {
-            "last_updated": dateutil.parser.parse(_get_monitor_position(entity).get('DataTime'))
+            "last_updated": _get_monitor_position(entity).time,
+            "zones": entity.data_dog_details.zones,
         }
     ),
     PitPatTrackerEntityDescription(
@@ -48,22 +53,31 @@ ENTITY_DESCRIPTIONS = [
         translation_key='live_position',
         icon="mdi:dog",
         available_fn=lambda data: _is_tracking_live(data),
-        latitude_fn=lambda data: float(_get_monitor_position(data).get('Latitude')),
-        longitude_fn=lambda data: float(_get_monitor_position(data).get('Longitude')),
-        accuracy_fn=lambda data: float(_get_monitor_position(data).get('Accuracy', {}).get('Metres')),
-    )
+        latitude_fn=lambda data: _get_monitor_position(data).latitude,
+        longitude_fn=lambda data: _get_monitor_position(data).longitude,
+        accuracy_fn=lambda data: _get_monitor_position(data).accuracy,
+    ),
+    PitPatTrackerEntityDescription(
+        key='filtered_position',
+        translation_key='filtered_position',
+        icon="mdi:dog",
+        available_fn=lambda entity: _get_filtered_position(entity) is not None,
+        latitude_fn=lambda entity: _get_filtered_position(entity).latitude,
+        longitude_fn=lambda entity: _get_filtered_position(entity).longitude,
+        accuracy_fn=lambda entity: round(_get_filtered_position(entity).accuracy),
+        attributes_fn=lambda entity: {
+            "last_updated": _get_filtered_position(entity).time
+        }
+    ),
 ]
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities):
     """Add the Entities from the config."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    sensors = []
-
-    for dog_id in coordinator.data.keys():
-        for description in ENTITY_DESCRIPTIONS:
-            sensors.append(PitPatDogDeviceTrackerEntity(coordinator, dog_id, description))
-
-    async_add_entities(sensors, True)
+    async_setup_dog_entities(hass, coordinator, async_add_entities, lambda dog_id, dog_coordinator: [
+        PitPatDogDeviceTrackerEntity(dog_coordinator, dog_id, description)
+        for description in ENTITY_DESCRIPTIONS
+    ])
 
 class PitPatDogDeviceTrackerEntity(PitPatDogEntity[PitPatTrackerEntityDescription], TrackerEntity):
 
@@ -0,0 +1,48 @@
+"""Diagnostics support for PitPat."""
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_KEY_COORDINATOR,
+    DOMAIN,
+)
+from .coordinator import PitPatDataUpdateCoordinator
+
+TO_REDACT = {
+    'access_token',
+    'id_token',
+    'refresh_token',
+    'user_id',
+}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry, including the memory held for each dog."""
+    coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_KEY_COORDINATOR]
+
+    dogs = {}
+    totals: Dict[str, int] = {}
+    for dog_id, dog_coordinator in coordinator.dog_coordinators.items():
+        footprint = dog_coordinator.memory_footprint()
+        for tier, size in footprint.items():
+            totals[tier] = totals.get(tier, 0) + size
+
+        data = dog_coordinator.data
+        dogs[dog_id] = {
+            'last_update_success': dog_coordinator.last_update_success,
+            'updated_at': {tier: value.isoformat() for tier, value in data.updated_at.items()} if data else {},
+            'memory_bytes': {**footprint, 'total': sum(footprint.values())},
+        }
+
+    return {
+        'entry': {
+            'data': async_redact_data(dict(entry.data), TO_REDACT),
+            'options': dict(entry.options),
+        },
+        'activity_retention_days': coordinator.options.activity_retention_days,
+        'dogs': dogs,
+        'memory_bytes': {**totals, 'total': sum(totals.values())},
+    }
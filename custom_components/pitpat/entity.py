@@ -1,33 +1,54 @@
-from typing import Any, Dict, Generic, TypeVar
-
-from homeassistant.const import (
-    ATTR_HW_VERSION,
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
-    ATTR_MODEL,
-    ATTR_MODEL_ID,
-    ATTR_NAME,
-    ATTR_SERIAL_NUMBER,
-    ATTR_SW_VERSION,
-)
-from homeassistant.helpers.entity import EntityDescription
+from typing import Any, Callable, Dict, Generic, Iterable, List, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DEVICE_MODEL_MAP,
-    DOMAIN,
-    MANUFACTURER,
-)
-from .coordinator import PitPatDataUpdateCoordinator
+from .aggregates import AccountAggregates
+from .const import DOMAIN, MANUFACTURER, SIGNAL_DOGS_ADDED
+from .coordinator import PitPatDataUpdateCoordinator, PitPatDogDataUpdateCoordinator
+from .models import ActivityDay, Dog, DogData, Monitor
 
 TDescription = TypeVar('TDescription', bound=EntityDescription)
 
-class PitPatDogEntity(CoordinatorEntity[PitPatDataUpdateCoordinator], Generic[TDescription]):
+_NO_MONITOR = Monitor()
+
+# Attributes which change on most updates without the state changing. These are left out of the recorder, and a
+# change to only these doesn't write the state.
+VOLATILE_ATTRIBUTES = frozenset({
+    'last_updated',
+    'raw_value',
+})
+
+def async_setup_dog_entities(
+        hass: HomeAssistant,
+        coordinator: PitPatDataUpdateCoordinator,
+        async_add_entities: Callable[[Iterable[Entity], bool], None],
+        create_entities: Callable[[str, PitPatDogDataUpdateCoordinator], List[Entity]]) -> None:
+    """Add the entities for each dog on the account, and for any dogs added to the account later."""
+
+    @callback
+    def async_add_dogs(dog_ids: Iterable[str]) -> None:
+        entities = []
+        for dog_id in dog_ids:
+            dog_coordinator = coordinator.dog_coordinators.get(dog_id)
+            if dog_coordinator is not None:
+                entities.extend(create_entities(dog_id, dog_coordinator))
+        async_add_entities(entities, True)
+
+    async_add_dogs(list(coordinator.dog_coordinators))
+    coordinator.config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DOGS_ADDED.format(coordinator.config_entry.entry_id), async_add_dogs))
+
+class PitPatDogEntity(CoordinatorEntity[PitPatDogDataUpdateCoordinator], Generic[TDescription]):
 
     entity_description: TDescription
     _attr_has_entity_name = True # Required for reading translation_key from EntityDescription
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
 
-    def __init__(self, coordinator: PitPatDataUpdateCoordinator, dog_id: str, description: TDescription):
+    def __init__(self, coordinator: PitPatDogDataUpdateCoordinator, dog_id: str, description: TDescription):
         CoordinatorEntity.__init__(self, coordinator)
         self.__dog_id = dog_id
         self.entity_description = description
@@ -37,34 +58,86 @@ class PitPatDogEntity(CoordinatorEntity[PitPatDataUpdateCoordinator], Generic[TD
         # Required for HA 2022.7
         self.coordinator_context = object()
 
+        self.__written_output: tuple | None = None
+
     @property
     def dog_id(self) -> str:
         return self.__dog_id
 
     @property
-    def data_dog(self) -> dict:
-        return self.coordinator.data.get(self.dog_id, {})
+    def data_dog(self) -> Dog:
+        return self.coordinator.dog or Dog(self.dog_id)
+
+    @property
+    def data_dog_details(self) -> DogData:
+        return self.coordinator.data or DogData()
+
+    @property
+    def data_monitor(self) -> Monitor:
+        return self.data_dog_details.monitor or _NO_MONITOR
 
     @property
-    def data_monitor(self) -> dict:
-        return self.data_dog.get('monitor_details', {}).get('Value', {}).get('Monitor', {})
+    def data_activity_today(self) -> ActivityDay | None:
+        return self.data_dog_details.activity_today
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any] | None:
-        return {
-            "dog_id": self.dog_id,
-        }
+        return self.coordinator.static_attributes
 
     @property
-    def device_info(self):
+    def device_info(self) -> DeviceInfo:
         """Return device information about this device."""
-        return {
-            ATTR_IDENTIFIERS: {(DOMAIN, self.dog_id)},
-            ATTR_NAME: self.data_dog.get('Name'),
-            ATTR_MANUFACTURER: MANUFACTURER,
-            ATTR_MODEL_ID: self.data_dog.get('Monitor', {}).get('Model'),
-            ATTR_MODEL: DEVICE_MODEL_MAP.get(int(self.data_dog.get('Monitor', {}).get('Model')), ''),
-            ATTR_SW_VERSION: self.data_dog.get("Monitor", {}).get("FirmwareVersion", ""),
-            ATTR_HW_VERSION: self.data_dog.get("Monitor", {}).get("HardwareVersion", ""),
-            ATTR_SERIAL_NUMBER: self.data_monitor.get('SerialNumber')
-        }
+        return self.coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when the output has changed, ignoring volatile attributes."""
+        output = self._get_output()
+        if output == self.__written_output:
+            return
+        self.__written_output = output
+        super()._handle_coordinator_update()
+
+    def _get_output(self) -> tuple:
+        """
+        The availability, state and recorded attributes, which are compared to decide whether to write the state. The
+        attributes of the platform are included, as some (e.g. the position of a device tracker) change without the
+        state changing.
+        """
+        if not self.available:
+            return (False,)
+        attributes = {**(self.state_attributes or {}), **(self.extra_state_attributes or {})}
+        return (True, self.state, {
+            name: value
+            for name, value in attributes.items()
+            if name not in self._unrecorded_attributes
+        })
+
+class PitPatAccountEntity(Entity, Generic[TDescription]):
+    """An entity for the whole account, updated from the aggregates of all of its dogs."""
+
+    entity_description: TDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: PitPatDataUpdateCoordinator, description: TDescription):
+        self.account = coordinator
+        self.entity_description = description
+
+        entry = coordinator.config_entry
+        self._attr_unique_id = f'{entry.entry_id}-{description.key}'
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer=MANUFACTURER,
+            model='Account',
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def data_aggregates(self) -> AccountAggregates:
+        return self.account.aggregator.data
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.account.aggregator.async_add_listener(self.async_write_ha_state))
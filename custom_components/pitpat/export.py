@@ -0,0 +1,330 @@
+"""Export of activity days and walk tracks to files, written in chunks and resumable."""
+
+from abc import ABC, abstractmethod
+from array import array
+import csv
+from datetime import date, datetime, timezone
+import io
+import json
+import logging
+import os
+import struct
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+import zlib
+
+from .models import ActivityDay
+from .walks import decode_polyline
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_DIRECTORY = 'pitpat_exports'
+
+EXPORT_DATA_ACTIVITY = 'activity'
+EXPORT_DATA_WALKS = 'walks'
+
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_FORMAT_GPX = 'gpx'
+EXPORT_FORMAT_COLUMNAR = 'columnar'
+
+EXPORT_EXTENSIONS = {
+    EXPORT_FORMAT_CSV: 'csv',
+    EXPORT_FORMAT_GPX: 'gpx',
+    EXPORT_FORMAT_COLUMNAR: 'ppc',
+}
+
+# Number of rows buffered before being written to the file
+EXPORT_CHUNK_ROWS = 500
+
+# Number of activity days held at a time while exporting. The days aren't in order in the history, so each pass over
+# it takes this many of the earliest days not yet exported.
+EXPORT_ACTIVITY_WINDOW_DAYS = 1000
+
+COLUMNAR_MAGIC = b'PITPATC1'
+COLUMNAR_ROW_GROUP = b'RGRP'
+
+# Column name and array typecode. Dates are stored as ordinals, and coordinates as integers of 1e-5 degrees.
+ACTIVITY_COLUMNS: List[Tuple[str, str]] = [
+    ('date', 'i'),
+    ('walk_minutes', 'f'),
+    ('run_minutes', 'f'),
+    ('play_minutes', 'f'),
+    ('pottering_minutes', 'f'),
+    ('rest_minutes', 'f'),
+    ('calories', 'f'),
+    ('steps', 'i'),
+    ('distance_metres', 'f'),
+    ('active_minutes', 'f'),
+    ('goal_minutes', 'f'),
+    ('goal_achieved', 'b'),
+]
+
+WALK_COLUMNS: List[Tuple[str, str]] = [
+    ('walk_start', 'q'),
+    ('time', 'q'),
+    ('latitude_e5', 'i'),
+    ('longitude_e5', 'i'),
+]
+
+def activity_row(day: ActivityDay) -> tuple:
+    return (
+        date.fromisoformat(day.date).toordinal(),
+        day.total_walk_minutes,
+        day.total_run_minutes,
+        day.total_play_minutes,
+        day.total_pottering_minutes,
+        day.total_rest_minutes,
+        day.total_calories,
+        day.total_steps,
+        day.total_distance,
+        day.activeness,
+        day.user_goal,
+        int(day.user_goal_achieved),
+    )
+
+def walk_points(walk: Dict[str, Any]) -> Iterator[Tuple[int, int, float, float]]:
+    """The start time, point time (both as epoch seconds) and position of each point in a stored walk."""
+    start = int(datetime.fromisoformat(walk['start']).timestamp())
+    track = walk.get('track', {})
+    for (latitude, longitude), offset in zip(decode_polyline(track.get('polyline', '')), track.get('offsets', [])):
+        yield start, start + offset, latitude, longitude
+
+class ExportWriter(ABC):
+    """
+    Writes records to an export file in chunks, keeping a progress file next to it so an interrupted export can be
+    resumed.
+
+    Records are written in the order of their keys. The progress file records the size of the export file and the key
+    of the last record written after each chunk, so a resumed export discards anything written after the last complete
+    chunk and skips records up to that key. All methods do blocking I/O so must be run in an executor.
+    """
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]]):
+        self.path = path
+        self.columns = columns
+        self._progress_path = f'{path}.progress.json'
+        self._high_water: str | None = None
+        self.written = 0
+
+    @property
+    def resumed(self) -> bool:
+        return self._high_water is not None
+
+    def is_written(self, key: str) -> bool:
+        return self._high_water is not None and key <= self._high_water
+
+    def open(self, resume: bool) -> None:
+        """Open the export, continuing from the last complete chunk if resuming an export which didn't complete."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        progress = self.__read_progress() if resume else None
+        if progress is None or progress['complete']:
+            # A complete export is written again, so it picks up any records added since
+            with open(self.path, 'wb') as file:
+                file.write(self.header())
+            self._high_water = None
+            self.written = 0
+        else:
+            with open(self.path, 'r+b') as file:
+                file.truncate(progress['size'])
+            self._high_water = progress['high_water']
+            self.written = progress.get('written', 0)
+        self.__write_progress(False)
+
+    def write_chunk(self, records: List[Tuple[str, Any]]) -> None:
+        """Write records in key order, each with the key identifying it for resuming."""
+        if not records:
+            return
+        data = self.encode([record for _, record in records])
+        with open(self.path, 'ab') as file:
+            file.write(data)
+        self._high_water = records[-1][0]
+        self.written += len(records)
+        self.__write_progress(False)
+
+    def finish(self) -> None:
+        with open(self.path, 'ab') as file:
+            file.write(self.footer())
+        self.__write_progress(True)
+
+    def header(self) -> bytes:
+        return b''
+
+    def footer(self) -> bytes:
+        return b''
+
+    @abstractmethod
+    def encode(self, records: List[Any]) -> bytes:
+        """Encode a chunk of records for appending to the file."""
+
+    def __read_progress(self) -> Dict[str, Any] | None:
+        try:
+            with open(self._progress_path, encoding='utf-8') as file:
+                progress = json.load(file)
+            if 'high_water' not in progress or os.path.getsize(self.path) < progress['size']:
+                return None
+            return progress
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __write_progress(self, complete: bool) -> None:
+        temp_path = f'{self._progress_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'size': os.path.getsize(self.path),
+                'high_water': self._high_water,
+                'written': self.written,
+                'complete': complete,
+            }, file)
+        os.replace(temp_path, self._progress_path)
+
+class CsvExportWriter(ExportWriter):
+    """Rows of values, with a header row of the column names."""
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]], row_fn: Callable[[Any], Iterable[tuple]]):
+        super().__init__(path, columns)
+        self._row_fn = row_fn
+
+    def header(self) -> bytes:
+        return self.__encode_rows([[name for name, _ in self.columns]])
+
+    def encode(self, records: List[Any]) -> bytes:
+        return self.__encode_rows(row for record in records for row in self._row_fn(record))
+
+    @staticmethod
+    def __encode_rows(rows: Iterable[Iterable[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+class GpxExportWriter(ExportWriter):
+    """A GPX track for each walk. The closing tag is only written once the export completes."""
+
+    def header(self) -> bytes:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<gpx version="1.1" creator="PitPat for Home Assistant" xmlns="http://www.topografix.com/GPX/1/1">\n'
+        ).encode('utf-8')
+
+    def footer(self) -> bytes:
+        return b'</gpx>\n'
+
+    def encode(self, records: List[Any]) -> bytes:
+        parts = []
+        for walk in records:
+            parts.append(f'<trk><name>{escape(walk.get("dog_name") or walk["dog_id"])} {escape(walk["start"])}</name><trkseg>\n')
+            for _, time, latitude, longitude in walk_points(walk):
+                timestamp = datetime.fromtimestamp(time, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                parts.append(f'<trkpt lat="{latitude:.5f}" lon="{longitude:.5f}"><time>{timestamp}</time></trkpt>\n')
+            parts.append('</trkseg></trk>\n')
+        return ''.join(parts).encode('utf-8')
+
+class ColumnarExportWriter(ExportWriter):
+    """
+    A compact binary format storing each chunk as a row group of compressed columns.
+
+    The file starts with COLUMNAR_MAGIC and the length prefixed JSON list of column names and array typecodes. Each
+    row group is COLUMNAR_ROW_GROUP and the row count, followed by each column as the length prefixed zlib compressed
+    little endian array. Use read_columnar to read the file back.
+    """
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]], row_fn: Callable[[Any], Iterable[tuple]]):
+        super().__init__(path, columns)
+        self._row_fn = row_fn
+
+    def header(self) -> bytes:
+        schema = json.dumps(self.columns).encode('utf-8')
+        return COLUMNAR_MAGIC + struct.pack('<I', len(schema)) + schema
+
+    def encode(self, records: List[Any]) -> bytes:
+        rows = [row for record in records for row in self._row_fn(record)]
+        parts = [COLUMNAR_ROW_GROUP, struct.pack('<I', len(rows))]
+        for index, (_, typecode) in enumerate(self.columns):
+            values = array(typecode, (row[index] for row in rows))
+            if sys.byteorder == 'big':
+                values.byteswap()
+            data = zlib.compress(values.tobytes())
+            parts.append(struct.pack('<I', len(data)))
+            parts.append(data)
+        return b''.join(parts)
+
+def read_columnar(path: str) -> Iterator[Dict[str, array]]:
+    """Read each row group of a columnar export, as arrays of values by column name."""
+    with open(path, 'rb') as file:
+        if file.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f'{path} is not a PitPat columnar export')
+        (schema_length,) = struct.unpack('<I', file.read(4))
+        columns = json.loads(file.read(schema_length))
+        while marker := file.read(len(COLUMNAR_ROW_GROUP)):
+            if marker != COLUMNAR_ROW_GROUP:
+                raise ValueError(f'{path} has an invalid row group')
+            file.read(4)
+            row_group = {}
+            for name, typecode in columns:
+                (length,) = struct.unpack('<I', file.read(4))
+                values = array(typecode)
+                values.frombytes(zlib.decompress(file.read(length)))
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                row_group[name] = values
+            yield row_group
+
+def create_writer(path: str, data: str, export_format: str) -> ExportWriter:
+    """Create the writer for a type of data and format."""
+    if data == EXPORT_DATA_ACTIVITY:
+        columns, row_fn = ACTIVITY_COLUMNS, lambda day: [activity_row(day)]
+    else:
+        columns = WALK_COLUMNS
+        row_fn = lambda walk: ((start, time, round(lat * 1e5), round(lon * 1e5)) for start, time, lat, lon in walk_points(walk))
+
+    if export_format == EXPORT_FORMAT_GPX:
+        if data != EXPORT_DATA_WALKS:
+            raise ValueError('GPX export is only available for walks')
+        return GpxExportWriter(path, columns)
+
+    if export_format == EXPORT_FORMAT_CSV:
+        if data == EXPORT_DATA_ACTIVITY:
+            return CsvExportWriter(path, columns, lambda day: [(day.date, *activity_row(day)[1:])])
+        csv_columns = [('walk_start', 'q'), ('time', 'q'), ('latitude', 'd'), ('longitude', 'd')]
+        return CsvExportWriter(path, csv_columns, lambda walk: (
+            (datetime.fromtimestamp(start, timezone.utc).isoformat(), datetime.fromtimestamp(time, timezone.utc).isoformat(), lat, lon)
+            for start, time, lat, lon in walk_points(walk)))
+
+    return ColumnarExportWriter(path, columns, row_fn)
+
+async def async_export(
+        run_in_executor: Callable[..., Any],
+        writer: ExportWriter,
+        records: AsyncIterator[Tuple[str, Any]],
+        resume: bool) -> Dict[str, Any]:
+    """
+    Write records to an export, a chunk at a time.
+
+    :param run_in_executor: Function running blocking I/O in an executor, e.g. hass.async_add_executor_job.
+    :param writer: The writer for the export file.
+    :param records: The records to export, each with a key identifying it, in ascending order of key.
+    :param resume: Whether to continue an incomplete export rather than starting again. A complete export is always
+        written again.
+    :return: A summary of the export.
+    """
+    await run_in_executor(writer.open, resume)
+    if writer.resumed:
+        _LOGGER.debug('Resuming export %s', writer.path)
+
+    chunk: List[Tuple[str, Any]] = []
+    previous_key = None
+    async for key, record in records:
+        if previous_key is not None and key < previous_key:
+            raise ValueError(f'Export records must be in order of key, but {key} came after {previous_key}')
+        previous_key = key
+        if writer.is_written(key):
+            continue
+        chunk.append((key, record))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            await run_in_executor(writer.write_chunk, chunk)
+            chunk = []
+
+    await run_in_executor(writer.write_chunk, chunk)
+    await run_in_executor(writer.finish)
+    _LOGGER.info('Exported %i records to %s', writer.written, writer.path)
+    return {'path': writer.path, 'written': writer.written, 'complete': True}
@@ -0,0 +1,28 @@
+"""Geographic helpers."""
+
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_METRES = 6371008.8
+METRES_PER_DEGREE_LATITUDE = 111320.0
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great circle distance in metres between two points.
+
+    This is much cheaper than the Vincenty formula used by Home Assistant, and accurate to well within GPS accuracy
+    over the short distances it is used for.
+    """
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_METRES * asin(min(1.0, sqrt(a)))
+
+def metres_to_degrees(metres: float, latitude: float) -> tuple[float, float]:
+    """
+    Convert a distance in metres to the equivalent latitude and longitude deltas at the given latitude.
+
+    :return: Tuple of latitude and longitude degrees
+    """
+    d_lat = metres / METRES_PER_DEGREE_LATITUDE
+    d_lon = metres / (METRES_PER_DEGREE_LATITUDE * max(cos(radians(latitude)), 0.01))
+    return d_lat, d_lon
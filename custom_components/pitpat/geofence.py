@@ -0,0 +1,169 @@
+"""Zone membership for dog positions, using a spatial index over the Home Assistant zones."""
+
+from collections import defaultdict
+from datetime import datetime
+import logging
+from math import floor
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+from homeassistant.components.zone import DOMAIN as ZONE_DOMAIN
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    ATTR_RADIUS,
+)
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.event import TrackStates, async_track_state_change_filtered
+
+from .geo import haversine_distance, metres_to_degrees
+from .models import Position
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_ZONE_ENTER = 'pitpat_zone_enter'
+EVENT_ZONE_EXIT = 'pitpat_zone_exit'
+
+GEOFENCE_CELL_SIZE_DEGREES = 0.01
+
+# Fixes less accurate than this are too vague to change zone membership
+GEOFENCE_MAX_ACCURACY_METRES = 250.0
+
+# Minimum distance outside of a zone before leaving it, to stop noisy fixes on the boundary flapping in and out
+GEOFENCE_MIN_HYSTERESIS_METRES = 10.0
+
+class GeofenceZone(NamedTuple):
+    entity_id: str
+    latitude: float
+    longitude: float
+    radius: float
+
+class ZoneIndex():
+    """
+    Grid of zones by the cells they could be relevant to.
+
+    Zones are added to every cell within the zone radius plus the maximum hysteresis, so only the zones in the cell
+    containing a position need to be checked.
+    """
+
+    def __init__(self, zones: List[GeofenceZone]):
+        self._cells: Dict[Tuple[int, int], List[GeofenceZone]] = defaultdict(list)
+        for zone in zones:
+            d_lat, d_lon = metres_to_degrees(zone.radius + GEOFENCE_MAX_ACCURACY_METRES, zone.latitude)
+            min_x, min_y = ZoneIndex.cell(zone.latitude - d_lat, zone.longitude - d_lon)
+            max_x, max_y = ZoneIndex.cell(zone.latitude + d_lat, zone.longitude + d_lon)
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    self._cells[(x, y)].append(zone)
+
+    @staticmethod
+    def cell(latitude: float, longitude: float) -> Tuple[int, int]:
+        return floor(latitude / GEOFENCE_CELL_SIZE_DEGREES), floor(longitude / GEOFENCE_CELL_SIZE_DEGREES)
+
+    def candidates(self, latitude: float, longitude: float) -> List[GeofenceZone]:
+        """The zones which could contain the given position."""
+        return self._cells.get(ZoneIndex.cell(latitude, longitude), [])
+
+class GeofenceEngine():
+    """
+    Tracks which zones each dog is in, firing events as they enter and leave.
+
+    A dog enters a zone once its position is within the zone radius, and only leaves once it is further than the
+    radius plus the fix accuracy.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._index: ZoneIndex | None = None
+        self._zones_by_dog: Dict[str, Set[str]] = {}
+        self._last_fix_by_dog: Dict[str, datetime] = {}
+        self._unsub = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for changes to zones."""
+        self._unsub = async_track_state_change_filtered(
+            self._hass,
+            TrackStates(False, set(), {ZONE_DOMAIN}),
+            self.__async_zones_changed)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub:
+            self._unsub.async_remove()
+            self._unsub = None
+
+    @callback
+    def __async_zones_changed(self, event: Event[EventStateChangedData]) -> None:
+        _LOGGER.debug('Zone %s changed, rebuilding zone index', event.data.get('entity_id'))
+        self._index = None
+
+    @property
+    def index(self) -> ZoneIndex:
+        if self._index is None:
+            zones = [
+                GeofenceZone(
+                    entity_id=state.entity_id,
+                    latitude=float(state.attributes[ATTR_LATITUDE]),
+                    longitude=float(state.attributes[ATTR_LONGITUDE]),
+                    radius=float(state.attributes.get(ATTR_RADIUS, 0)),
+                )
+                for state in self._hass.states.async_all(ZONE_DOMAIN)
+                if ATTR_LATITUDE in state.attributes and ATTR_LONGITUDE in state.attributes
+            ]
+            self._index = ZoneIndex(zones)
+            _LOGGER.debug('Zone index built from %i zones', len(zones))
+        return self._index
+
+    @callback
+    def async_remove_dog(self, dog_id: str) -> None:
+        """Forget the zones of a dog removed from the account."""
+        self._zones_by_dog.pop(dog_id, None)
+        self._last_fix_by_dog.pop(dog_id, None)
+
+    def zones(self, dog_id: str) -> Set[str]:
+        """The entity ids of the zones the dog is currently in."""
+        return self._zones_by_dog.get(dog_id, set())
+
+    @callback
+    def async_evaluate(self, dog_id: str, position: Position) -> Set[str]:
+        """
+        Update the zones a dog is in from the last known position reported by the monitor.
+
+        :param dog_id: The Id for the dog the position is for.
+        :param position: The last known position from the monitor details.
+        :return: The entity ids of the zones the dog is in.
+        """
+        fix_time = position.time
+        accuracy = position.accuracy
+        if (not fix_time
+                or fix_time == self._last_fix_by_dog.get(dog_id)
+                or accuracy > GEOFENCE_MAX_ACCURACY_METRES):
+            return self.zones(dog_id)
+
+        self._last_fix_by_dog[dog_id] = fix_time
+        latitude = position.latitude
+        longitude = position.longitude
+        hysteresis = max(accuracy, GEOFENCE_MIN_HYSTERESIS_METRES)
+
+        previous = self.zones(dog_id)
+        current: Set[str] = set()
+        for zone in self.index.candidates(latitude, longitude):
+            distance = haversine_distance(latitude, longitude, zone.latitude, zone.longitude)
+            limit = zone.radius + hysteresis if zone.entity_id in previous else zone.radius
+            if distance <= limit:
+                current.add(zone.entity_id)
+
+        position_data = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'accuracy': accuracy,
+        }
+        for entity_id in current - previous:
+            _LOGGER.debug('Dog %s entered zone %s', dog_id, entity_id)
+            self._hass.bus.async_fire(EVENT_ZONE_ENTER, {'dog_id': dog_id, 'zone': entity_id, **position_data})
+        for entity_id in previous - current:
+            _LOGGER.debug('Dog %s left zone %s', dog_id, entity_id)
+            self._hass.bus.async_fire(EVENT_ZONE_EXIT, {'dog_id': dog_id, 'zone': entity_id, **position_data})
+
+        self._zones_by_dog[dog_id] = current
+        return current
@@ -0,0 +1,53 @@
+"""Short-lived handoff of a validated account from the config flow to the setup of its config entry."""
+
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, Dict, List
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_KEY_HANDOFF = f'{DOMAIN}_handoff'
+
+# Setup normally starts straight after the config flow finishes, so anything older is left to authenticate again
+HANDOFF_TTL_SECONDS = 120
+
+@dataclass(slots=True, frozen=True)
+class ValidatedAccount:
+    """The results of validating credentials, which setup would otherwise have to fetch again."""
+    tokens: Dict[str, Any]
+    user_id: str
+    dogs: List[Dict[str, Any]]
+    created: float = field(default_factory=time.monotonic)
+
+    @property
+    def refresh_token(self) -> str | None:
+        return self.tokens.get('refresh_token')
+
+@callback
+def async_store_handoff(hass: HomeAssistant, account: ValidatedAccount) -> None:
+    """Keep a validated account for the config entry created or updated with its tokens."""
+    handoffs: Dict[str, ValidatedAccount] = hass.data.setdefault(DATA_KEY_HANDOFF, {})
+    now = time.monotonic()
+    for refresh_token in [token for token, handoff in handoffs.items() if now - handoff.created > HANDOFF_TTL_SECONDS]:
+        del handoffs[refresh_token]
+    if account.refresh_token:
+        handoffs[account.refresh_token] = account
+
+@callback
+def async_pop_handoff(hass: HomeAssistant, refresh_token: str | None) -> ValidatedAccount | None:
+    """
+    Take the validated account for a config entry, if it was validated recently. Each account can only be taken once,
+    as the tokens and dogs are only current when setup follows the config flow.
+
+    :param refresh_token: The refresh token in the config entry data, which identifies the handoff.
+    """
+    account = hass.data.get(DATA_KEY_HANDOFF, {}).pop(refresh_token, None)
+    if account is None or time.monotonic() - account.created > HANDOFF_TTL_SECONDS:
+        return None
+    _LOGGER.debug('Using the account validated by the config flow')
+    return account
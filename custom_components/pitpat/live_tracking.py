@@ -0,0 +1,70 @@
+"""Sessions of live tracking, during which the position is refreshed more often and tracking is stopped automatically."""
+
+from datetime import datetime, timedelta
+import logging
+from typing import List
+
+from .cadence_optimizer import HOME_ZONE
+from .models import Monitor
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_LIVE_TRACKING_ENDED = 'pitpat_live_tracking_ended'
+
+# A session which the collar hasn't reported as live tracking by then is given up on
+LIVE_TRACKING_START_TIMEOUT = timedelta(minutes=3)
+
+STOP_REASON_TIMEOUT = 'timeout'
+STOP_REASON_ARRIVED_HOME = 'arrived_home'
+STOP_REASON_NOT_STARTED = 'not_started'
+STOP_REASON_STOPPED = 'stopped'
+
+# Reasons a session ends for which tracking must be stopped on the collar, rather than it having already stopped
+STOP_REASONS_STOP_TRACKING = frozenset({STOP_REASON_TIMEOUT, STOP_REASON_ARRIVED_HOME, STOP_REASON_NOT_STARTED})
+
+class LiveTrackingSession():
+    """
+    A period of live tracking for a single dog, from when it was started until it should be stopped.
+
+    The session ends once the timeout has passed, or once the dog arrives in the home zone having left it during the
+    session, so a walk starting from home isn't stopped straight away. It also ends if the collar stops live tracking
+    by other means (e.g. the app), or never reports live tracking after being asked to start.
+    """
+
+    __slots__ = ('started_at', 'expires_at', '_confirmed', '_left_home')
+
+    def __init__(self, started_at: datetime, timeout: timedelta):
+        self.started_at = started_at
+        self.expires_at = started_at + timeout
+        self._confirmed = False
+        self._left_home = False
+
+    def check(self, monitor: Monitor | None, zones: List[str], now: datetime) -> str | None:
+        """
+        Update the session from the latest monitor details and zones of the dog.
+
+        :param monitor: The latest monitor details, or None if they couldn't be fetched.
+        :param zones: The zones the dog is currently in.
+        :param now: The current time.
+        :return: The reason the session should end, or None while it should continue.
+        """
+        if monitor is not None:
+            if monitor.live_tracking_reason != 0:
+                self._confirmed = True
+            elif self._confirmed:
+                return STOP_REASON_STOPPED
+
+        if not self._confirmed and now >= self.started_at + LIVE_TRACKING_START_TIMEOUT:
+            return STOP_REASON_NOT_STARTED
+        if now >= self.expires_at:
+            return STOP_REASON_TIMEOUT
+
+        # Only positions fixed during the session count, so a stale position from before it can't end it
+        position = monitor.position if monitor is not None else None
+        if position is None or position.time is None or position.time < self.started_at:
+            return None
+        if HOME_ZONE not in zones:
+            self._left_home = True
+        elif self._left_home:
+            return STOP_REASON_ARRIVED_HOME
+        return None
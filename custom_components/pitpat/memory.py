@@ -0,0 +1,35 @@
+"""Estimates of the memory held by the integration."""
+
+from collections import deque
+import sys
+from typing import Any, Set
+
+def deep_sizeof(*objects: Any) -> int:
+    """
+    Estimate the memory in bytes used by objects and everything they reference.
+
+    Containers, objects with __slots__ and objects with a __dict__ are followed. Objects referenced more than once,
+    including between the given objects, are only counted once.
+    """
+    seen: Set[int] = set()
+    size = 0
+    pending = list(objects)
+    while pending:
+        obj = pending.pop()
+        if obj is None or id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            pending.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float, bool)):
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    pending.append(getattr(obj, slot, None))
+            if hasattr(obj, '__dict__'):
+                pending.append(vars(obj))
+    return size
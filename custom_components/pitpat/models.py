@@ -0,0 +1,223 @@
+"""Typed models for the data returned by the PitPat API."""
+
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+from .api import InvalidResponseError
+
+if TYPE_CHECKING:
+    from .battery_model import BatteryPrediction
+    from .connectivity import ConnectivityStatus
+    from .position_filter import FilteredPosition
+
+def _optional(value: Dict[str, Any] | None) -> Any:
+    """Unwrap a value in the HasValue/Value format used by the API."""
+    if not value or not value.get('HasValue', True):
+        return None
+    return value.get('Value')
+
+def _datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+def _float(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+def _int(value: Any) -> int | None:
+    return int(value) if value is not None else None
+
+def _parse(kind: str, data: Dict[str, Any], parsers: Dict[str, Tuple[str, Callable[[Any], Any]]]) -> Dict[str, Any]:
+    """
+    Parse the fields present in an API response into keyword arguments for a model.
+
+    :param kind: The type of response, used in errors.
+    :param data: The API response.
+    :param parsers: The model field name and parser function for each API field.
+    :raises InvalidResponseError: If the response or a field is not in the expected format.
+    """
+    if not isinstance(data, dict):
+        raise InvalidResponseError(f'Expected {kind} to be an object but got {type(data).__name__}')
+
+    values = {}
+    for key, (name, parser) in parsers.items():
+        if key not in data:
+            continue
+        try:
+            values[name] = parser(data[key])
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            raise InvalidResponseError(f'Unexpected value for {kind} field {key}: {data[key]!r}') from err
+    return values
+
+@dataclass(slots=True, frozen=True)
+class Dog:
+    id: str
+    name: str | None = None
+    breed_name: str | None = None
+    breed_family: str | None = None
+    is_female: bool = False
+    birth_date: date | None = None
+    weight: float | None = None
+    monitor_model: int | None = None
+    firmware_version: str = ''
+    hardware_version: str = ''
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'Dog':
+        values = _parse('dog', data, {
+            'Id': ('id', str),
+            'Name': ('name', str),
+            'Breed': ('breed', lambda breed: breed or {}),
+            'IsFemale': ('is_female', bool),
+            'BirthDate': ('birth_date', lambda value: _datetime(value).date() if value else None),
+            'Weight': ('weight', _float),
+            'Monitor': ('monitor', lambda monitor: monitor or {}),
+        })
+        if 'id' not in values:
+            raise InvalidResponseError('Dog is missing the Id field')
+
+        breed = values.pop('breed', {})
+        monitor = values.pop('monitor', {})
+        return Dog(
+            **values,
+            breed_name=breed.get('Name'),
+            breed_family=breed.get('Family'),
+            monitor_model=_int(monitor.get('Model')),
+            firmware_version=monitor.get('FirmwareVersion') or '',
+            hardware_version=monitor.get('HardwareVersion') or '',
+        )
+
+@dataclass(slots=True, frozen=True)
+class BatteryInfo:
+    level_fraction: float | None = None
+    is_charging: bool = False
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'BatteryInfo':
+        return BatteryInfo(**_parse('battery info', data, {
+            'BatteryLevelFraction': ('level_fraction', _float),
+            'IsCharging': ('is_charging', bool),
+        }))
+
+@dataclass(slots=True, frozen=True)
+class Position:
+    latitude: float
+    longitude: float
+    accuracy: float
+    time: datetime | None = None
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'Position | None':
+        values = _parse('position', data, {
+            'Latitude': ('latitude', float),
+            'Longitude': ('longitude', float),
+            'Accuracy': ('accuracy', lambda accuracy: float(accuracy.get('Metres') or 0)),
+            'DataTime': ('time', _datetime),
+        })
+        if values.get('latitude') is None or values.get('longitude') is None:
+            return None
+        return Position(**{'accuracy': 0.0, **values})
+
+@dataclass(slots=True, frozen=True)
+class ContactTimings:
+    last_message_sent_at: datetime | None = None
+    last_message_received_at: datetime | None = None
+    next_message_expected_at: datetime | None = None
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'ContactTimings':
+        return ContactTimings(**_parse('contact timings', data, {
+            'LastMessageSentAt': ('last_message_sent_at', _datetime),
+            'LastMessageReceivedAt': ('last_message_received_at', _datetime),
+            'NextMessageExpectedAt': ('next_message_expected_at', _datetime),
+        }))
+
+@dataclass(slots=True, frozen=True)
+class Network:
+    operator: str | None = None
+    quality: int | None = None
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'Network':
+        return Network(**_parse('network', data, {
+            'NetworkOperator': ('operator', _optional),
+            'Quality': ('quality', _int),
+        }))
+
+_MONITOR_PARSERS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    'SerialNumber': ('serial_number', str),
+    'BatteryInfo': ('battery', lambda value: BatteryInfo.from_api(_optional(value) or {})),
+    'LastKnownPosition': ('position', lambda value: Position.from_api(_optional(value) or {})),
+    'GpsSynchronisationState': ('gps_synchronisation_state', lambda value: int(value or 0)),
+    'ContactTimings': ('contact_timings', lambda value: ContactTimings.from_api(_optional(value) or {})),
+    'PhoneHomeCadence': ('phone_home_cadence', _int),
+    'LiveTrackingReason': ('live_tracking_reason', lambda value: int(value or 0)),
+    'Network': ('network', lambda value: Network.from_api(_optional(value) or {})),
+}
+
+@dataclass(slots=True, frozen=True)
+class Monitor:
+    serial_number: str | None = None
+    battery: BatteryInfo = field(default_factory=BatteryInfo)
+    position: Position | None = None
+    gps_synchronisation_state: int = 0
+    contact_timings: ContactTimings = field(default_factory=ContactTimings)
+    phone_home_cadence: int | None = None
+    live_tracking_reason: int = 0
+    network: Network = field(default_factory=Network)
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'Monitor':
+        """Parse the monitor from the response of the monitors API."""
+        monitor = (_optional(data) or {}).get('Monitor') or {}
+        return Monitor(**_parse('monitor', monitor, _MONITOR_PARSERS))
+
+    def merge(self, data: Dict[str, Any]) -> 'Monitor':
+        """Create a copy of the monitor with the fields present in a partial monitor update replaced."""
+        return replace(self, **_parse('monitor', data, _MONITOR_PARSERS))
+
+@dataclass(slots=True, frozen=True)
+class ActivityDay:
+    date: str
+    total_walk_minutes: float = 0
+    total_run_minutes: float = 0
+    total_play_minutes: float = 0
+    total_pottering_minutes: float = 0
+    total_rest_minutes: float = 0
+    total_calories: float = 0
+    total_steps: int = 0
+    total_distance: float = 0
+    activeness: float = 0
+    user_goal: float = 0
+    user_goal_achieved: bool = False
+
+    @staticmethod
+    def from_api(data: Dict[str, Any]) -> 'ActivityDay':
+        values = _parse('activity day', data, {
+            'Date': ('date', lambda value: value[:10]),
+            'TotalWalkMinutes': ('total_walk_minutes', lambda value: float(value or 0)),
+            'TotalRunMinutes': ('total_run_minutes', lambda value: float(value or 0)),
+            'TotalPlayMinutes': ('total_play_minutes', lambda value: float(value or 0)),
+            'TotalPotteringMinutes': ('total_pottering_minutes', lambda value: float(value or 0)),
+            'TotalRestMinutes': ('total_rest_minutes', lambda value: float(value or 0)),
+            'TotalCalories': ('total_calories', lambda value: float(value or 0)),
+            'TotalSteps': ('total_steps', lambda value: int(value or 0)),
+            'TotalDistance': ('total_distance', lambda value: float(value or 0)),
+            'Activeness': ('activeness', lambda value: float(value or 0)),
+            'UserGoal': ('user_goal', lambda value: float(value or 0)),
+            'UserGoalAchieved': ('user_goal_achieved', bool),
+        })
+        if 'date' not in values:
+            raise InvalidResponseError('Activity day is missing the Date field')
+        return ActivityDay(**values)
+
+@dataclass(slots=True)
+class DogData:
+    """Data for a single dog, as held by the dog coordinator."""
+    monitor: Monitor | None = None
+    activity_today: ActivityDay | None = None
+    activity_stats: Dict[str, Any] = field(default_factory=dict)
+    zones: List[str] = field(default_factory=list)
+    filtered_position: 'FilteredPosition | None' = None
+    battery_prediction: 'BatteryPrediction | None' = None
+    connectivity: 'ConnectivityStatus | None' = None
+    updated_at: Dict[str, datetime] = field(default_factory=dict)
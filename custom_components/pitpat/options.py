@@ -0,0 +1,52 @@
+"""Options of a config entry as applied to the running integration."""
+
+from dataclasses import dataclass, fields
+from typing import Any, Mapping
+
+from .const import (
+    ACTIVITY_RETENTION_DAYS_DEFAULT,
+    CADENCE_STALE_MESSAGE_DEFAULT,
+    DOGS_UPDATE_INTERVAL_DEFAULT,
+    LIVE_TRACKING_TIMEOUT_DEFAULT,
+    LIVE_TRACKING_UPDATE_INTERVAL_DEFAULT,
+    MAX_CONCURRENT_REFRESHES_DEFAULT,
+    MESSAGE_OVERDUE_GRACE_DEFAULT,
+    OFFLINE_MISSED_CHECK_INS_DEFAULT,
+    OFFLINE_UPDATE_INTERVAL_DEFAULT,
+    PUSH_CONNECTED_UPDATE_INTERVAL_DEFAULT,
+    REFRESH_TIMEOUT_DEFAULT,
+    REQUEST_TIMEOUT_DEFAULT,
+    UPDATE_INTERVAL_DEFAULT,
+)
+
+@dataclass(frozen=True, slots=True)
+class PitPatOptions:
+    """
+    The options for a config entry, with the default for any which haven't been set. Each field is named after its
+    options key, and is in the units shown in the options form.
+    """
+
+    update_interval: int = UPDATE_INTERVAL_DEFAULT
+    dogs_update_interval: int = DOGS_UPDATE_INTERVAL_DEFAULT
+    push_connected_update_interval: int = PUSH_CONNECTED_UPDATE_INTERVAL_DEFAULT
+    offline_update_interval: int = OFFLINE_UPDATE_INTERVAL_DEFAULT
+    live_tracking_update_interval: int = LIVE_TRACKING_UPDATE_INTERVAL_DEFAULT
+    max_concurrent_refreshes: int = MAX_CONCURRENT_REFRESHES_DEFAULT
+    request_timeout: int = REQUEST_TIMEOUT_DEFAULT
+    refresh_timeout: int = REFRESH_TIMEOUT_DEFAULT
+    activity_retention_days: int = ACTIVITY_RETENTION_DAYS_DEFAULT
+    message_overdue_grace: int = MESSAGE_OVERDUE_GRACE_DEFAULT
+    offline_missed_check_ins: int = OFFLINE_MISSED_CHECK_INS_DEFAULT
+    cadence_stale_message: int = CADENCE_STALE_MESSAGE_DEFAULT
+    live_tracking_timeout: int = LIVE_TRACKING_TIMEOUT_DEFAULT
+    push_url: str = ''
+    record_traffic: bool = False
+
+    @staticmethod
+    def from_options(options: Mapping[str, Any]) -> 'PitPatOptions':
+        """Read the options of a config entry, ignoring any which are no longer used."""
+        return PitPatOptions(**{
+            field.name: options[field.name]
+            for field in fields(PitPatOptions)
+            if options.get(field.name) is not None
+        })
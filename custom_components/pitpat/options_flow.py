@@ -7,15 +7,62 @@ from homeassistant.config_entries import (
 )
 
 from .const import (
+    ACTIVITY_RETENTION_DAYS_DEFAULT,
+    ACTIVITY_RETENTION_DAYS_MIN,
+    CADENCE_STALE_MESSAGE_DEFAULT,
+    DOGS_UPDATE_INTERVAL_DEFAULT,
+    LIVE_TRACKING_TIMEOUT_DEFAULT,
+    LIVE_TRACKING_UPDATE_INTERVAL_DEFAULT,
+    LIVE_TRACKING_UPDATE_INTERVAL_MIN,
+    MAX_CONCURRENT_REFRESHES_DEFAULT,
+    MESSAGE_OVERDUE_GRACE_DEFAULT,
+    OFFLINE_MISSED_CHECK_INS_DEFAULT,
+    OFFLINE_UPDATE_INTERVAL_DEFAULT,
+    OPTIONS_KEY_ACTIVITY_RETENTION_DAYS,
+    OPTIONS_KEY_CADENCE_STALE_MESSAGE,
+    OPTIONS_KEY_DOGS_UPDATE_INTERVAL,
+    OPTIONS_KEY_LIVE_TRACKING_TIMEOUT,
+    OPTIONS_KEY_LIVE_TRACKING_UPDATE_INTERVAL,
+    OPTIONS_KEY_MAX_CONCURRENT_REFRESHES,
+    OPTIONS_KEY_MESSAGE_OVERDUE_GRACE,
+    OPTIONS_KEY_OFFLINE_MISSED_CHECK_INS,
+    OPTIONS_KEY_OFFLINE_UPDATE_INTERVAL,
+    OPTIONS_KEY_PUSH_CONNECTED_UPDATE_INTERVAL,
+    OPTIONS_KEY_PUSH_URL,
+    OPTIONS_KEY_RECORD_TRAFFIC,
+    OPTIONS_KEY_REFRESH_TIMEOUT,
+    OPTIONS_KEY_REQUEST_TIMEOUT,
     OPTIONS_KEY_UPDATE_INTERVAL,
+    PUSH_CONNECTED_UPDATE_INTERVAL_DEFAULT,
+    REFRESH_TIMEOUT_DEFAULT,
+    REFRESH_TIMEOUT_MIN,
+    REQUEST_TIMEOUT_DEFAULT,
+    REQUEST_TIMEOUT_MIN,
     UPDATE_INTERVAL_DEFAULT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+def _at_least(minimum: int):
+    return vol.All(vol.Coerce(int), vol.Range(min=minimum))
+
 OPTIONS_SCHEMA = vol.Schema(
     {
-        vol.Required(OPTIONS_KEY_UPDATE_INTERVAL, default=UPDATE_INTERVAL_DEFAULT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Required(OPTIONS_KEY_UPDATE_INTERVAL, default=UPDATE_INTERVAL_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_DOGS_UPDATE_INTERVAL, default=DOGS_UPDATE_INTERVAL_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_PUSH_CONNECTED_UPDATE_INTERVAL, default=PUSH_CONNECTED_UPDATE_INTERVAL_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_OFFLINE_UPDATE_INTERVAL, default=OFFLINE_UPDATE_INTERVAL_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_LIVE_TRACKING_UPDATE_INTERVAL, default=LIVE_TRACKING_UPDATE_INTERVAL_DEFAULT): _at_least(LIVE_TRACKING_UPDATE_INTERVAL_MIN),
+        vol.Required(OPTIONS_KEY_MAX_CONCURRENT_REFRESHES, default=MAX_CONCURRENT_REFRESHES_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_REQUEST_TIMEOUT, default=REQUEST_TIMEOUT_DEFAULT): _at_least(REQUEST_TIMEOUT_MIN),
+        vol.Required(OPTIONS_KEY_REFRESH_TIMEOUT, default=REFRESH_TIMEOUT_DEFAULT): _at_least(REFRESH_TIMEOUT_MIN),
+        vol.Optional(OPTIONS_KEY_PUSH_URL, default=''): str,
+        vol.Required(OPTIONS_KEY_ACTIVITY_RETENTION_DAYS, default=ACTIVITY_RETENTION_DAYS_DEFAULT): _at_least(ACTIVITY_RETENTION_DAYS_MIN),
+        vol.Required(OPTIONS_KEY_MESSAGE_OVERDUE_GRACE, default=MESSAGE_OVERDUE_GRACE_DEFAULT): _at_least(0),
+        vol.Required(OPTIONS_KEY_OFFLINE_MISSED_CHECK_INS, default=OFFLINE_MISSED_CHECK_INS_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_CADENCE_STALE_MESSAGE, default=CADENCE_STALE_MESSAGE_DEFAULT): _at_least(1),
+        vol.Required(OPTIONS_KEY_LIVE_TRACKING_TIMEOUT, default=LIVE_TRACKING_TIMEOUT_DEFAULT): _at_least(1),
+        vol.Optional(OPTIONS_KEY_RECORD_TRAFFIC, default=False): bool,
     }
 )
 
@@ -0,0 +1,118 @@
+"""Smoothing and outlier rejection for position fixes."""
+
+from datetime import datetime
+import logging
+from math import cos, radians, sqrt
+from typing import NamedTuple
+
+from .geo import METRES_PER_DEGREE_LATITUDE, haversine_distance
+
+_LOGGER = logging.getLogger(__name__)
+
+# How quickly the uncertainty of the estimate grows between fixes, in metres per second
+POSITION_FILTER_PROCESS_NOISE = 3.0
+
+# Fixes implying the dog moved faster than this are treated as outliers
+POSITION_FILTER_MAX_SPEED = 20.0
+
+# After this many outliers in a row, the dog is assumed to have really moved (e.g. in a car) and the filter restarts
+POSITION_FILTER_MAX_REJECTED = 3
+
+# The reported position is only moved once the estimate has moved by at least this distance
+POSITION_FILTER_MIN_MOVE_METRES = 10.0
+
+class FilteredPosition(NamedTuple):
+    latitude: float
+    longitude: float
+    accuracy: float
+    time: datetime
+    # Speed of the estimate between the last two fixes, in metres per second
+    speed: float = 0.0
+
+class PositionFilter():
+    """
+    Accuracy weighted smoothing of position fixes for a single dog, using a one dimensional Kalman filter.
+
+    Each fix is weighted against the current estimate by its reported accuracy, and the uncertainty of the estimate
+    grows with the time since the last fix. Fixes requiring an implausible speed to reach are rejected.
+    """
+
+    __slots__ = ('_latitude', '_longitude', '_variance', '_time', '_speed', '_rejected', '_reported')
+
+    def __init__(self):
+        self._latitude: float | None = None
+        self._longitude: float | None = None
+        self._variance = 0.0
+        self._time: datetime | None = None
+        self._speed = 0.0
+        self._rejected = 0
+        self._reported: FilteredPosition | None = None
+
+    @property
+    def position(self) -> FilteredPosition | None:
+        """The filtered position, or None if no fixes have been received."""
+        return self._reported
+
+    def update(self, latitude: float, longitude: float, accuracy: float, time: datetime) -> FilteredPosition | None:
+        """
+        Add a fix to the filter. Fixes which are not newer than the last fix are ignored.
+
+        :return: The filtered position.
+        """
+        accuracy = max(accuracy, 1.0)
+        if self._time is None:
+            self.__reset(latitude, longitude, accuracy, time)
+            return self._reported
+
+        elapsed = (time - self._time).total_seconds()
+        if elapsed <= 0:
+            return self._reported
+
+        variance = self._variance + elapsed * POSITION_FILTER_PROCESS_NOISE ** 2
+
+        distance = haversine_distance(self._latitude, self._longitude, latitude, longitude)
+        speed = max(0.0, distance - accuracy - sqrt(variance)) / elapsed
+        if speed > POSITION_FILTER_MAX_SPEED:
+            self._rejected += 1
+            if self._rejected < POSITION_FILTER_MAX_REJECTED:
+                _LOGGER.debug('Rejected position fix requiring a speed of %.1fm/s', speed)
+                return self._reported
+
+            _LOGGER.debug('Position fixes consistently rejected. Restarting filter.')
+            self.__reset(latitude, longitude, accuracy, time)
+            return self._reported
+
+        gain = variance / (variance + accuracy ** 2)
+        previous_latitude, previous_longitude = self._latitude, self._longitude
+        self._latitude += gain * (latitude - self._latitude)
+        self._longitude += gain * (longitude - self._longitude)
+        self._speed = haversine_distance(previous_latitude, previous_longitude, self._latitude, self._longitude) / elapsed
+        self._variance = (1 - gain) * variance
+        self._time = time
+        self._rejected = 0
+        self.__report()
+        return self._reported
+
+    def __reset(self, latitude: float, longitude: float, accuracy: float, time: datetime) -> None:
+        self._latitude = latitude
+        self._longitude = longitude
+        self._variance = accuracy ** 2
+        self._time = time
+        self._speed = 0.0
+        self._rejected = 0
+        self._reported = None
+        self.__report()
+
+    def __report(self) -> None:
+        accuracy = sqrt(self._variance)
+        reported = self._reported
+        if reported is not None:
+            # Cheap equirectangular distance is plenty for a threshold of a few metres
+            d_lat = (self._latitude - reported.latitude) * METRES_PER_DEGREE_LATITUDE
+            d_lon = (self._longitude - reported.longitude) * METRES_PER_DEGREE_LATITUDE * cos(radians(self._latitude))
+            if sqrt(d_lat ** 2 + d_lon ** 2) < POSITION_FILTER_MIN_MOVE_METRES and accuracy >= reported.accuracy / 2:
+                # The speed is still kept current, without changing the reported position
+                self._reported = reported._replace(speed=self._speed)
+                return
+
+        self._reported = FilteredPosition(self._latitude, self._longitude, accuracy, self._time, self._speed)
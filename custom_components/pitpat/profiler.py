@@ -0,0 +1,120 @@
+"""On demand profiling of the dog refreshes and the entity state writes they trigger."""
+
+import asyncio
+import cProfile
+from datetime import datetime
+import logging
+import os
+import pstats
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .coordinator import PitPatDogDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_DIRECTORY = 'pitpat_profiles'
+
+# Number of functions listed in the summary
+PROFILE_TOP_FUNCTIONS = 15
+
+# Categories of cost in the summary, matched in order against the file and function name of each profiled function.
+# Time spent in a function is only counted in its own category, not in the functions which called it.
+PROFILE_CATEGORIES: List[Tuple[str, Sequence[str], Sequence[str]]] = [
+    ('json_decode', ('/json/',), ('_json.', 'async_iter_json_array')),
+    ('date_parsing', ('dateutil', '_strptime'), ('fromisoformat', '_datetime', 'strptime', 'parse_datetime')),
+    ('model_parsing', ('pitpat/models.py',), ()),
+    ('activity_statistics', ('pitpat/activity_stats.py', 'pitpat/statistics_import.py'), ()),
+    ('position_processing', ('pitpat/geofence.py', 'pitpat/position_filter.py', 'pitpat/geo.py', 'pitpat/walks.py'), ()),
+    ('battery_model', ('pitpat/battery_model.py',), ()),
+    ('entity_writes', ('homeassistant/helpers/entity.py', 'homeassistant/core.py', 'pitpat/sensor.py', 'pitpat/binary_sensor.py', 'pitpat/device_tracker.py', 'pitpat/select.py', 'pitpat/entity.py'), ()),
+    ('network', ('aiohttp', 'multidict', 'yarl', '/ssl.py', '/asyncio/selector_events.py', '/asyncio/sslproto.py'), ()),
+    ('event_loop', ('/asyncio/',), ('poll', 'select', 'epoll')),
+]
+
+def _categorise(filename: str, function: str) -> str:
+    filename = filename.replace('\\', '/')
+    for category, file_patterns, function_patterns in PROFILE_CATEGORIES:
+        if any(pattern in filename for pattern in file_patterns) or any(pattern in function for pattern in function_patterns):
+            return category
+    return 'other'
+
+def summarise_profile(path: str) -> Dict[str, Any]:
+    """
+    Summarise a saved profile by category and by the most costly functions. This does blocking I/O, so must be run in
+    an executor.
+    """
+    stats = pstats.Stats(path)
+    categories: Dict[str, float] = {}
+    functions = []
+    for (filename, line, function), (_, calls, own_time, total_time, _) in stats.stats.items():
+        category = _categorise(filename, function)
+        categories[category] = categories.get(category, 0.0) + own_time
+        functions.append((own_time, total_time, calls, f'{os.path.basename(filename)}:{line}({function})', category))
+
+    functions.sort(reverse=True)
+    return {
+        'total_seconds': round(stats.total_tt, 4),
+        'categories': {
+            category: round(seconds, 4)
+            for category, seconds in sorted(categories.items(), key=lambda item: item[1], reverse=True)
+        },
+        'top_functions': [
+            {
+                'function': name,
+                'category': category,
+                'calls': calls,
+                'own_seconds': round(own_time, 4),
+                'total_seconds': round(total_time, 4),
+            }
+            for own_time, total_time, calls, name, category in functions[:PROFILE_TOP_FUNCTIONS]
+        ],
+    }
+
+async def async_profile_refreshes(
+        hass: HomeAssistant,
+        dog_coordinators: Sequence[PitPatDogDataUpdateCoordinator],
+        refreshes: int) -> Dict[str, Any]:
+    """
+    Refresh the dogs a number of times with the profiler enabled, and save the profile to the profiles directory.
+
+    Each round refreshes the dogs concurrently, as a scheduled refresh would, and includes the entity state writes
+    made as the coordinators notify their listeners. Anything else running in the event loop at the same time is
+    also included in the profile. Nothing is hooked into the refreshes outside of this, so there is no cost while the
+    profiler isn't running.
+
+    :param hass: The Home Assistant instance.
+    :param dog_coordinators: The coordinators of the dogs to refresh.
+    :param refreshes: The number of times to refresh each dog.
+    :return: The path of the saved profile, the time taken by each round and a summary of the costs.
+    """
+    profiler = cProfile.Profile()
+    round_seconds = []
+    profiler.enable()
+    try:
+        for _ in range(refreshes):
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                dog_coordinator.async_refresh()
+                for dog_coordinator in dog_coordinators
+            ])
+            round_seconds.append(round(time.perf_counter() - started, 4))
+    finally:
+        profiler.disable()
+
+    path = hass.config.path(PROFILE_DIRECTORY, f'refresh_{datetime.now():%Y%m%d%H%M%S}.prof')
+    await hass.async_add_executor_job(_dump_stats, profiler, path)
+    summary = await hass.async_add_executor_job(summarise_profile, path)
+    _LOGGER.info('Saved profile of %i refreshes to %s: %s', refreshes, path, summary['categories'])
+    return {
+        'path': path,
+        'dogs': len(dog_coordinators),
+        'refresh_seconds': round_seconds,
+        **summary,
+    }
+
+def _dump_stats(profiler: cProfile.Profile, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
@@ -0,0 +1,115 @@
+"""Receiver for monitor updates pushed from a location streaming service."""
+
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+if TYPE_CHECKING:
+    from .coordinator import PitPatDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+PUSH_HEARTBEAT_SECONDS = 30
+PUSH_RECONNECT_MIN_SECONDS = 5
+PUSH_RECONNECT_MAX_SECONDS = 300
+
+class PitPatPushReceiver():
+    """
+    Maintains a WebSocket connection to a push service, merging the monitor updates it sends into the coordinator.
+
+    Each message is a JSON object with the Id of the dog and any monitor fields which have changed, in the same format
+    as the monitor API response:
+
+        {"DogId": "...", "Monitor": {"LastKnownPosition": {"HasValue": true, "Value": {...}}}}
+
+    The coordinator polls less often while connected, and returns to the normal interval if the connection drops.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: 'PitPatDataUpdateCoordinator', url: str):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._url = url
+        self._task: asyncio.Task | None = None
+        self._connected = False
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @callback
+    def async_start(self, config_entry: ConfigEntry) -> None:
+        """Start connecting to the push service in the background."""
+        _LOGGER.info('Starting push receiver for %s', self._url)
+        self._task = config_entry.async_create_background_task(self._hass, self.__async_run(), f'{config_entry.title} push receiver')
+
+    async def async_stop(self) -> None:
+        """Disconnect from the push service."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.__set_connected(False)
+
+    async def __async_run(self) -> None:
+        session = async_get_clientsession(self._hass)
+        backoff = PUSH_RECONNECT_MIN_SECONDS
+        while True:
+            was_connected = False
+            try:
+                headers = self._coordinator.api_client.default_headers if self._coordinator.api_client else {}
+                async with session.ws_connect(self._url, headers=headers, heartbeat=PUSH_HEARTBEAT_SECONDS) as ws:
+                    _LOGGER.info('Connected to push service')
+                    self.__set_connected(True)
+                    was_connected = True
+                    backoff = PUSH_RECONNECT_MIN_SECONDS
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self.__handle_message(message.data)
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            raise ws.exception() or aiohttp.ClientError('WebSocket error')
+                _LOGGER.warning('Push service closed the connection')
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning('Push connection failed. Retrying in %i seconds.', backoff, exc_info=err)
+            finally:
+                self.__set_connected(False)
+
+            if was_connected:
+                # Catch up on anything missed since the connection dropped
+                await self._coordinator.async_request_refresh()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, PUSH_RECONNECT_MAX_SECONDS)
+
+    def __set_connected(self, connected: bool) -> None:
+        if self._connected == connected:
+            return
+        self._connected = connected
+        self._coordinator.async_set_push_connected(connected)
+
+    def __handle_message(self, data: str) -> None:
+        try:
+            message: Dict[str, Any] = json.loads(data)
+        except ValueError:
+            _LOGGER.warning('Ignoring push message which is not valid JSON')
+            return
+
+        dog_id = message.get('DogId')
+        monitor = message.get('Monitor')
+        if not dog_id or not isinstance(monitor, dict):
+            _LOGGER.debug('Ignoring push message: %s', message)
+            return
+
+        _LOGGER.debug('Received push update for dog %s: %s', dog_id, monitor)
+        self._coordinator.async_apply_monitor_update(dog_id, monitor)
@@ -19,13 +19,13 @@ from .const import (
     PHONE_HOME_CADENCE_MAP,
 )
 from .coordinator import PitPatDataUpdateCoordinator
-from .entity import PitPatDogEntity
+from .entity import PitPatDogEntity, async_setup_dog_entities
 
 
 _LOGGER = logging.getLogger(__name__)
 
-def _get_phone_home_cadence_raw(entity: PitPatDogEntity) -> str | None:
-    return entity.data_monitor.get('PhoneHomeCadence')
+def _get_phone_home_cadence_raw(entity: PitPatDogEntity) -> int | None:
+    return entity.data_monitor.phone_home_cadence
 
 def _get_phone_home_cadence(entity: PitPatDogEntity) -> str | None:
     raw_value = _get_phone_home_cadence_raw(entity)
@@ -65,13 +65,10 @@ ENTITY_DESCRIPTIONS = [
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities):
     """Add the Entities from the config."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    sensors = []
-
-    for dog_id in coordinator.data.keys():
-        for description in ENTITY_DESCRIPTIONS:
-            sensors.append(PitPatSelectEntity(coordinator, dog_id, description))
-
-    async_add_entities(sensors, True)
+    async_setup_dog_entities(hass, coordinator, async_add_entities, lambda dog_id, dog_coordinator: [
+        PitPatSelectEntity(dog_coordinator, dog_id, description)
+        for description in ENTITY_DESCRIPTIONS
+    ])
 
 class PitPatSelectEntity(PitPatDogEntity[PitPatSelectEntityDescription], SelectEntity):
 
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any, Callable, Dict
 
-import dateutil
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -19,16 +19,50 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 
+from .aggregates import AccountAggregates
+from .battery_model import BATTERY_MODE_LIVE_TRACKING, BatteryPrediction
+from .connectivity import ConnectivityStatus
 from .const import (
     DATA_KEY_COORDINATOR,
     DOMAIN,
+    PHONE_HOME_CADENCE_MAP,
 )
 from .coordinator import PitPatDataUpdateCoordinator
-from .entity import PitPatDogEntity
+from .entity import VOLATILE_ATTRIBUTES, PitPatAccountEntity, PitPatDogEntity, async_setup_dog_entities
 
+BATTERY_MODES = [cadence.lower() for cadence in PHONE_HOME_CADENCE_MAP.values()] + [BATTERY_MODE_LIVE_TRACKING]
+
+def _get_activity_value(entity: PitPatDogEntity, field: str) -> float:
+    activity_today = entity.data_activity_today
+    return getattr(activity_today, field) if activity_today else 0
+
+def _get_battery_prediction(entity: PitPatDogEntity) -> BatteryPrediction:
+    return entity.data_dog_details.battery_prediction or BatteryPrediction(None, None, {})
+
+def _get_battery_hours(duration: timedelta | None) -> float | None:
+    return duration.total_seconds() / 3600 if duration is not None else None
+
+def _get_battery_mode_attributes(entity: PitPatDogEntity) -> dict:
+    """The drain rate (% per hour) and time to empty (hours) from the current level for each mode with readings."""
+    level = entity.data_monitor.battery.level_fraction
+    attributes = {}
+    for mode, rate in _get_battery_prediction(entity).drain_rates.items():
+        attributes[f'drain_rate_{mode}'] = round(rate * 100, 2)
+        if level is not None and rate > 0:
+            attributes[f'time_to_empty_{mode}'] = round(level / rate, 1)
+    return attributes
+
+def _get_connectivity(entity: PitPatDogEntity) -> ConnectivityStatus | None:
+    return entity.data_dog_details.connectivity
+
+def _get_lateness_minutes(entity: PitPatDogEntity) -> float | None:
+    connectivity = _get_connectivity(entity)
+    if connectivity is None or connectivity.lateness is None:
+        return None
+    return connectivity.lateness.total_seconds() / 60
 
 def _get_tracking_mode(entity: PitPatDogEntity):
-    reason_id = entity.data_monitor.get('LiveTrackingReason', 0)
+    reason_id = entity.data_monitor.live_tracking_reason
     if reason_id == 1:
         return 'Find my dog'
     elif reason_id == 2:
@@ -37,7 +71,7 @@ def _get_tracking_mode(entity: PitPatDogEntity):
         return 'None'
 
 def _get_tracking_status(entity: PitPatDogEntity):
-    reason_id = entity.data_monitor.get('GpsSynchronisationState', 0)
+    reason_id = entity.data_monitor.gps_synchronisation_state
     if reason_id == 0:
         return 'Not tracking'
     elif reason_id == 1:
@@ -53,32 +87,34 @@ def _get_tracking_status(entity: PitPatDogEntity):
 class PitPatSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[PitPatDogEntity], str | int | float | None]
     attributes_fn: Callable[[PitPatDogEntity], dict | None] = None
+    state_precision: int | None = None
+    """Decimal places numeric values are rounded to, so the state is only written when the rounded value changes."""
 
 DOG_ENTITY_DESCRIPTIONS = [
     PitPatSensorEntityDescription(
         key="breed",
         translation_key="breed",
         icon="mdi:dog-side",
-        value_fn=lambda entity: entity.data_dog.get('Breed', {}).get('Name'),
+        value_fn=lambda entity: entity.data_dog.breed_name,
     ),
     PitPatSensorEntityDescription(
         key="family",
         translation_key="family",
         icon="mdi:dog-side",
-        value_fn=lambda entity: entity.data_dog.get('Breed', {}).get('Family'),
+        value_fn=lambda entity: entity.data_dog.breed_family,
     ),
     PitPatSensorEntityDescription(
         key="gender",
         translation_key="gender",
         icon="mdi:gender-male-female",
-        value_fn=lambda entity: 'Female' if entity.data_dog.get('IsFemale', {}) else 'Male',
+        value_fn=lambda entity: 'Female' if entity.data_dog.is_female else 'Male',
     ),
     PitPatSensorEntityDescription(
         key="date_of_birth",
         translation_key="date_of_birth",
         icon="mdi:calendar",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda entity: dateutil.parser.parse(entity.data_dog.get('BirthDate')).date(),
+        value_fn=lambda entity: entity.data_dog.birth_date,
     ),
     PitPatSensorEntityDescription(
         key="weight",
@@ -87,7 +123,8 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfMass.KILOGRAMS, # TODO: Make sure this is correct based on user settings
         suggested_display_precision=1,
-        value_fn=lambda entity: entity.data_dog.get('Weight'),
+        state_precision=1,
+        value_fn=lambda entity: entity.data_dog.weight,
     ),
     PitPatSensorEntityDescription(
         key="battery_level",
@@ -97,14 +134,36 @@ DOG_ENTITY_DESCRIPTIONS = [
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=0,
-        value_fn=lambda entity: entity.data_monitor.get('BatteryInfo', {}).get('Value', {}).get('BatteryLevelFraction') * 100,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_monitor.battery.level_fraction * 100,
+    ),
+    PitPatSensorEntityDescription(
+        key="battery_time_to_empty",
+        translation_key="battery_time_to_empty",
+        icon="mdi:battery-clock",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        state_precision=1,
+        value_fn=lambda entity: _get_battery_hours(_get_battery_prediction(entity).time_to_empty),
+        attributes_fn=lambda entity: _get_battery_mode_attributes(entity),
+    ),
+    PitPatSensorEntityDescription(
+        key="battery_charge_by",
+        translation_key="battery_charge_by",
+        icon="mdi:battery-charging-low",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entity: _get_battery_prediction(entity).charge_by,
     ),
     PitPatSensorEntityDescription(
         key="network",
         translation_key="network",
         icon='mdi:radio-tower',
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda entity: entity.data_monitor.get('Network', {}).get('Value', {}).get('NetworkOperator', {}).get('Value'),
+        value_fn=lambda entity: entity.data_monitor.network.operator,
     ),
     PitPatSensorEntityDescription(
         key="signal_strength",
@@ -114,7 +173,42 @@ DOG_ENTITY_DESCRIPTIONS = [
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=0,
-        value_fn=lambda entity: entity.data_monitor.get('Network', {}).get('Value', {}).get('Quality') * 20,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_monitor.network.quality * 20,
+    ),
+    PitPatSensorEntityDescription(
+        key="signal_strength_trend",
+        translation_key="signal_strength_trend",
+        icon='mdi:signal-variant',
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: _get_connectivity(entity).signal_trend * 20 if _get_connectivity(entity) and _get_connectivity(entity).signal_trend is not None else None,
+    ),
+    PitPatSensorEntityDescription(
+        key="message_lateness",
+        translation_key="message_lateness",
+        icon="mdi:email-alert-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=1,
+        state_precision=1,
+        value_fn=lambda entity: _get_lateness_minutes(entity),
+    ),
+    PitPatSensorEntityDescription(
+        key="missed_check_ins",
+        translation_key="missed_check_ins",
+        icon="mdi:email-remove-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entity: _get_connectivity(entity).missed_check_ins if _get_connectivity(entity) else None,
+        attributes_fn=lambda entity: {
+            'total': _get_connectivity(entity).missed_check_ins_total if _get_connectivity(entity) else None,
+        },
     ),
     PitPatSensorEntityDescription(
         key="last_message_sent",
@@ -122,7 +216,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         icon="mdi:email-arrow-right-outline",
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda entity: dateutil.parser.parse(entity.data_monitor.get('ContactTimings', {}).get('Value', {}).get('LastMessageSentAt')),
+        value_fn=lambda entity: entity.data_monitor.contact_timings.last_message_sent_at,
     ),
     PitPatSensorEntityDescription(
         key="last_message_received",
@@ -130,7 +224,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         icon="mdi:email-arrow-left-outline",
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda entity: dateutil.parser.parse(entity.data_monitor.get('ContactTimings', {}).get('Value', {}).get('LastMessageReceivedAt')),
+        value_fn=lambda entity: entity.data_monitor.contact_timings.last_message_received_at,
     ),
     PitPatSensorEntityDescription(
         key="next_message_expected",
@@ -138,7 +232,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         icon="mdi:email-fast-outline",
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda entity: dateutil.parser.parse(entity.data_monitor.get('ContactTimings', {}).get('Value', {}).get('NextMessageExpectedAt')),
+        value_fn=lambda entity: entity.data_monitor.contact_timings.next_message_expected_at,
     ),
     PitPatSensorEntityDescription(
         key="activity_pottering",
@@ -148,7 +242,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
         suggested_unit_of_measurement=UnitOfTime.HOURS,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalPotteringMinutes', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_pottering_minutes'),
     ),
     PitPatSensorEntityDescription(
         key="activity_running",
@@ -157,7 +251,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalRunMinutes', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_run_minutes'),
     ),
     PitPatSensorEntityDescription(
         key="activity_walking",
@@ -166,7 +260,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalWalkMinutes', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_walk_minutes'),
     ),
     PitPatSensorEntityDescription(
         key="activity_playing",
@@ -175,7 +269,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalPlayMinutes', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_play_minutes'),
     ),
     PitPatSensorEntityDescription(
         key="activity_resting",
@@ -185,7 +279,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
         suggested_unit_of_measurement=UnitOfTime.HOURS,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalRestMinutes', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_rest_minutes'),
     ),
     PitPatSensorEntityDescription(
         key="activity_total_exercising",
@@ -194,7 +288,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('Activeness', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'activeness'),
     ),
     PitPatSensorEntityDescription(
         key="activity_steps",
@@ -202,7 +296,7 @@ DOG_ENTITY_DESCRIPTIONS = [
         icon="mdi:paw",
         state_class=SensorStateClass.TOTAL_INCREASING,
         native_unit_of_measurement="steps",
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalSteps', 0),
+        value_fn=lambda entity: _get_activity_value(entity, 'total_steps'),
     ),
     PitPatSensorEntityDescription(
         key="activity_distance",
@@ -213,7 +307,8 @@ DOG_ENTITY_DESCRIPTIONS = [
         native_unit_of_measurement=UnitOfLength.METERS,
         suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
         suggested_display_precision=0,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalDistance', 0),
+        state_precision=0,
+        value_fn=lambda entity: _get_activity_value(entity, 'total_distance'),
     ),
     PitPatSensorEntityDescription(
         key="activity_calories",
@@ -222,7 +317,8 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE,
-        value_fn=lambda entity: entity.data_dog.get('activity_today', {}).get('TotalCalories', 0),
+        state_precision=0,
+        value_fn=lambda entity: _get_activity_value(entity, 'total_calories'),
     ),
     PitPatSensorEntityDescription(
         key="user_goal_progress",
@@ -231,7 +327,111 @@ DOG_ENTITY_DESCRIPTIONS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=0,
-        value_fn=lambda entity: (entity.data_dog.get('activity_today', {}).get('Activeness', 0) / entity.data_dog.get('activity_today', {}).get('UserGoal', 0)) * 100,
+        state_precision=0,
+        value_fn=lambda entity: (_get_activity_value(entity, 'activeness') / _get_activity_value(entity, 'user_goal')) * 100,
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_steps_avg_7d",
+        translation_key="activity_steps_avg_7d",
+        icon="mdi:paw",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="steps",
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('steps_avg_7d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_steps_avg_30d",
+        translation_key="activity_steps_avg_30d",
+        icon="mdi:paw",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="steps",
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('steps_avg_30d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_distance_avg_7d",
+        translation_key="activity_distance_avg_7d",
+        icon="mdi:map-marker-distance",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('distance_avg_7d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_distance_avg_30d",
+        translation_key="activity_distance_avg_30d",
+        icon="mdi:map-marker-distance",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('distance_avg_30d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_calories_avg_7d",
+        translation_key="activity_calories_avg_7d",
+        icon="mdi:fire",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('calories_avg_7d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_calories_avg_30d",
+        translation_key="activity_calories_avg_30d",
+        icon="mdi:fire",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('calories_avg_30d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_active_minutes_avg_7d",
+        translation_key="activity_active_minutes_avg_7d",
+        icon="mdi:run",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('active_minutes_avg_7d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="activity_active_minutes_avg_30d",
+        translation_key="activity_active_minutes_avg_30d",
+        icon="mdi:run",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        state_precision=0,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('active_minutes_avg_30d'),
+    ),
+    PitPatSensorEntityDescription(
+        key="user_goal_streak",
+        translation_key="user_goal_streak",
+        icon="mdi:fire-circle",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('goal_streak'),
+    ),
+    PitPatSensorEntityDescription(
+        key="user_goal_streak_best",
+        translation_key="user_goal_streak_best",
+        icon="mdi:trophy",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        value_fn=lambda entity: entity.data_dog_details.activity_stats.get('goal_streak_best'),
     ),
     PitPatSensorEntityDescription(
         key="live_tracking_mode",
@@ -247,23 +447,105 @@ DOG_ENTITY_DESCRIPTIONS = [
     ),
 ]
 
+@dataclass(frozen=True, kw_only=True)
+class PitPatAccountSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[AccountAggregates], str | int | float | None]
+    attributes_fn: Callable[[AccountAggregates], dict | None] = None
+
+ACCOUNT_ENTITY_DESCRIPTIONS = [
+    PitPatAccountSensorEntityDescription(
+        key="account_activity_steps",
+        translation_key="account_activity_steps",
+        icon="mdi:paw",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="steps",
+        value_fn=lambda aggregates: aggregates.steps_today,
+    ),
+    PitPatAccountSensorEntityDescription(
+        key="account_activity_distance",
+        translation_key="account_activity_distance",
+        icon="mdi:map-marker-distance",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=0,
+        value_fn=lambda aggregates: round(aggregates.distance_today),
+    ),
+    PitPatAccountSensorEntityDescription(
+        key="account_lowest_battery_level",
+        translation_key="account_lowest_battery_level",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        value_fn=lambda aggregates: round(aggregates.lowest_battery_level * 100) if aggregates.lowest_battery_level is not None else None,
+        attributes_fn=lambda aggregates: {
+            'dog': aggregates.lowest_battery_dog,
+        },
+    ),
+    PitPatAccountSensorEntityDescription(
+        key="account_live_tracking_count",
+        translation_key="account_live_tracking_count",
+        icon="mdi:map-marker-radius",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: len(aggregates.live_tracking),
+        attributes_fn=lambda aggregates: {
+            'dogs': aggregates.live_tracking,
+        },
+    ),
+    PitPatAccountSensorEntityDescription(
+        key="account_charging_count",
+        translation_key="account_charging_count",
+        icon="mdi:battery-charging",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: len(aggregates.charging),
+        attributes_fn=lambda aggregates: {
+            'dogs': aggregates.charging,
+        },
+    ),
+    PitPatAccountSensorEntityDescription(
+        key="account_overdue_count",
+        translation_key="account_overdue_count",
+        icon="mdi:email-alert-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: len(aggregates.overdue),
+        attributes_fn=lambda aggregates: {
+            'dogs': aggregates.overdue,
+        },
+    ),
+]
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities):
     """Add the Entities from the config."""
     coordinator: PitPatDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_COORDINATOR]
-    sensors = []
+    async_setup_dog_entities(hass, coordinator, async_add_entities, lambda dog_id, dog_coordinator: [
+        PitPatDogSensorEntity(dog_coordinator, dog_id, description)
+        for description in DOG_ENTITY_DESCRIPTIONS
+    ])
 
-    for dog_id in coordinator.data.keys():
-        for description in DOG_ENTITY_DESCRIPTIONS:
-            sensors.append(PitPatDogSensorEntity(coordinator, dog_id, description))
-
-    async_add_entities(sensors, True)
+    async_add_entities([
+        PitPatAccountSensorEntity(coordinator, description)
+        for description in ACCOUNT_ENTITY_DESCRIPTIONS
+    ])
 
 class PitPatDogSensorEntity(PitPatDogEntity[PitPatSensorEntityDescription], SensorEntity):
 
+    # The battery rates for each mode change with every reading, and are only useful for the current value
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES | frozenset(
+        f'{attribute}_{mode}'
+        for attribute in ('drain_rate', 'time_to_empty')
+        for mode in BATTERY_MODES
+    )
+
     @property
     def native_value(self):
         try:
-            return self.entity_description.value_fn(self)
+            value = self.entity_description.value_fn(self)
+            precision = self.entity_description.state_precision
+            if precision is not None and isinstance(value, float):
+                value = round(value, precision)
+            return value
         except Exception as e:
             raise ValueError(f"Unable to get value for {self.entity_description.key} sensor entity for dog id {self.dog_id}") from e
 
@@ -276,3 +558,21 @@ class PitPatDogSensorEntity(PitPatDogEntity[PitPatSensorEntityDescription], Sens
             return attributes
         except Exception as e:
             raise ValueError(f"Unable to get attributes for {self.entity_description.key} sensor entity for dog id {self.dog_id}") from e
+
+class PitPatAccountSensorEntity(PitPatAccountEntity[PitPatAccountSensorEntityDescription], SensorEntity):
+
+    @property
+    def native_value(self):
+        try:
+            return self.entity_description.value_fn(self.data_aggregates)
+        except Exception as e:
+            raise ValueError(f"Unable to get value for {self.entity_description.key} account sensor entity") from e
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        try:
+            if self.entity_description.attributes_fn:
+                return self.entity_description.attributes_fn(self.data_aggregates)
+            return None
+        except Exception as e:
+            raise ValueError(f"Unable to get attributes for {self.entity_description.key} account sensor entity") from e
@@ -0,0 +1,231 @@
+"""Services provided by the PitPat integration."""
+
+import asyncio
+from datetime import date
+import heapq
+import logging
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_KEY_COORDINATOR,
+    DOMAIN,
+    SERVICE_EXPORT,
+    SERVICE_OPTIMIZE_CADENCE,
+    SERVICE_PROFILE,
+)
+from .coordinator import PitPatDataUpdateCoordinator
+from .export import (
+    EXPORT_DATA_ACTIVITY,
+    EXPORT_DATA_WALKS,
+    EXPORT_ACTIVITY_WINDOW_DAYS,
+    EXPORT_DIRECTORY,
+    EXPORT_EXTENSIONS,
+    EXPORT_FORMAT_COLUMNAR,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_GPX,
+    async_export,
+    create_writer,
+)
+from .models import ActivityDay
+from .profiler import async_profile_refreshes
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_DOG_ID = 'dog_id'
+ATTR_DRY_RUN = 'dry_run'
+ATTR_DATA = 'data'
+ATTR_FORMAT = 'format'
+ATTR_START_DATE = 'start_date'
+ATTR_END_DATE = 'end_date'
+ATTR_RESUME = 'resume'
+ATTR_REFRESHES = 'refreshes'
+
+OPTIMIZE_CADENCE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DOG_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+})
+
+EXPORT_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DOG_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_DATA): vol.In([EXPORT_DATA_ACTIVITY, EXPORT_DATA_WALKS]),
+    vol.Required(ATTR_FORMAT): vol.In([EXPORT_FORMAT_CSV, EXPORT_FORMAT_GPX, EXPORT_FORMAT_COLUMNAR]),
+    vol.Optional(ATTR_START_DATE): cv.date,
+    vol.Optional(ATTR_END_DATE): cv.date,
+    vol.Optional(ATTR_RESUME, default=True): cv.boolean,
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DOG_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_REFRESHES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+})
+
+async def _async_iter_activity(coordinator: PitPatDataUpdateCoordinator, dog_id: str, start: str, end: str) -> AsyncIterator[Tuple[str, Any]]:
+    # The API doesn't guarantee the order of the days, so each pass over the history keeps only the earliest days
+    # after those already exported, in a heap with the latest of them first. Most histories fit in a single pass.
+    api_client = await coordinator.async_get_api_client()
+    after = ''
+    while True:
+        # The index only breaks ties between days with the same date, so the days themselves are never compared
+        window: List[Tuple[int, int, ActivityDay]] = []
+        index = 0
+        async for day in api_client.async_iter_all_activity_days(dog_id):
+            if not day.get('Date'):
+                continue
+            activity_day = ActivityDay.from_api(day)
+            if not (start <= activity_day.date <= end and activity_day.date > after):
+                continue
+            index += 1
+            item = (-date.fromisoformat(activity_day.date).toordinal(), index, activity_day)
+            if len(window) < EXPORT_ACTIVITY_WINDOW_DAYS:
+                heapq.heappush(window, item)
+            elif item[0] > window[0][0]:
+                heapq.heapreplace(window, item)
+
+        days = sorted((activity_day for _, _, activity_day in window), key=lambda activity_day: activity_day.date)
+        for activity_day in days:
+            yield activity_day.date, activity_day
+        if len(days) < EXPORT_ACTIVITY_WINDOW_DAYS:
+            return
+        after = days[-1].date
+
+async def _async_iter_walks(coordinator: PitPatDataUpdateCoordinator, dog_id: str, start: str, end: str) -> AsyncIterator[Tuple[str, Any]]:
+    walks = [
+        walk
+        for walk in coordinator.walks.history
+        if walk['dog_id'] == dog_id and start <= walk['start'][:10] <= end
+    ]
+    for walk in sorted(walks, key=lambda walk: walk['start']):
+        yield walk['start'], walk
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services for the integration."""
+    profile_lock = asyncio.Lock()
+
+    async def async_optimize_cadence(call: ServiceCall) -> ServiceResponse:
+        dog_ids = call.data.get(ATTR_DOG_ID)
+        dry_run = call.data[ATTR_DRY_RUN]
+        now = dt_util.utcnow()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        failed = []
+        for entry_data in hass.data.get(DOMAIN, {}).values():
+            coordinator: PitPatDataUpdateCoordinator = entry_data[DATA_KEY_COORDINATOR]
+            for dog_id, dog_coordinator in coordinator.dog_coordinators.items():
+                if (dog_ids and dog_id not in dog_ids) or dog_coordinator.data is None:
+                    continue
+
+                decision = coordinator.cadence_optimizer.evaluate(dog_id, dog_coordinator.data, now)
+                if decision is None:
+                    continue
+                results[dog_id] = decision._asdict()
+
+                if not decision.changed or dry_run:
+                    continue
+
+                try:
+                    api_client = await coordinator.async_get_api_client()
+                    await api_client.async_update_phone_home_cadence(dog_id, decision.recommended)
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.warning('Failed to update phone home cadence for dog %s', dog_id, exc_info=err)
+                    results[dog_id]['changed'] = False
+                    failed.append(dog_id)
+                    continue
+
+                _LOGGER.info('Phone home cadence for dog %s changed from %s to %s', dog_id, decision.current, decision.recommended)
+                coordinator.cadence_optimizer.record_change(dog_id, now)
+                await dog_coordinator.async_request_refresh()
+
+        if failed:
+            raise HomeAssistantError(f'Failed to update phone home cadence for dogs: {", ".join(failed)}')
+
+        if call.return_response:
+            return {'dogs': results}
+        return None
+
+    async def async_export_history(call: ServiceCall) -> ServiceResponse:
+        dog_ids = call.data.get(ATTR_DOG_ID)
+        data = call.data[ATTR_DATA]
+        export_format = call.data[ATTR_FORMAT]
+        start = call.data[ATTR_START_DATE].isoformat() if ATTR_START_DATE in call.data else ''
+        end = call.data[ATTR_END_DATE].isoformat() if ATTR_END_DATE in call.data else '9999-12-31'
+        if export_format == EXPORT_FORMAT_GPX and data != EXPORT_DATA_WALKS:
+            raise ServiceValidationError('GPX export is only available for walks')
+
+        results = []
+        for entry_data in hass.data.get(DOMAIN, {}).values():
+            coordinator: PitPatDataUpdateCoordinator = entry_data[DATA_KEY_COORDINATOR]
+            for dog_id in coordinator.dog_coordinators:
+                if dog_ids and dog_id not in dog_ids:
+                    continue
+
+                date_range = f'{start or "start"}_{end if ATTR_END_DATE in call.data else "end"}'
+                file_name = f'{dog_id}_{data}_{date_range}.{EXPORT_EXTENSIONS[export_format]}'
+                writer = create_writer(hass.config.path(EXPORT_DIRECTORY, file_name), data, export_format)
+                iter_records = _async_iter_activity if data == EXPORT_DATA_ACTIVITY else _async_iter_walks
+                try:
+                    result = await async_export(
+                        hass.async_add_executor_job,
+                        writer,
+                        iter_records(coordinator, dog_id, start, end),
+                        call.data[ATTR_RESUME])
+                except Exception as err:
+                    raise HomeAssistantError(f'Export for dog {dog_id} failed. Call the service again to resume it.') from err
+                results.append({'dog_id': dog_id, **result})
+
+        if call.return_response:
+            return {'exports': results}
+        return None
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        dog_ids = call.data.get(ATTR_DOG_ID)
+        dog_coordinators = [
+            dog_coordinator
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+            for dog_id, dog_coordinator in entry_data[DATA_KEY_COORDINATOR].dog_coordinators.items()
+            if not dog_ids or dog_id in dog_ids
+        ]
+        if not dog_coordinators:
+            raise ServiceValidationError('No dogs to profile')
+        if profile_lock.locked():
+            raise ServiceValidationError('A profile is already running')
+
+        async with profile_lock:
+            try:
+                result = await async_profile_refreshes(hass, dog_coordinators, call.data[ATTR_REFRESHES])
+            except ValueError as err:
+                # Only one profiler can be active at a time, e.g. the Home Assistant profiler integration
+                raise HomeAssistantError(f'Unable to start profiling: {err}') from err
+
+        if call.return_response:
+            return result
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        async_export_history,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_OPTIMIZE_CADENCE,
+        async_optimize_cadence,
+        schema=OPTIMIZE_CADENCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,114 @@
+"""Import of historical activity into the recorder as long-term statistics."""
+
+from datetime import datetime
+import logging
+from typing import Any, Dict, Iterable, List
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import (
+    UnitOfEnergy,
+    UnitOfLength,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .activity_stats import ACTIVITY_STATS_METRICS, ActivityDaySummary
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+IMPORT_BATCH_SIZE = 500
+
+IMPORT_METRICS: Dict[str, tuple[str, str]] = {
+    'steps': ('Steps', 'steps'),
+    'distance': ('Distance', UnitOfLength.METERS),
+    'calories': ('Calories Burned', UnitOfEnergy.KILO_CALORIE),
+    'active_minutes': ('Exercising', UnitOfTime.MINUTES),
+}
+
+def get_statistic_id(dog_id: str, metric: str) -> str:
+    """The external statistic id for a metric of a dog."""
+    return f'{DOMAIN}:{dog_id.lower().replace('-', '_')}_{metric}'
+
+class ActivityStatisticsImporter():
+    """
+    Writes complete activity days to the recorder as daily external statistics.
+
+    The date of the last imported day and the running sums are stored for each dog, so days are only imported once
+    regardless of how many times they appear in the activity history.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._hass = hass
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.statistics_import')
+        self._state: Dict[str, Dict[str, Any]] | None = None
+
+    async def async_load(self) -> None:
+        """Load the import progress from storage, if not already loaded."""
+        if self._state is None:
+            self._state = await self._store.async_load() or {}
+
+    def last_date(self, dog_id: str) -> str:
+        """The date of the last day imported for the dog, or an empty string if nothing has been imported."""
+        return self._state.get(dog_id, {}).get('last_date', '')
+
+    def async_import(self, dog_id: str, dog_name: str, days: Iterable[ActivityDaySummary], current_date: str) -> int:
+        """
+        Import activity days after the last imported day and before the current (incomplete) day.
+
+        :param dog_id: The Id for the dog the activity days are for.
+        :param dog_name: The name of the dog, used to name the statistics.
+        :param days: Activity days in any order. Days which have already been imported are skipped.
+        :param current_date: The date of the current day which is still in progress.
+        :return: The number of days imported.
+        :rtype: int
+        """
+        dog_state = self._state.setdefault(dog_id, {'last_date': '', 'sums': {}})
+        last_date = dog_state['last_date']
+        new_days = sorted(
+            (day for day in days if last_date < day.date < current_date),
+            key=lambda day: day.date)
+        if not new_days:
+            return 0
+
+        sums: Dict[str, float] = dog_state['sums']
+        for index, metric in enumerate(ACTIVITY_STATS_METRICS.keys()):
+            name, unit = IMPORT_METRICS[metric]
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f'{dog_name} {name}',
+                source=DOMAIN,
+                statistic_id=get_statistic_id(dog_id, metric),
+                unit_class=None,
+                unit_of_measurement=unit,
+            )
+
+            total = sums.get(metric, 0.0)
+            statistics: List[StatisticData] = []
+            for day in new_days:
+                total += day.values[index]
+                statistics.append(StatisticData(
+                    start=datetime.fromisoformat(f'{day.date}T00:00:00+00:00'),
+                    state=day.values[index],
+                    sum=total,
+                ))
+            sums[metric] = total
+
+            for start in range(0, len(statistics), IMPORT_BATCH_SIZE):
+                async_add_external_statistics(self._hass, metadata, statistics[start:start + IMPORT_BATCH_SIZE])
+
+        dog_state['last_date'] = new_days[-1].date
+        self._store.async_delay_save(lambda: self._state, STORAGE_SAVE_DELAY)
+
+        _LOGGER.info('Imported %i activity days for dog %s up to %s', len(new_days), dog_id, dog_state['last_date'])
+        return len(new_days)
@@ -0,0 +1,376 @@
+"""Recording of PitPat API traffic to a trace file, and replay of traces in place of a real session."""
+
+import asyncio
+from collections import Counter, deque
+import gzip
+import json
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_DIRECTORY = 'pitpat_traces'
+
+# Number of requests buffered before being appended to the trace file
+TRACE_FLUSH_ENTRIES = 20
+
+# Requests whose body still hasn't been read after this long (e.g. a PUT where only the status is checked) are written
+# without a body, so they don't hold up the requests after them
+TRACE_BODY_WAIT_SECONDS = 120
+
+REDACTED = 'REDACTED'
+
+# Keys of response fields which are replaced, compared case insensitively
+REDACT_KEYS = frozenset({
+    'access_token',
+    'refresh_token',
+    'id_token',
+    'password',
+    'username',
+    'email',
+    'userid',
+    'serialnumber',
+})
+
+# Recorded positions are moved so the first one is here, keeping the shape of the movement but not where it was
+REDACTED_ORIGIN = (51.4779, -0.0015)
+
+_USER_ID_PATTERN = re.compile(r'/(users|user)/[^/?]+', re.IGNORECASE)
+
+def redact_path(url: str | URL) -> str:
+    """The path and query of a request URL, without the host and with the user Id replaced."""
+    parts = urlsplit(str(url))
+    path = _USER_ID_PATTERN.sub(lambda match: f'/{match.group(1)}/{{user_id}}', parts.path)
+    return f'{path}?{parts.query}' if parts.query else path
+
+class Redactor():
+    """Replaces secrets in response bodies and moves positions, consistently across a whole trace."""
+
+    def __init__(self):
+        self._offset: Tuple[float, float] | None = None
+
+    def redact(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.redact(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        redacted = {
+            key: REDACTED if key.lower() in REDACT_KEYS and item is not None else self.redact(item)
+            for key, item in value.items()
+        }
+        latitude, longitude = value.get('Latitude'), value.get('Longitude')
+        if isinstance(latitude, (int, float)) and isinstance(longitude, (int, float)):
+            if self._offset is None:
+                self._offset = (REDACTED_ORIGIN[0] - latitude, REDACTED_ORIGIN[1] - longitude)
+            redacted['Latitude'] = round(latitude + self._offset[0], 6)
+            redacted['Longitude'] = round(longitude + self._offset[1], 6)
+        return redacted
+
+class _RequestContext():
+    """Awaitable and async context manager for a response, like the result of aiohttp.ClientSession.get."""
+
+    def __init__(self, coroutine: Awaitable[Any]):
+        self._coroutine = coroutine
+        self._response = None
+
+    def __await__(self):
+        return self._coroutine.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coroutine
+        return self._response
+
+    async def __aexit__(self, *args) -> None:
+        self._response.release()
+
+class TrafficRecorder():
+    """
+    Records each request made through the sessions it wraps, with the status, redacted response body and timings.
+
+    The trace is appended to a gzip compressed JSON lines file in batches. Each line holds the time since recording
+    started (t), method (m), redacted path (p), status (s) or exception (e), milliseconds until the response headers
+    (h) and until the body was read (d), and the redacted body (b). Request bodies and headers are never recorded.
+
+    Requests are added in the order they were made, as soon as the response headers arrive, and the body is added once
+    it has been read. Responses whose body is never read are still recorded, without d or b.
+    """
+
+    def __init__(self, path: str, run_in_executor: Callable[..., Awaitable[Any]]):
+        self.path = path
+        self._run_in_executor = run_in_executor
+        self._redactor = Redactor()
+        self._started = time.monotonic()
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self.recorded = 0
+
+    def wrap(self, session: aiohttp.ClientSession) -> 'RecordingSession':
+        """Wrap a session so its requests are recorded."""
+        return RecordingSession(session, self)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Add a request, which is complete once it has a body time (d)."""
+        self._pending.append(entry)
+        self.recorded += 1
+        if len(self._pending) >= TRACE_FLUSH_ENTRIES and not self._flush_lock.locked():
+            asyncio.get_running_loop().create_task(self.async_flush(False))
+
+    def add_body(self, entry: Dict[str, Any], body: Any) -> None:
+        """Complete a request added earlier with the time taken to read its body, and the body if it was decoded."""
+        if body is not None:
+            entry['b'] = self._redactor.redact(body)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    async def async_flush(self, include_incomplete: bool = True) -> None:
+        """
+        Append recorded requests to the trace file.
+
+        :param include_incomplete: Also write requests whose body hasn't been read yet, without it. Otherwise only the
+            requests before the first one still waiting for its body are written.
+        """
+        async with self._flush_lock:
+            count = len(self._pending)
+            if not include_incomplete:
+                cutoff = self.elapsed() - TRACE_BODY_WAIT_SECONDS
+                count = next(
+                    (index for index, entry in enumerate(self._pending) if 'd' not in entry and entry['t'] > cutoff),
+                    count)
+            entries, self._pending = self._pending[:count], self._pending[count:]
+            if entries:
+                await self._run_in_executor(self.__write, entries)
+
+    def __write(self, entries: List[Dict[str, Any]]) -> None:
+        with gzip.open(self.path, 'at', encoding='utf-8') as file:
+            for entry in entries:
+                file.write(json.dumps(entry, separators=(',', ':')))
+                file.write('\n')
+
+class RecordingSession():
+    """Stands in for an aiohttp.ClientSession, recording the requests made with it."""
+
+    def __init__(self, session: aiohttp.ClientSession, recorder: TrafficRecorder):
+        self._session = session
+        self._recorder = recorder
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('GET', url, **kwargs))
+
+    def put(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('PUT', url, **kwargs))
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('POST', url, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    async def __async_request(self, method: str, url: str, **kwargs) -> '_RecordingResponse':
+        entry: Dict[str, Any] = {
+            't': round(self._recorder.elapsed(), 3),
+            'm': method,
+            'p': redact_path(url),
+        }
+        started = time.monotonic()
+        try:
+            response = await self._session.request(method, url, **kwargs)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            entry['e'] = type(err).__name__
+            entry['h'] = entry['d'] = round((time.monotonic() - started) * 1000)
+            self._recorder.add(entry)
+            raise
+
+        entry['s'] = response.status
+        entry['h'] = round((time.monotonic() - started) * 1000)
+        self._recorder.add(entry)
+        return _RecordingResponse(response, self._recorder, entry, started)
+
+class _RecordingStream():
+
+    def __init__(self, response: '_RecordingResponse'):
+        self._response = response
+
+    async def read(self, n: int = -1) -> bytes:
+        return await self._response.async_read_chunk(n)
+
+class _RecordingResponse():
+    """Proxies a response, recording the body once it has been read."""
+
+    def __init__(self, response: aiohttp.ClientResponse, recorder: TrafficRecorder, entry: Dict[str, Any], started: float):
+        self._response = response
+        self._recorder = recorder
+        self._entry = entry
+        self._started = started
+        self._chunks: List[bytes] | None = []
+        self.content = _RecordingStream(self)
+
+    @property
+    def status(self) -> int:
+        return self._response.status
+
+    def get_encoding(self) -> str:
+        return self._response.get_encoding()
+
+    def raise_for_status(self) -> None:
+        if self._response.status >= 400:
+            self.__finish(None)
+        self._response.raise_for_status()
+
+    async def json(self, **kwargs) -> Any:
+        try:
+            body = await self._response.json(**kwargs)
+        except Exception:
+            self.__finish(None)
+            raise
+        self.__finish(body)
+        return body
+
+    async def async_read_chunk(self, n: int) -> bytes:
+        chunk = await self._response.content.read(n)
+        if self._chunks is not None:
+            if chunk:
+                self._chunks.append(chunk)
+            else:
+                self.__finish(self.__decode_chunks())
+        return chunk
+
+    def release(self) -> None:
+        # A streamed body may not be read to the end, and a body which wasn't read at all is recorded as missing
+        if self._chunks:
+            self.__finish(self.__decode_chunks())
+        self.__finish(None)
+        self._response.release()
+
+    def __decode_chunks(self) -> Any:
+        try:
+            return json.loads(b''.join(self._chunks).decode(self.get_encoding() or 'utf-8'))
+        except ValueError:
+            return None
+
+    def __finish(self, body: Any) -> None:
+        if self._chunks is None:
+            return
+        self._chunks = None
+        self._entry['d'] = round((time.monotonic() - self._started) * 1000)
+        self._recorder.add_body(self._entry, body)
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read the requests from a trace file. This does blocking I/O, so must be run in an executor within HA."""
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+class ReplaySession():
+    """
+    Stands in for an aiohttp.ClientSession, answering requests from a recorded trace.
+
+    Requests are matched by method and redacted path, in the order they were recorded. Once the recorded responses
+    for a request have been used up, the last one is repeated, so a replay can run for longer than the recording.
+    Requests which were never recorded get a 404 response. Responses are delayed by the recorded timings divided by
+    the speed, or not at all for a speed of 0.
+
+    The counts of requests and the time taken for each are kept, so a test can check them after the replay.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], speed: float = 1.0):
+        self.speed = speed
+        self._responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        for entry in entries:
+            self._responses.setdefault((entry['m'], entry['p']), deque()).append(entry)
+        self.request_counts: Counter[Tuple[str, str]] = Counter()
+        self.unmatched: Counter[Tuple[str, str]] = Counter()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('GET', url))
+
+    def put(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('PUT', url))
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self.__async_request('POST', url))
+
+    async def async_delay(self, milliseconds: float) -> None:
+        if self.speed > 0 and milliseconds > 0:
+            await asyncio.sleep(milliseconds / 1000 / self.speed)
+
+    async def __async_request(self, method: str, url: str) -> '_ReplayResponse':
+        key = (method, redact_path(url))
+        self.request_counts[key] += 1
+
+        responses = self._responses.get(key)
+        if not responses:
+            _LOGGER.debug('No recorded response for %s %s', *key)
+            self.unmatched[key] += 1
+            return _ReplayResponse(self, method, url, {'s': 404, 'h': 0, 'd': 0})
+
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+        await self.async_delay(entry.get('h', 0))
+        if 'e' in entry:
+            if entry['e'] == TimeoutError.__name__:
+                raise TimeoutError()
+            raise aiohttp.ClientConnectionError(f'Replayed {entry["e"]}')
+        return _ReplayResponse(self, method, url, entry)
+
+class _ReplayStream():
+
+    def __init__(self, response: '_ReplayResponse'):
+        self._response = response
+        self._data: bytes | None = None
+        self._position = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        if self._data is None:
+            await self._response.async_wait_for_body()
+            self._data = json.dumps(self._response.body).encode('utf-8') if self._response.body is not None else b''
+        end = len(self._data) if n < 0 else self._position + n
+        chunk = self._data[self._position:end]
+        self._position += len(chunk)
+        return chunk
+
+class _ReplayResponse():
+
+    def __init__(self, session: ReplaySession, method: str, url: str, entry: Dict[str, Any]):
+        self._session = session
+        self._method = method
+        self._url = URL(url)
+        self._entry = entry
+        self._body_read = False
+        self.status: int = entry['s']
+        self.body = entry.get('b')
+        self.content = _ReplayStream(self)
+
+    def get_encoding(self) -> str:
+        return 'utf-8'
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(self._url, self._method, CIMultiDictProxy(CIMultiDict()), self._url),
+                (),
+                status=self.status,
+                message=f'Replayed {self.status}',
+            )
+
+    async def async_wait_for_body(self) -> None:
+        if not self._body_read:
+            self._body_read = True
+            await self._session.async_delay(self._entry.get('d', 0) - self._entry.get('h', 0))
+
+    async def json(self, **kwargs) -> Any:
+        await self.async_wait_for_body()
+        return self.body
+
+    def release(self) -> None:
+        pass
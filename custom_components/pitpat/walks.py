@@ -0,0 +1,222 @@
+"""Detection and summaries of walks from live tracking in walk mode."""
+
+from array import array
+from datetime import datetime
+import logging
+from typing import Any, Dict, List
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .geo import haversine_distance
+from .models import Monitor, Position
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_WALK_COMPLETED = 'pitpat_walk_completed'
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+LIVE_TRACKING_REASON_WALK = 2
+
+# Number of completed walks kept in storage across all dogs
+WALK_HISTORY_SIZE = 100
+
+# Fixes less accurate than this are left out of the track
+WALK_MAX_ACCURACY_METRES = 50.0
+
+# Movement smaller than this is treated as GPS jitter. The track is only extended once the dog has moved this far
+# from the last point, so slow movement is still counted.
+WALK_MIN_SEGMENT_METRES = 5.0
+
+# Track coordinates are stored as integers with this many decimal places (roughly 1 metre)
+WALK_TRACK_PRECISION = 5
+
+def encode_polyline(latitudes: List[int], longitudes: List[int]) -> str:
+    """Encode integer coordinates with the encoded polyline algorithm, for compact storage of a track."""
+    chunks = []
+    previous_lat = previous_lon = 0
+    for lat, lon in zip(latitudes, longitudes):
+        for value in (lat - previous_lat, lon - previous_lon):
+            value = ~(value << 1) if value < 0 else value << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous_lat, previous_lon = lat, lon
+    return ''.join(chunks)
+
+def decode_polyline(polyline: str) -> List[tuple[float, float]]:
+    """Decode a track encoded with encode_polyline into latitude and longitude pairs."""
+    scale = 10 ** WALK_TRACK_PRECISION
+    points = []
+    values = [0, 0]
+    index = 0
+    while index < len(polyline):
+        for axis in range(2):
+            result = shift = 0
+            while True:
+                byte = ord(polyline[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            values[axis] += ~(result >> 1) if result & 1 else result >> 1
+        points.append((values[0] / scale, values[1] / scale))
+    return points
+
+class WalkSession():
+    """
+    A walk in progress, with the summary updated incrementally as each fix arrives.
+
+    The track is held as arrays of scaled integers rather than a list of fix objects.
+    """
+
+    __slots__ = (
+        'dog_id', 'start', 'end', 'distance', '_latitudes', '_longitudes', '_offsets',
+        '_anchor', 'min_latitude', 'min_longitude', 'max_latitude', 'max_longitude',
+    )
+
+    def __init__(self, dog_id: str, start: datetime):
+        self.dog_id = dog_id
+        self.start = start
+        self.end = start
+        self.distance = 0.0
+        self._latitudes = array('i')
+        self._longitudes = array('i')
+        self._offsets = array('I')
+        self._anchor: Position | None = None
+        self.min_latitude = self.min_longitude = float('inf')
+        self.max_latitude = self.max_longitude = float('-inf')
+
+    @property
+    def fix_count(self) -> int:
+        return len(self._offsets)
+
+    def add_fix(self, position: Position) -> bool:
+        """
+        Add a fix to the track.
+
+        :return: True if the fix was added.
+        """
+        if position.time is None or position.time < self.start or position.accuracy > WALK_MAX_ACCURACY_METRES:
+            return False
+        if self._anchor is not None and position.time <= self._anchor.time:
+            return False
+
+        if self._anchor is not None:
+            segment = haversine_distance(self._anchor.latitude, self._anchor.longitude, position.latitude, position.longitude)
+            if segment < WALK_MIN_SEGMENT_METRES:
+                self.end = position.time
+                return False
+            self.distance += segment
+
+        self._anchor = position
+        self.end = position.time
+        scale = 10 ** WALK_TRACK_PRECISION
+        self._latitudes.append(round(position.latitude * scale))
+        self._longitudes.append(round(position.longitude * scale))
+        self._offsets.append(int((position.time - self.start).total_seconds()))
+        self.min_latitude = min(self.min_latitude, position.latitude)
+        self.min_longitude = min(self.min_longitude, position.longitude)
+        self.max_latitude = max(self.max_latitude, position.latitude)
+        self.max_longitude = max(self.max_longitude, position.longitude)
+        return True
+
+    def summary(self, dog_name: str | None) -> Dict[str, Any]:
+        """Summary of the walk, as included in the walk completed event."""
+        duration = (self.end - self.start).total_seconds()
+        kilometres = self.distance / 1000
+        return {
+            'dog_id': self.dog_id,
+            'dog_name': dog_name,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'duration_seconds': round(duration),
+            'distance_metres': round(self.distance, 1),
+            'pace_minutes_per_km': round(duration / 60 / kilometres, 2) if kilometres > 0 else None,
+            'average_speed_kmh': round(kilometres / (duration / 3600), 2) if duration > 0 else None,
+            'bounding_box': [round(value, 6) for value in (self.min_latitude, self.min_longitude, self.max_latitude, self.max_longitude)] if self.fix_count else None,
+            'fix_count': self.fix_count,
+        }
+
+    def track(self) -> Dict[str, Any]:
+        """The track in a compact form for storage."""
+        return {
+            'polyline': encode_polyline(self._latitudes, self._longitudes),
+            'offsets': list(self._offsets),
+        }
+
+class WalkEngine():
+    """
+    Notices walks starting and ending from the live tracking reason of each monitor, and keeps a track of the
+    walk while it is in progress.
+
+    Completed walks fire a pitpat_walk_completed event with the summary, and the most recent walks are saved with
+    their tracks.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._hass = hass
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.walks')
+        self._sessions: Dict[str, WalkSession] = {}
+        self._history: List[Dict[str, Any]] | None = None
+
+    async def async_load(self) -> None:
+        """Load the recent walks from storage, if not already loaded."""
+        if self._history is None:
+            data = await self._store.async_load() or {}
+            self._history = data.get('walks', [])
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """The most recently completed walks, oldest first."""
+        return self._history or []
+
+    def active_session(self, dog_id: str) -> WalkSession | None:
+        return self._sessions.get(dog_id)
+
+    @callback
+    def async_remove_dog(self, dog_id: str) -> None:
+        """Forget the walk in progress and recent walks of a dog removed from the account."""
+        self._sessions.pop(dog_id, None)
+        if self._history and any(walk.get('dog_id') == dog_id for walk in self._history):
+            self._history = [walk for walk in self._history if walk.get('dog_id') != dog_id]
+            self._store.async_delay_save(lambda: {'walks': self._history}, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_update(self, dog_id: str, dog_name: str | None, monitor: Monitor) -> None:
+        """Update the walk for a dog from the latest monitor details."""
+        session = self._sessions.get(dog_id)
+        walking = monitor.live_tracking_reason == LIVE_TRACKING_REASON_WALK
+
+        if walking and session is None:
+            start = monitor.position.time if monitor.position and monitor.position.time else monitor.contact_timings.last_message_received_at
+            if start is None:
+                return
+            _LOGGER.debug('Walk started for dog %s', dog_id)
+            session = self._sessions[dog_id] = WalkSession(dog_id, start)
+
+        if session is None:
+            return
+
+        if monitor.position is not None:
+            session.add_fix(monitor.position)
+
+        if not walking:
+            del self._sessions[dog_id]
+            self.__async_complete(session, dog_name)
+
+    def __async_complete(self, session: WalkSession, dog_name: str | None) -> None:
+        summary = session.summary(dog_name)
+        _LOGGER.debug('Walk completed for dog %s: %s', session.dog_id, summary)
+        self._hass.bus.async_fire(EVENT_WALK_COMPLETED, summary)
+
+        if self._history is None:
+            return
+        self._history.append({**summary, 'track': session.track()})
+        del self._history[:-WALK_HISTORY_SIZE]
+        self._store.async_delay_save(lambda: {'walks': self._history}, STORAGE_SAVE_DELAY)
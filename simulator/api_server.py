@@ -0,0 +1,377 @@
+"""
+Local simulator for the PitPat auth, api, activity and location services, for load and fault testing.
+
+All four services are served from a single port. Enable advanced mode in your Home Assistant user profile and set
+the API base URL when adding the integration to http://localhost:5100 to use it. Any email and password are
+accepted, except a password of "invalid".
+
+The simulated account has any number of dogs, each with a history of activity days. Dogs wander around their home
+position, their batteries drain according to the phone home cadence and live tracking (and are recharged when
+low), and they phone home at the interval for their cadence. Access tokens expire, and requests can be slowed
+down or failed at random to test the integration's handling of a slow or unreliable service.
+
+Usage:
+    python simulator/api_server.py --dogs 50 --days 730 --latency slow --fault-rate-5xx 0.05
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+import json
+import logging
+import math
+import random
+import secrets
+import time
+import uuid
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+USER_ID = '00000000-0000-0000-0000-000000000001'
+
+# Mean and standard deviation of the added latency in seconds, by profile
+LATENCY_PROFILES = {
+    'none': (0.0, 0.0),
+    'typical': (0.15, 0.05),
+    'slow': (1.0, 0.5),
+    'jittery': (0.3, 1.5),
+}
+
+CADENCE_VALUES = {
+    'Standard': 0,
+    'Economy': 1,
+    'Urgent': 2,
+}
+
+# Phone home interval by cadence, and while live tracking
+CADENCE_INTERVALS = {
+    0: timedelta(minutes=15),
+    1: timedelta(minutes=60),
+    2: timedelta(minutes=5),
+}
+LIVE_TRACKING_INTERVAL = timedelta(seconds=10)
+
+# Battery drain in fraction per hour by cadence, and while live tracking
+CADENCE_DRAIN = {
+    0: 0.01,
+    1: 0.005,
+    2: 0.02,
+}
+LIVE_TRACKING_DRAIN = 0.08
+CHARGE_RATE = 0.3
+
+BREEDS = [
+    ('Beagle', 'Hound'),
+    ('Labrador Retriever', 'Gundog'),
+    ('Border Collie', 'Pastoral'),
+    ('Jack Russell Terrier', 'Terrier'),
+    ('Cocker Spaniel', 'Gundog'),
+]
+
+def isoformat(value: datetime) -> str:
+    return value.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+class SimulatedDog():
+    """A dog and the state of its monitor, advanced lazily to the time of each request."""
+
+    def __init__(self, index: int, args: argparse.Namespace, rng: random.Random):
+        self.id = str(uuid.UUID(int=index + 1))
+        self.index = index
+        self.name = f'Dog {index + 1}'
+        self.breed = BREEDS[index % len(BREEDS)]
+        self.serial_number = f'SIM{index + 1:07d}'
+        self.home = (args.latitude + rng.uniform(-0.05, 0.05), args.longitude + rng.uniform(-0.05, 0.05))
+        self.position = self.home
+        self.heading = rng.uniform(0, 2 * math.pi)
+        self.battery = rng.uniform(0.3, 1.0)
+        self.charging = False
+        self.cadence = 0
+        self.live_tracking_reason = 0
+        self.phone_home_offset = rng.uniform(0, 1)
+        self.updated = datetime.now(timezone.utc)
+        self._rng = rng
+
+    @property
+    def phone_home_interval(self) -> timedelta:
+        return LIVE_TRACKING_INTERVAL if self.live_tracking_reason else CADENCE_INTERVALS[self.cadence]
+
+    def advance(self, now: datetime) -> None:
+        hours = (now - self.updated).total_seconds() / 3600
+        if hours <= 0:
+            return
+        self.updated = now
+
+        if self.charging:
+            self.battery = min(1.0, self.battery + CHARGE_RATE * hours)
+            self.charging = self.battery < 1.0
+        else:
+            drain = LIVE_TRACKING_DRAIN if self.live_tracking_reason else CADENCE_DRAIN[self.cadence]
+            self.battery = max(0.0, self.battery - drain * hours)
+            self.charging = self.battery < 0.1
+
+        # Wander with a gradually changing heading, pulled back towards home
+        speed = 1.5 if self.live_tracking_reason == 2 else 0.3
+        distance = min(speed * hours * 3600, 2000)
+        self.heading += self._rng.gauss(0, 0.5)
+        latitude, longitude = self.position
+        latitude += distance * math.cos(self.heading) / 111320 + (self.home[0] - latitude) * 0.1
+        longitude += distance * math.sin(self.heading) / (111320 * math.cos(math.radians(latitude))) + (self.home[1] - longitude) * 0.1
+        self.position = (latitude, longitude)
+
+    def last_message_at(self, now: datetime) -> datetime:
+        interval = self.phone_home_interval.total_seconds()
+        offset = self.phone_home_offset * interval
+        return datetime.fromtimestamp(math.floor((now.timestamp() - offset) / interval) * interval + offset, timezone.utc)
+
+    def as_dog(self) -> dict:
+        return {
+            'Id': self.id,
+            'Name': self.name,
+            'Breed': {'Name': self.breed[0], 'Family': self.breed[1]},
+            'Monitor': {
+                'FirmwareVersion': '1.3.1',
+                'HardwareVersion': '6.2.5',
+                'Model': 6,
+            },
+            'IsFemale': self.index % 2 == 0,
+            'Weight': 8 + self.index % 20,
+            'BirthDate': f'{2015 + self.index % 10}-0{1 + self.index % 9}-01T00:00:00.00Z',
+            'IanaTimeZoneName': 'Europe/London',
+        }
+
+    def as_monitor(self, now: datetime) -> dict:
+        self.advance(now)
+        last_message = self.last_message_at(now)
+        return {
+            'HasValue': True,
+            'Value': {
+                'DogId': self.id,
+                'Monitor': {
+                    'SerialNumber': self.serial_number,
+                    'BatteryInfo': {
+                        'HasValue': True,
+                        'Value': {
+                            'IsCharging': self.charging,
+                            'BatteryLevelFraction': round(self.battery, 2),
+                        },
+                    },
+                    'LastKnownPosition': {
+                        'HasValue': True,
+                        'Value': {
+                            'Latitude': self.position[0],
+                            'Longitude': self.position[1],
+                            'Accuracy': {
+                                'Metres': self._rng.randint(5, 50),
+                            },
+                            'DataTime': isoformat(last_message),
+                        },
+                    },
+                    'GpsSynchronisationState': 3 if self.live_tracking_reason else 0,
+                    'ContactTimings': {
+                        'HasValue': True,
+                        'Value': {
+                            'NextMessageExpectedAt': isoformat(last_message + self.phone_home_interval),
+                            'LastMessageReceivedAt': isoformat(last_message),
+                            'LastMessageSentAt': isoformat(last_message),
+                        },
+                    },
+                    'PhoneHomeCadence': self.cadence,
+                    'LiveTrackingReason': self.live_tracking_reason,
+                    'Network': {
+                        'HasValue': True,
+                        'Value': {
+                            'Quality': self._rng.randint(1, 5),
+                            'NetworkOperator': {
+                                'HasValue': True,
+                                'Value': 'SIM',
+                            },
+                        },
+                    },
+                },
+            },
+        }
+
+    def activity_day(self, day: date) -> dict:
+        # Seeded by dog and date, so each day is the same on every request
+        rng = random.Random(f'{self.id}-{day.isoformat()}')
+        walk = rng.randint(10, 120)
+        run = rng.randint(0, 30)
+        play = rng.randint(0, 20)
+        activeness = walk + run + play
+        return {
+            'DogId': self.id,
+            'Date': f'{day.isoformat()}T00:00:00Z',
+            'TotalWalkMinutes': walk,
+            'TotalRunMinutes': run,
+            'TotalPlayMinutes': play,
+            'TotalPotteringMinutes': rng.randint(10, 240),
+            'TotalRestMinutes': rng.randint(120, 600),
+            'TotalCalories': rng.randint(100, 2000),
+            'UserGoal': 60,
+            'Activeness': activeness,
+            'UserGoalAchieved': activeness >= 60,
+            'TotalSteps': rng.randint(5000, 40000),
+            'TotalDistance': rng.uniform(1000, 15000),
+        }
+
+class Simulator():
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.dogs = {dog.id: dog for dog in (SimulatedDog(index, args, self.rng) for index in range(args.dogs))}
+        self.access_tokens: dict[str, float] = {}
+        self.refresh_tokens: set[str] = set()
+        self.request_count = 0
+        self.fault_count = 0
+
+    def issue_tokens(self) -> dict:
+        access_token = secrets.token_urlsafe(24)
+        refresh_token = secrets.token_urlsafe(24)
+        self.access_tokens[access_token] = time.monotonic() + self.args.token_lifetime
+        self.refresh_tokens.add(refresh_token)
+        return {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'token_type': 'Bearer',
+            'expires_in': self.args.token_lifetime,
+            'scope': 'PitPatApi offline_access',
+        }
+
+    def is_authorised(self, request: web.Request) -> bool:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        expires = self.access_tokens.get(token)
+        if scheme != 'Bearer' or expires is None:
+            return False
+        if expires < time.monotonic():
+            del self.access_tokens[token]
+            return False
+        return True
+
+    def get_dog(self, request: web.Request) -> SimulatedDog:
+        dog = self.dogs.get(request.match_info['dog_id'])
+        if dog is None:
+            raise web.HTTPNotFound()
+        return dog
+
+@web.middleware
+async def faults_middleware(request: web.Request, handler):
+    simulator: Simulator = request.app['simulator']
+    args = simulator.args
+    simulator.request_count += 1
+
+    mean, deviation = LATENCY_PROFILES[args.latency]
+    if mean or deviation:
+        await asyncio.sleep(max(0.0, simulator.rng.gauss(mean, deviation)))
+
+    roll = simulator.rng.random()
+    if roll < args.fault_rate_429:
+        simulator.fault_count += 1
+        return web.json_response({'error': 'Too many requests'}, status=429, headers={'Retry-After': '30'})
+    if roll < args.fault_rate_429 + args.fault_rate_5xx:
+        simulator.fault_count += 1
+        return web.json_response({'error': 'Simulated fault'}, status=simulator.rng.choice([500, 502, 503, 504]))
+
+    if request.path != '/connect/token' and not simulator.is_authorised(request):
+        return web.json_response({'error': 'Unauthorized'}, status=401)
+
+    return await handler(request)
+
+async def handle_token(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    form = await request.post()
+    grant_type = form.get('grant_type')
+    if grant_type == 'password' and form.get('password') != 'invalid':
+        return web.json_response(simulator.issue_tokens())
+    if grant_type == 'refresh_token' and form.get('refresh_token') in simulator.refresh_tokens:
+        simulator.refresh_tokens.discard(form.get('refresh_token'))
+        return web.json_response(simulator.issue_tokens())
+    return web.json_response({'error': 'invalid_grant'}, status=400)
+
+async def handle_settings(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    return web.json_response({'UserId': USER_ID, 'UserDogTotal': str(len(simulator.dogs))})
+
+async def handle_dogs(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    return web.json_response([dog.as_dog() for dog in simulator.dogs.values()])
+
+async def handle_monitor(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    return web.json_response(simulator.get_dog(request).as_monitor(datetime.now(timezone.utc)))
+
+async def handle_activity_days(request: web.Request) -> web.StreamResponse:
+    """Stream the activity history in chunks, as a long history from the real service would arrive."""
+    simulator: Simulator = request.app['simulator']
+    dog = simulator.get_dog(request)
+    response = web.StreamResponse(headers={'Content-Type': 'application/json; charset=utf-8'})
+    await response.prepare(request)
+
+    today = date.today()
+    chunk = ['[']
+    for index in range(simulator.args.days):
+        if index:
+            chunk.append(',')
+        chunk.append(json.dumps(dog.activity_day(today - timedelta(days=index))))
+        if len(chunk) >= 200:
+            await response.write(''.join(chunk).encode())
+            chunk = []
+    chunk.append(']')
+    await response.write(''.join(chunk).encode())
+    await response.write_eof()
+    return response
+
+async def handle_tracking(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    dog = simulator.get_dog(request)
+    dog.advance(datetime.now(timezone.utc))
+    dog.live_tracking_reason = {'stop': 0, 'find': 1, 'walk': 2}[request.match_info['mode']]
+    return web.Response()
+
+async def handle_cadence(request: web.Request) -> web.Response:
+    simulator: Simulator = request.app['simulator']
+    dog = simulator.get_dog(request)
+    cadence = CADENCE_VALUES.get(request.query.get('cadence', ''))
+    if cadence is None:
+        return web.json_response({'error': 'Unknown cadence'}, status=400)
+    dog.advance(datetime.now(timezone.utc))
+    dog.cadence = cadence
+    return web.Response()
+
+async def log_stats(app: web.Application):
+    simulator: Simulator = app['simulator']
+    _LOGGER.info('Served %i requests, of which %i were faults', simulator.request_count, simulator.fault_count)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=5100)
+    parser.add_argument('--dogs', type=int, default=1, help='Number of dogs on the account')
+    parser.add_argument('--days', type=int, default=365, help='Number of days of activity history for each dog')
+    parser.add_argument('--token-lifetime', type=int, default=3600, help='Seconds until access tokens expire')
+    parser.add_argument('--latency', choices=LATENCY_PROFILES.keys(), default='none', help='Latency added to each request')
+    parser.add_argument('--fault-rate-429', type=float, default=0.0, help='Fraction of requests rate limited')
+    parser.add_argument('--fault-rate-5xx', type=float, default=0.0, help='Fraction of requests failing with a server error')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for repeatable dogs, movement and faults')
+    parser.add_argument('--latitude', type=float, default=51.5)
+    parser.add_argument('--longitude', type=float, default=-0.1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = web.Application(middlewares=[faults_middleware])
+    app['simulator'] = Simulator(args)
+    app.router.add_post('/connect/token', handle_token)
+    app.router.add_get('/api/Settings', handle_settings)
+    app.router.add_get('/api/Users/{user_id}/Dogs', handle_dogs)
+    app.router.add_get('/api/Users/{user_id}/Dogs/{dog_id}/Monitors', handle_monitor)
+    app.router.add_get('/api/Users/{user_id}/Dogs/{dog_id}/AllActivityDays', handle_activity_days)
+    app.router.add_put('/api/user/{user_id}/dog/{dog_id}/livetracking/{mode:stop}', handle_tracking)
+    app.router.add_put('/api/user/{user_id}/dog/{dog_id}/livetracking/start/{mode:find|walk}', handle_tracking)
+    app.router.add_put('/api/user/{user_id}/dog/{dog_id}/monitor/updatePermanentCadence', handle_cadence)
+    app.on_shutdown.append(log_stats)
+    _LOGGER.info('Simulating %i dogs with %i days of activity', args.dogs, args.days)
+    web.run_app(app, port=args.port)
+
+if __name__ == '__main__':
+    main()
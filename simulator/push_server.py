@@ -0,0 +1,78 @@
+"""
+Local stand-in for a PitPat push service, for testing the push receiver offline.
+
+Serves a WebSocket which sends a monitor update for each dog at a regular interval, with the dog wandering
+randomly around a starting position. Set the push service URL in the integration options to
+ws://localhost:5104/push to use it.
+
+Usage:
+    python simulator/push_server.py --dog-id 00000000-0000-0000-0000-000000000001
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import logging
+import random
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+def monitor_update(dog_id: str, latitude: float, longitude: float) -> dict:
+    return {
+        'DogId': dog_id,
+        'Monitor': {
+            'LastKnownPosition': {
+                'HasValue': True,
+                'Value': {
+                    'Latitude': latitude,
+                    'Longitude': longitude,
+                    'Accuracy': {
+                        'Metres': random.randint(5, 50),
+                    },
+                    'DataTime': datetime.now(timezone.utc).isoformat(),
+                },
+            },
+            'GpsSynchronisationState': 3,
+        },
+    }
+
+async def handle_push(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    _LOGGER.info('Client connected')
+
+    args: argparse.Namespace = request.app['args']
+    positions = {dog_id: (args.latitude, args.longitude) for dog_id in args.dog_id}
+    try:
+        while not ws.closed:
+            for dog_id, (latitude, longitude) in positions.items():
+                latitude += random.uniform(-0.0002, 0.0002)
+                longitude += random.uniform(-0.0003, 0.0003)
+                positions[dog_id] = (latitude, longitude)
+                await ws.send_str(json.dumps(monitor_update(dog_id, latitude, longitude)))
+            await asyncio.sleep(args.interval)
+    finally:
+        _LOGGER.info('Client disconnected')
+
+    return ws
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dog-id', action='append', required=True, help='Id of a dog to send updates for. Can be repeated.')
+    parser.add_argument('--port', type=int, default=5104)
+    parser.add_argument('--interval', type=float, default=5, help='Seconds between updates')
+    parser.add_argument('--latitude', type=float, default=51.5)
+    parser.add_argument('--longitude', type=float, default=-0.1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = web.Application()
+    app['args'] = args
+    app.router.add_get('/push', handle_push)
+    web.run_app(app, port=args.port)
+
+if __name__ == '__main__':
+    main()
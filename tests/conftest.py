@@ -0,0 +1,8 @@
+"""Fixtures for the PitPat tests."""
+
+import pytest
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Allow the integration to be loaded from custom_components in every test."""
+    yield
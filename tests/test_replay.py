@@ -0,0 +1,50 @@
+"""Replay of recorded API traffic through the coordinators."""
+
+from collections import Counter
+import os
+import time
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pitpat.const import CONFIG_KEY_USER_ID, DOMAIN
+from custom_components.pitpat.coordinator import PitPatDataUpdateCoordinator
+from custom_components.pitpat.options import PitPatOptions
+from custom_components.pitpat.traffic import REDACTED, ReplaySession, load_trace
+
+# Recorded from the simulator with 2 dogs, 60 days of activity and the typical latency profile. A refresh token
+# authentication and the dogs, followed by the monitor and activity of each dog.
+TRACE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'refresh_trace.jsonl.gz')
+
+REPLAY_SPEED = 2
+
+async def test_refresh_replays_trace(recorder_mock, hass):
+    """The first refresh of the account and its dogs makes exactly the recorded requests, with the dogs in parallel."""
+    trace = await hass.async_add_executor_job(load_trace, TRACE_PATH)
+    session = ReplaySession(trace, speed=REPLAY_SPEED)
+
+    config_entry = MockConfigEntry(domain=DOMAIN, data={'refresh_token': REDACTED, CONFIG_KEY_USER_ID: 'user'})
+    config_entry.add_to_hass(hass)
+    coordinator = PitPatDataUpdateCoordinator(hass, config_entry, PitPatOptions(), session_factory=lambda hass: session)
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert len(coordinator.data) == 2
+
+    started = time.monotonic()
+    await coordinator.async_setup_dog_coordinators()
+    dogs_elapsed = time.monotonic() - started
+
+    assert all(dog_coordinator.last_update_success for dog_coordinator in coordinator.dog_coordinators.values())
+    assert not session.unmatched
+    assert session.request_counts == Counter((entry['m'], entry['p']) for entry in trace)
+
+    # The monitor and activity of every dog are requested at once, so the dogs take about as long as the slowest
+    # request rather than all of them in turn
+    dog_entries = [entry for entry in trace if '/Dogs/' in entry['p']]
+    slowest = max(entry['d'] for entry in dog_entries) / 1000 / REPLAY_SPEED
+    in_turn = sum(entry['d'] for entry in dog_entries) / 1000 / REPLAY_SPEED
+    assert slowest <= dogs_elapsed < in_turn
+
+    for dog_coordinator in coordinator.dog_coordinators.values():
+        await dog_coordinator.async_shutdown()
+    await coordinator.async_shutdown()